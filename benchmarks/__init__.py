@@ -0,0 +1,21 @@
+"""Headless throughput benchmarks for the simulation core and the visualizations.
+
+Run from the repository root::
+
+    python -m benchmarks run -o results.json
+    python -m benchmarks compare baseline.json results.json
+    python -m benchmarks work-precision --target 1e-6
+    python -m benchmarks profile --method rk4 --particles 100
+    python -m benchmarks startup
+
+``run`` times the force kernel, every registered integrator, the energy
+computations and every visualization of the front end window over a grid
+of scene sizes and step counts, plus the time from a fresh interpreter to
+the first shown window of each front end, and writes the timings together with
+machine information to JSON. ``compare`` reports the cases that got slower
+than a stored baseline and exits with status 1 if there are any.
+``work-precision`` sweeps dt (and tolerances) of every integrator on
+reference scenes and reports the cheapest method for a target accuracy.
+``profile`` runs one simulation under cProfile and tracemalloc.
+``startup`` breaks the time to the first window down into its phases.
+"""
@@ -0,0 +1,154 @@
+import argparse
+import os
+import pstats
+import sys
+
+# The simulation core lives next to this package in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from .cases import GROUPS, SIZES, STEPS, collect_cases
+from particle_core import (
+    EnergyRecorder, RunProfiler, Simulation, SimulationState, get_integrator, load_scene_columns,
+)
+
+from . import startup, work_precision
+from .cases import make_state
+from .runner import MAX_WORK, MIN_TIME, THRESHOLD, compare_results, load_results, run_cases, save_results
+
+
+def run_command(args):
+    cases, errors = collect_cases(args.groups, args.sizes, args.steps)
+    for group, message in errors.items():
+        print(f"Skipping {group} benchmarks: {message}")
+    results = run_cases(cases, args.repeat, args.max_work)
+    save_results(args.output, results, errors)
+    print(f"Results written to {args.output}")
+    return 0
+
+
+def compare_command(args):
+    rows = compare_results(load_results(args.baseline), load_results(args.current),
+                           args.threshold, args.min_time)
+    regressions = 0
+    for key, base, current, ratio, status in rows:
+        print(f"{key:<60} {base * 1e3:12.3f} ms {current * 1e3:12.3f} ms {ratio:7.2f}x  {status}")
+        regressions += status == "REGRESSION"
+    print(f"{len(rows)} cases compared, {regressions} regressions")
+    return 1 if regressions else 0
+
+
+def work_precision_command(args):
+    rows = work_precision.sweep(args.scenes, args.methods, args.dts, args.tolerances,
+                                args.time, args.jobs)
+    print(work_precision.format_table(rows))
+    for scene, row in sorted(work_precision.cheapest(rows, args.target).items()):
+        eps = f", eps = {row['eps']:g}" if row["eps"] is not None else ""
+        print(f"{scene}: cheapest run with error <= {args.target:g} is {row['method']} "
+              f"(dt = {row['dt']:g}{eps}, {row['force_evaluations']} force evaluations)")
+    work_precision.save_rows(args.output, rows)
+    print(f"Results written to {args.output}")
+    if args.plot:
+        try:
+            work_precision.plot(rows, args.plot)
+            print(f"Plot written to {args.plot}")
+        except ImportError as e:
+            print(f"Skipping the plot: {e}")
+    return 0
+
+
+def profile_command(args):
+    if args.load:
+        state = SimulationState.from_columns(load_scene_columns(args.load)[0], args.k, args.G)
+    elif args.particles:
+        state = make_state(args.particles)
+    else:
+        state = work_precision.SCENES[args.scene](args.dt)
+    simulation = Simulation(state, get_integrator(args.method))
+    simulation.add_recorder(EnergyRecorder.from_state(state))
+    steps = int(round(args.time / state.dt))
+    print(f"Profiling {steps} {args.method} steps of {state.n} particles")
+
+    with RunProfiler(args.output) as profiler:
+        for _ in simulation.run(steps):
+            pass
+    pstats.Stats(profiler.paths[0]).sort_stats("cumulative").print_stats(args.top)
+    print(f"Profile written to {profiler.paths[0]}, allocations to {profiler.paths[1]}")
+    return 0
+
+
+def startup_command(args):
+    try:
+        startup.check_available()
+    except ImportError as e:
+        print(f"Skipping the startup benchmark: {e}")
+        return 1
+    for language in args.languages:
+        reports = [startup.launch(language) for _ in range(args.repeat)]
+        best = min(reports, key=lambda report: report["time_to_first_window"])
+        print(startup.format_report(language, best))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="time the benchmark cases and write them to JSON")
+    run.add_argument("-o", "--output", default="benchmark_results.json")
+    run.add_argument("--groups", nargs="+", choices=GROUPS, default=list(GROUPS))
+    run.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    run.add_argument("--steps", nargs="+", type=int, default=list(STEPS))
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--max-work", type=float, default=MAX_WORK,
+                     help="skip cases with more pair interactions than this (0 - no limit)")
+    run.set_defaults(func=run_command)
+
+    compare = commands.add_parser("compare", help="flag regressions against a baseline")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=THRESHOLD,
+                         help="relative slowdown reported as a regression")
+    compare.add_argument("--min-time", type=float, default=MIN_TIME,
+                         help="never flag cases faster than this many seconds in the baseline")
+    compare.set_defaults(func=compare_command)
+
+    wp = commands.add_parser("work-precision",
+                             help="compare integrator accuracy against cost on reference scenes")
+    wp.add_argument("--scenes", nargs="+", choices=list(work_precision.SCENES),
+                    default=list(work_precision.SCENES))
+    wp.add_argument("--methods", nargs="+", help="integrators to compare (default: all registered)")
+    wp.add_argument("--dts", nargs="+", type=float, default=list(work_precision.DTS))
+    wp.add_argument("--tolerances", nargs="+", type=float, default=list(work_precision.TOLERANCES),
+                    help="eps values for integrators that take one, swept at the largest dt")
+    wp.add_argument("--time", type=float, default=work_precision.DURATION, help="simulated time")
+    wp.add_argument("--target", type=float, default=1e-6, help="final position error to reach")
+    wp.add_argument("--jobs", type=int, help="worker processes (default: one per CPU)")
+    wp.add_argument("-o", "--output", default="work_precision.json")
+    wp.add_argument("--plot", default="work_precision.png", help="plot file, empty to skip")
+    wp.set_defaults(func=work_precision_command)
+
+    profile = commands.add_parser("profile", help="run one simulation under cProfile and tracemalloc")
+    profile.add_argument("--scene", choices=list(work_precision.SCENES), default="hydrogen")
+    profile.add_argument("--particles", type=int, help="use a random gas of this many particles instead")
+    profile.add_argument("--load", help="use a scene file saved by the front ends (JSON or .npz) instead")
+    profile.add_argument("--method", default="verlet")
+    profile.add_argument("--dt", type=float, default=1e-3, help="step of the built-in scenes")
+    profile.add_argument("--time", type=float, default=1.0, help="simulated time")
+    profile.add_argument("-k", type=float, default=1.0)
+    profile.add_argument("-G", type=float, default=1.0)
+    profile.add_argument("--top", type=int, default=20, help="functions printed from the profile")
+    profile.add_argument("-o", "--output", default="run_reports")
+    profile.set_defaults(func=profile_command)
+
+    first_window = commands.add_parser("startup", help="break down the time to the first shown window")
+    first_window.add_argument("--languages", nargs="+", choices=startup.LANGUAGES,
+                              default=list(startup.LANGUAGES))
+    first_window.add_argument("--repeat", type=int, default=3, help="launches, the fastest is shown")
+    first_window.set_defaults(func=startup_command)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""Benchmark cases, each timing one operation on a generated scene."""
+import numpy as np
+
+from particle_core import (
+    Simulation, SimulationState, available_integrators, compute_accelerations, get_integrator,
+    potential_energy, trajectory_energy
+)
+
+SIZES = (3, 30, 300, 3000)
+STEPS = (10, 100)
+GROUPS = ("forces", "integrators", "energy", "render", "startup")
+
+
+class Case:
+    """A named operation for a scene of ``n`` particles and ``steps`` steps.
+
+    ``setup`` builds everything the operation needs and returns the
+    callable that is timed, so every repetition starts from the same state.
+    ``work`` estimates the pair interactions involved and lets the runner
+    skip cases that would take too long.
+    """
+
+    def __init__(self, name, n, steps, setup, work):
+        self.name = name
+        self.n = n
+        self.steps = steps
+        self.setup = setup
+        self.work = work
+
+    @property
+    def key(self):
+        return f"{self.name}[n={self.n},steps={self.steps}]"
+
+
+def make_state(n, dt=1e-3, seed=0):
+    """Random gas of n unit masses with alternating charges in a box growing with n"""
+    rng = np.random.default_rng(seed)
+    side = np.sqrt(n)
+    positions = rng.uniform(-side, side, (n, 2))
+    velocities = rng.normal(0.0, 0.1, (n, 2))
+    charge = np.where(np.arange(n) % 2, 1.0, -1.0)
+    moving = np.ones(n, dtype=bool)
+    return SimulationState(positions, velocities, charge, np.ones(n), moving, moving, dt)
+
+
+def make_trajectory(n, steps):
+    """Initial state and the (steps, n, 2) positions and velocities of a leapfrog run"""
+    state = make_state(n)
+    initial = state.copy()
+    positions, velocities = Simulation(state, get_integrator("leapfrog")).advance(steps)
+    return initial, positions, velocities
+
+
+def force_evaluations_per_step(name):
+    """Force evaluations one step of an integrator costs on a small scene"""
+    state = make_state(3)
+    integrator = get_integrator(name)
+    integrator.prepare(state)
+    before = integrator.force_evaluations
+    integrator.step(state)
+    return max(1, integrator.force_evaluations - before)
+
+
+def force_cases(sizes, steps_list):
+    for n in sizes:
+        for steps in steps_list:
+            def setup(n=n, steps=steps):
+                state = make_state(n)
+                out = np.empty((n, 2))
+
+                def run():
+                    for _ in range(steps):
+                        compute_accelerations(state.positions, state.charge, state.mass,
+                                              state.moving_ch, state.moving_m, state.k, state.G, out)
+                return run
+            yield Case("forces/compute_accelerations", n, steps, setup, n * n * steps)
+
+
+def integrator_cases(sizes, steps_list):
+    for name in available_integrators():
+        evaluations = force_evaluations_per_step(name)
+        for n in sizes:
+            for steps in steps_list:
+                def setup(n=n, steps=steps, name=name):
+                    simulation = Simulation(make_state(n), get_integrator(name))
+                    return lambda: simulation.advance(steps)
+                yield Case(f"integrator/{name}", n, steps, setup, n * n * steps * evaluations)
+
+
+def energy_cases(sizes, steps_list):
+    for n in sizes:
+        for steps in steps_list:
+            def setup_potential(n=n, steps=steps):
+                state, positions, _ = make_trajectory(n, steps)
+                return lambda: potential_energy(positions, state.charge, state.mass, state.k, state.G)
+
+            def setup_trajectory(n=n, steps=steps):
+                state, positions, velocities = make_trajectory(n, steps)
+                return lambda: trajectory_energy(positions, velocities, state.charge, state.mass,
+                                                 state.k, state.G)
+            work = n * n * steps // 2
+            yield Case("energy/potential_energy", n, steps, setup_potential, work)
+            yield Case("energy/trajectory_energy", n, steps, setup_trajectory, work)
+
+
+def render_cases(sizes, steps_list):
+    # Imported here so that the other groups run without Qt and matplotlib
+    from .render import render_setup, visualization_types
+    for viz_type in visualization_types():
+        for n in sizes:
+            for steps in steps_list:
+                def setup(n=n, steps=steps, viz_type=viz_type):
+                    return render_setup(viz_type, *make_trajectory(n, steps))
+                name = "render/" + viz_type.lower().replace(" ", "-")
+                yield Case(name, n, steps, setup, n * steps)
+
+
+def startup_cases(sizes, steps_list):
+    # A whole interpreter and front end start per repetition, independent of the scene grid
+    from .startup import LANGUAGES, check_available, launch
+    check_available()
+    for language in LANGUAGES:
+        def setup(language=language):
+            return lambda: launch(language)
+        yield Case(f"startup/first-window-{language}", 3, 0, setup, 0)
+
+
+CASE_GROUPS = {
+    "forces": force_cases,
+    "integrators": integrator_cases,
+    "energy": energy_cases,
+    "render": render_cases,
+    "startup": startup_cases,
+}
+
+
+def collect_cases(groups=GROUPS, sizes=SIZES, steps_list=STEPS):
+    """All cases of the selected groups; groups that cannot load are returned as errors"""
+    cases = []
+    errors = {}
+    for group in groups:
+        try:
+            cases.extend(CASE_GROUPS[group](sizes, steps_list))
+        except ImportError as e:
+            errors[group] = str(e)
+    return cases, errors
@@ -0,0 +1,48 @@
+"""Rendering cases: the ``draw_*`` visualizations of the front end window, offscreen."""
+import os
+
+from particle_core import Particle
+
+_window = None
+
+
+def front_end():
+    """Create one hidden, untranslated window on first use"""
+    global _window
+    if _window is None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt5.QtWidgets import QApplication
+        from particle_gui.window import ParticleSimulator
+
+        app = QApplication.instance() or QApplication([])
+        _window = ParticleSimulator()
+        # Keep the application alive as long as the window
+        _window.benchmark_app = app
+    return _window
+
+
+def visualization_types():
+    from particle_gui.window import VIZ_TYPES
+    return list(VIZ_TYPES)
+
+
+def render_setup(viz_type, state, positions, velocities):
+    """Load a trajectory into the window and return a full redraw of ``viz_type``"""
+    window = front_end()
+    particles = []
+    for i in range(state.n):
+        x, y = state.positions[i]
+        p = Particle(x, y, state.charge[i], state.mass[i], 0, 0, state.dt,
+                     True, True, f"C{i % 10}", len(positions) + 2)
+        p.add_points(positions[:, i, 0], positions[:, i, 1], use_limits=False)
+        p.add_vs(velocities[:, i, 0], velocities[:, i, 1])
+        particles.append(p)
+
+    window.particles = particles
+    window.constants["use_point_limits"] = False
+    window.integrator_name = "leapfrog"
+    # Recorders are rebuilt from the stored trajectory like after loading a scene
+    window.density = None
+    window.raster = None
+    window.energy = None
+    return lambda: window.draw_visualization(viz_type)
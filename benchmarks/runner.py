@@ -0,0 +1,93 @@
+"""Timing, result files and baseline comparison."""
+import datetime
+import json
+import os
+import platform
+import statistics
+import time
+
+import numpy as np
+
+# Pair interactions above which a case is skipped by default
+MAX_WORK = 1e9
+# Relative slowdown against the baseline that counts as a regression
+THRESHOLD = 0.25
+# Cases faster than this in the baseline are too noisy to be flagged
+MIN_TIME = 1e-3
+
+
+def machine_info():
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def time_case(case, repeat):
+    """Best and median wall time of ``repeat`` runs, each after a fresh setup"""
+    times = []
+    for _ in range(repeat):
+        run = case.setup()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times), statistics.median(times)
+
+
+def run_cases(cases, repeat=3, max_work=MAX_WORK, report=print):
+    results = {}
+    for case in cases:
+        entry = {"name": case.name, "n": case.n, "steps": case.steps}
+        if max_work and case.work > max_work:
+            entry["skipped"] = f"work {case.work:.3g} exceeds {max_work:.3g}"
+        else:
+            try:
+                entry["best"], entry["median"] = time_case(case, repeat)
+                entry["repeat"] = repeat
+            except Exception as e:
+                entry["error"] = f"{type(e).__name__}: {e}"
+        results[case.key] = entry
+        report(format_entry(case.key, entry))
+    return results
+
+
+def format_entry(key, entry):
+    if "best" in entry:
+        return f"{key:<60} {entry['best'] * 1e3:12.3f} ms"
+    return f"{key:<60} {entry.get('skipped') or entry.get('error')}"
+
+
+def save_results(path, results, errors=None):
+    data = {"machine": machine_info(), "results": results, "errors": errors or {}}
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def load_results(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def compare_results(baseline, current, threshold=THRESHOLD, min_time=MIN_TIME):
+    """(key, baseline seconds, current seconds, ratio, status) for every case timed in both"""
+    rows = []
+    for key, entry in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None or "best" not in base or "best" not in entry:
+            continue
+        ratio = entry["best"] / base["best"] if base["best"] > 0 else float("inf")
+        if base["best"] < min_time:
+            status = "ok"
+        elif ratio > 1 + threshold:
+            status = "REGRESSION"
+        elif ratio < 1 / (1 + threshold):
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((key, base["best"], entry["best"], ratio, status))
+    return rows
@@ -0,0 +1,35 @@
+"""Startup cases: time from launching a fresh interpreter to the first shown window."""
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LANGUAGES = ("en", "ru")
+LAUNCH = "import sys; from particle_gui import main; sys.exit(main({language!r}, quit_when_shown=True))"
+
+
+def check_available():
+    if importlib.util.find_spec("PyQt5") is None:
+        raise ImportError("PyQt5 is not installed")
+
+
+def launch(language="en"):
+    """Start the front end in a new, offscreen process and return its startup report"""
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+    # An empty working directory, so no stored settings or plugins are loaded
+    with tempfile.TemporaryDirectory() as directory:
+        result = subprocess.run([sys.executable, "-c", LAUNCH.format(language=language)],
+                                cwd=directory, env=env, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def format_report(language, report):
+    lines = [f"{language}: first window after {report['time_to_first_window'] * 1e3:.1f} ms in process"]
+    for name, phase in sorted(report["phases"].items(), key=lambda item: -item[1]["seconds"]):
+        lines.append(f"    {name:<20} {phase['seconds'] * 1e3:9.1f} ms {phase['share']:6.1%}")
+    return "\n".join(lines)
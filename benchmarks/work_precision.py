@@ -0,0 +1,212 @@
+"""Work-precision comparison of the registered integrators on reference scenes.
+
+Every integrator runs every scene over a sweep of step sizes (and, for
+methods with an ``eps`` option, of tolerances). Each run is measured
+against a high-precision Bulirsch-Stoer reference: the final position error
+and the relative energy drift, together with the force evaluations and the
+wall time it cost.
+"""
+import inspect
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from particle_core import (
+    EnergyRecorder, Simulation, SimulationState, available_integrators, energy_weights,
+    get_integrator, integrator_label
+)
+
+DTS = (1e-2, 5e-3, 2.5e-3, 1.25e-3, 6.25e-4)
+TOLERANCES = (1e-4, 1e-6, 1e-8, 1e-10)
+DURATION = 2.0
+REFERENCE_METHOD = "bulirsch-stoer"
+REFERENCE_OPTIONS = {"eps": 1e-12}
+
+
+def hydrogen_scene(dt):
+    """The default scene of the front ends: an electron between two fixed protons"""
+    angle = np.radians(45)
+    return SimulationState(
+        positions=[(0, 0), (-1, 0), (1, 0)],
+        velocities=[(np.cos(angle), np.sin(angle)), (0, 0), (0, 0)],
+        charge=[-1, 1, 1],
+        mass=[1, 1836, 1836],
+        moving_ch=[True, False, False],
+        moving_m=[False, False, False],
+        dt=dt,
+    )
+
+
+def binary_scene(dt):
+    """Two equal masses on a circular gravitational orbit"""
+    v = np.sqrt(0.5)
+    return SimulationState(
+        positions=[(-0.5, 0), (0.5, 0)],
+        velocities=[(0, -v), (0, v)],
+        charge=[0, 0],
+        mass=[1, 1],
+        moving_ch=[False, False],
+        moving_m=[True, True],
+        dt=dt,
+    )
+
+
+def gas_scene(dt, n=8, seed=1):
+    """A few like charges of different masses pushing each other apart"""
+    rng = np.random.default_rng(seed)
+    return SimulationState(
+        positions=rng.uniform(-2, 2, (n, 2)),
+        velocities=rng.normal(0, 0.2, (n, 2)),
+        charge=np.full(n, 0.5),
+        mass=rng.uniform(1, 2, n),
+        moving_ch=np.ones(n, dtype=bool),
+        moving_m=np.zeros(n, dtype=bool),
+        dt=dt,
+    )
+
+
+SCENES = {
+    "hydrogen": hydrogen_scene,
+    "binary": binary_scene,
+    "gas": gas_scene,
+}
+
+
+def accepts_tolerance(name):
+    return "eps" in inspect.signature(type(get_integrator(name)).__init__).parameters
+
+
+def integrate(scene, method, dt, duration, options=None):
+    """Run one scene; returns the final state, simulation, energy recorder, initial energy and wall time"""
+    state = SCENES[scene](dt)
+    simulation = Simulation(state, get_integrator(method, **(options or {})))
+    energy = simulation.add_recorder(EnergyRecorder.from_state(state))
+    initial = energy_at(state, simulation.integrator)
+    start = time.perf_counter()
+    for _ in simulation.run(int(round(duration / dt))):
+        pass
+    return state, simulation, energy, initial, time.perf_counter() - start
+
+
+def energy_at(state, integrator):
+    """Total energy and energy scale of the current state"""
+    weighted = integrator.current_potential(state) * energy_weights(state)
+    kinetic = 0.5 * np.einsum('n,nk,nk->', state.mass, state.velocities, state.velocities)
+    return kinetic + weighted.sum(), kinetic + np.abs(weighted).sum()
+
+
+def reference_positions(scene, dt, duration):
+    state = integrate(scene, REFERENCE_METHOD, dt, duration, REFERENCE_OPTIONS)[0]
+    return state.positions
+
+
+def run_job(job):
+    """Measure one (scene, method, dt, options) run against the reference positions"""
+    scene, method, dt, options, duration, reference = job
+    state, simulation, energy, (e0, scale), seconds = integrate(scene, method, dt, duration, options)
+    kinetic, electric, gravitational, _, _ = energy.snapshot()
+    weights = energy_weights(state)
+    total = kinetic + weights[0] * electric + weights[1] * gravitational
+    return {
+        "scene": scene,
+        "method": method,
+        "dt": dt,
+        "eps": options.get("eps"),
+        "steps": state.step,
+        "force_evaluations": simulation.integrator.force_evaluations,
+        "seconds": seconds,
+        "error": float(np.max(np.linalg.norm(state.positions - reference, axis=1))),
+        "energy_drift": float(np.max(np.abs(total - e0)) / (scale or 1.0)),
+    }
+
+
+def make_jobs(scenes, methods, dts, tolerances, duration, report=print):
+    jobs = []
+    for scene in scenes:
+        reference_dt = min(dts) / 2
+        report(f"Computing the {scene} reference with dt = {reference_dt:g}")
+        reference = reference_positions(scene, reference_dt, duration)
+        for method in methods:
+            for dt in dts:
+                jobs.append((scene, method, dt, {}, duration, reference))
+            if accepts_tolerance(method):
+                for eps in tolerances:
+                    jobs.append((scene, method, max(dts), {"eps": eps}, duration, reference))
+    return jobs
+
+
+def sweep(scenes=tuple(SCENES), methods=None, dts=DTS, tolerances=TOLERANCES, duration=DURATION,
+          jobs=None, report=print):
+    """Run every job, in parallel processes, and return the measured rows"""
+    methods = methods or available_integrators()
+    work = make_jobs(scenes, methods, dts, tolerances, duration, report)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(run_job, work))
+
+
+def cheapest(rows, target, key="error"):
+    """Per scene, the row reaching ``key <= target`` with the fewest force evaluations"""
+    best = {}
+    for row in rows:
+        if row[key] <= target:
+            current = best.get(row["scene"])
+            # Ties go to the more accurate run
+            if current is None or ((row["force_evaluations"], row[key])
+                                   < (current["force_evaluations"], current[key])):
+                best[row["scene"]] = row
+    return best
+
+
+def format_table(rows):
+    lines = [f"{'scene':<10} {'method':<16} {'dt':>10} {'eps':>8} {'force evals':>12} "
+             f"{'seconds':>9} {'error':>10} {'drift':>10}"]
+    for row in sorted(rows, key=lambda r: (r["scene"], r["method"], -r["dt"], -(r["eps"] or 0))):
+        eps = f"{row['eps']:.0e}" if row["eps"] is not None else "-"
+        lines.append(f"{row['scene']:<10} {row['method']:<16} {row['dt']:>10.3g} {eps:>8} "
+                     f"{row['force_evaluations']:>12} {row['seconds']:>9.3f} "
+                     f"{row['error']:>10.2e} {row['energy_drift']:>10.2e}")
+    return "\n".join(lines)
+
+
+def save_rows(path, rows):
+    with open(path, "w") as f:
+        json.dump(rows, f, indent=2)
+
+
+def plot(rows, path):
+    """Error against force evaluations and energy drift against wall time, per scene"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    scenes = sorted({row["scene"] for row in rows})
+    fig, axes = plt.subplots(len(scenes), 2, figsize=(11, 4 * len(scenes)), squeeze=False)
+    for (ax_error, ax_drift), scene in zip(axes, scenes):
+        for method in dict.fromkeys(row["method"] for row in rows):
+            # One curve per method and swept parameter
+            for by_eps in (False, True):
+                series = sorted((r for r in rows if r["scene"] == scene and r["method"] == method
+                                 and (r["eps"] is not None) == by_eps),
+                                key=lambda r: r["force_evaluations"])
+                if not series:
+                    continue
+                label = integrator_label(method) + (" (eps sweep)" if by_eps else "")
+                style = "s--" if by_eps else "o-"
+                ax_error.loglog([r["force_evaluations"] for r in series],
+                                [max(r["error"], 1e-16) for r in series], style, label=label)
+                ax_drift.loglog([r["seconds"] for r in series],
+                                [max(r["energy_drift"], 1e-16) for r in series], style, label=label)
+        ax_error.set_title(f"{scene}: final position error")
+        ax_error.set_xlabel("Force evaluations")
+        ax_error.set_ylabel("Error")
+        ax_drift.set_title(f"{scene}: relative energy drift")
+        ax_drift.set_xlabel("Wall time, s")
+        ax_drift.set_ylabel("Drift")
+        for ax in (ax_error, ax_drift):
+            ax.grid(True, which="both", alpha=0.3)
+            ax.legend()
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
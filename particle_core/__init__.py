@@ -0,0 +1,21 @@
+"""Simulation core shared by the English and Russian front ends."""
+from .forces import compute_accelerations, fixed_potential_energy, potential_energy
+from .integrators import (
+    Integrator, available_integrators, get_integrator, integrator_label,
+    load_integrator_plugins, register_integrator,
+)
+from .density import DensityAccumulator, bin_positions, group_layers
+from .raster import TrajectoryRaster, shade
+from .energy import EnergyRecorder, energy_weights, trajectory_energy
+from .watchdog import EnergyDriftError, EnergyWatchdog
+from .timers import PhaseTimers
+from .profiler import RunProfiler
+from .engine import Simulation
+from .checkpoint import Checkpoint, CheckpointWriter, load_checkpoint
+from .scene import (
+    Particle, convert_scene, load_scene, load_scene_columns, particles_from_columns, save_scene,
+    save_scene_columns, scene_columns, scene_records,
+)
+from .generators import electron_cloud, lattice, merge_scenes, random_gas, rotating_disk, scene_from_arrays
+from .state import SimulationState
+from .store import ChunkedArray, StoredTrajectory, TrajectoryStore, open_trajectory
@@ -0,0 +1,226 @@
+"""Checkpoints of a running simulation, for restarting long runs exactly.
+
+A :class:`Checkpoint` is a copy of everything a
+:class:`~particle_core.engine.Simulation` needs to continue: positions,
+velocities, step counter and constants of the state, the name, options and
+carried arrays of the integrator (accelerations, the previous positions of
+Verlet), the potential energy it last evaluated and the reference energy
+of an attached watchdog. Taking one copies a few (n, 2) arrays, so the
+integrating thread can do it between two blocks and leave writing the file
+to a :class:`CheckpointWriter`.
+
+Checkpoints are stored as compressed ``.npz`` files: the arrays under
+their names plus a JSON ``header`` with the scalars and the metadata of
+the run. :meth:`Checkpoint.simulation` rebuilds the simulation, and
+integrating it from there gives bit-identical steps to the run that was
+checkpointed.
+"""
+import json
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from .engine import Simulation
+from .integrators import get_integrator
+from .state import SimulationState
+from .watchdog import EnergyWatchdog
+
+CHECKPOINT_VERSION = 1
+STATE_ARRAYS = ("positions", "velocities", "charge", "mass", "moving_ch", "moving_m")
+# Checkpoints of a run kept on disk by a CheckpointWriter, the oldest are removed
+KEEP_CHECKPOINTS = 3
+
+
+def checkpoint_name(step):
+    return f"step_{step:012d}.npz"
+
+
+class Checkpoint:
+    """Exact copy of a simulation at one step, see :meth:`capture`"""
+
+    def __init__(self, arrays, header):
+        self.arrays = arrays
+        self.header = header
+
+    @classmethod
+    def capture(cls, simulation, metadata=None):
+        """Copy the current state of ``simulation``; ``metadata`` is stored with it"""
+        state = simulation.state
+        integrator = simulation.integrator
+        arrays = {name: np.array(getattr(state, name)) for name in STATE_ARRAYS}
+        for name, value in integrator.get_carried().items():
+            arrays["integrator." + name] = value
+        header = {
+            "format": CHECKPOINT_VERSION,
+            "step": state.step,
+            "dt": state.dt,
+            "k": state.k,
+            "G": state.G,
+            "method": integrator.name,
+            "options": integrator.options(),
+            "force_evaluations": integrator.force_evaluations,
+            "potential_step": None,
+            "watchdog": None,
+            "metadata": dict(metadata or {}),
+        }
+        if integrator.potential is not None:
+            # Reused by recorders and the watchdog for the step it was evaluated at
+            arrays["integrator.potential"] = integrator.potential.copy()
+            header["potential_step"] = integrator.potential_step
+        watchdog = simulation.watchdog
+        if watchdog is not None:
+            carried = watchdog.get_carried()
+            arrays["watchdog.reference_total"] = carried.pop("reference_total")
+            arrays["watchdog.reference_scale"] = carried.pop("reference_scale")
+            header["watchdog"] = {"options": watchdog.options(), "carried": carried}
+        return cls(arrays, header)
+
+    @property
+    def step(self):
+        return self.header["step"]
+
+    @property
+    def metadata(self):
+        return self.header["metadata"]
+
+    def state(self):
+        """The :class:`~particle_core.state.SimulationState` at the checkpoint"""
+        header = self.header
+        state = SimulationState(*(self.arrays[name] for name in STATE_ARRAYS),
+                                header["dt"], header["k"], header["G"])
+        state.step = header["step"]
+        return state
+
+    def simulation(self):
+        """A :class:`~particle_core.engine.Simulation` continuing from the checkpoint"""
+        header = self.header
+        integrator = get_integrator(header["method"], **header["options"])
+        simulation = Simulation(self.state(), integrator)
+        # prepare() started the integrator afresh, put the carried arrays of the run back
+        integrator.set_carried({name[len("integrator."):]: value for name, value in self.arrays.items()
+                                if name.startswith("integrator.")})
+        integrator.force_evaluations = header["force_evaluations"]
+        if header["potential_step"] is not None:
+            integrator.potential = self.arrays["integrator.potential"].copy()
+            integrator.potential_step = header["potential_step"]
+        if header["watchdog"] is not None:
+            watchdog = simulation.set_watchdog(EnergyWatchdog(**header["watchdog"]["options"]))
+            watchdog.set_carried(dict(
+                header["watchdog"]["carried"],
+                reference_total=self.arrays["watchdog.reference_total"],
+                reference_scale=self.arrays["watchdog.reference_scale"],
+            ))
+        return simulation
+
+    def save(self, path):
+        """Write the checkpoint to ``path``, replacing the file only once it is complete"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, header=np.array(json.dumps(self.header)), **self.arrays)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files if name != "header"}
+            header = json.loads(str(data["header"]))
+        if header.get("format") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint format: {header.get('format')!r}")
+        return cls(arrays, header)
+
+
+def load_checkpoint(path):
+    """Read a checkpoint written by :meth:`Checkpoint.save`"""
+    return Checkpoint.load(path)
+
+
+class CheckpointWriter:
+    """Write checkpoints of a run to a directory from a background thread.
+
+    The integrating thread calls :meth:`poll` between blocks: it captures a
+    checkpoint when one was requested with :meth:`request` (from any thread)
+    or, with ``interval`` seconds > 0, when the last one is older than
+    that. Captured checkpoints are written by a daemon thread, so disk
+    latency never stalls the run; only the ``keep`` newest files are kept.
+    ``on_saved(path)`` is called from the writing thread after every file.
+    :meth:`close` waits for the pending writes.
+    """
+
+    def __init__(self, directory, interval=0, metadata=None, keep=KEEP_CHECKPOINTS, on_saved=None):
+        self.directory = directory
+        self.interval = interval
+        self.metadata = metadata or {}
+        self.keep = keep
+        self.on_saved = on_saved
+        self.paths = []
+        self.errors = []
+        self._requested = threading.Event()
+        self._last = time.perf_counter()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write_loop, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def request(self):
+        """Capture a checkpoint at the next :meth:`poll`"""
+        self._requested.set()
+
+    @property
+    def requested(self):
+        return self._requested.is_set()
+
+    def due(self):
+        return self.requested or (self.interval > 0 and time.perf_counter() - self._last >= self.interval)
+
+    def poll(self, simulation):
+        """Capture a checkpoint of ``simulation`` if one is due, return whether it did"""
+        if not self.due():
+            return False
+        self.save(simulation)
+        return True
+
+    def save(self, simulation):
+        """Capture a checkpoint now and queue it for writing"""
+        self._requested.clear()
+        self._last = time.perf_counter()
+        checkpoint = Checkpoint.capture(simulation, self.metadata)
+        self._queue.put(checkpoint)
+        return checkpoint
+
+    def _write_loop(self):
+        while True:
+            checkpoint = self._queue.get()
+            if checkpoint is None:
+                return
+            try:
+                path = checkpoint.save(os.path.join(self.directory, checkpoint_name(checkpoint.step)))
+            except OSError as e:
+                self.errors.append(e)
+                continue
+            if path not in self.paths:
+                self.paths.append(path)
+            while len(self.paths) > self.keep:
+                try:
+                    os.remove(self.paths.pop(0))
+                except OSError:
+                    pass
+            if self.on_saved is not None:
+                self.on_saved(path)
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
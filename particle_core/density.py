@@ -0,0 +1,180 @@
+"""Streaming 2D position histograms."""
+import threading
+
+import numpy as np
+
+
+def group_layers(keys):
+    """Map one key per particle to layer indices, in order of first appearance.
+
+    Returns the (n,) layer index array and the list of distinct keys, so
+    ``group_layers([p.color for p in particles])`` gives per-color layers.
+    A key of None drops the particle from the density.
+    """
+    labels = []
+    index = {}
+    layers = np.empty(len(keys), dtype=np.intp)
+    for i, key in enumerate(keys):
+        if key is None:
+            layers[i] = -1
+            continue
+        if key not in index:
+            index[key] = len(labels)
+            labels.append(key)
+        layers[i] = index[key]
+    return layers, labels
+
+
+def bin_positions(x, y, layers, bins, extent, n_layers=1):
+    """Count points per layer on a regular grid in a single bincount.
+
+    ``layers`` gives the layer of every point (or one layer for all of
+    them), points with a negative layer or outside of the
+    (x_min, x_max, y_min, y_max) extent are dropped. Returns a
+    (n_layers, ny, nx) array; points on the upper edge fall in the last bin
+    like with ``np.histogram2d``.
+    """
+    nx, ny = bins
+    x_min, x_max, y_min, y_max = extent
+    layers = np.broadcast_to(np.asarray(layers, dtype=np.intp), np.shape(x))
+    keep = (layers >= 0) & (x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max)
+    if not keep.all():
+        x, y, layers = x[keep], y[keep], layers[keep]
+    ix = np.minimum(((x - x_min) * (nx / (x_max - x_min))).astype(np.intp), nx - 1)
+    iy = np.minimum(((y - y_min) * (ny / (y_max - y_min))).astype(np.intp), ny - 1)
+    flat = (layers * ny + iy) * nx + ix
+    return np.bincount(flat, minlength=n_layers * ny * nx).reshape(n_layers, ny, nx)
+
+
+def _fold(counts, axis, offset):
+    """Merge neighbouring cells along ``axis`` after the extent was doubled.
+
+    Old cell ``i`` goes to new cell ``(offset + i) // 2``, where ``offset``
+    is 0 when the extent grew upwards and ``n`` when it grew downwards.
+    """
+    counts = np.moveaxis(counts, axis, -1)
+    n = counts.shape[-1]
+    pad = [(0, 0)] * (counts.ndim - 1)
+    front = offset % 2
+    padded = np.pad(counts, pad + [(front, (n + front) % 2)])
+    pairs = padded.reshape(padded.shape[:-1] + (-1, 2)).sum(axis=-1)
+    merged = np.zeros_like(counts)
+    merged[..., offset // 2:offset // 2 + pairs.shape[-1]] = pairs
+    return np.moveaxis(merged, -1, axis)
+
+
+class DensityAccumulator:
+    """Online 2D histogram of particle positions, split into layers.
+
+    ``record`` has the signature of a :class:`~particle_core.engine.Simulation`
+    recorder, so the accumulator can be attached to an engine and is then
+    updated with every integrated block, independent of how much trajectory
+    the front end keeps. ``layers`` assigns every particle to a layer (see
+    :func:`group_layers`), by default all particles share one layer. Counts
+    are stored as a (n_layers, ny, nx) array ready for ``imshow``.
+
+    With ``extent=None`` the extent is taken from the first points and
+    doubled towards any point that falls outside of it. Every old cell lies
+    inside exactly one new cell, so expanding never redistributes counts
+    approximately. With a fixed ``(x_min, x_max, y_min, y_max)`` extent
+    points outside of it are dropped.
+    """
+
+    def __init__(self, bins, extent=None, layers=None, stride=1, margin=0.05):
+        self.bins = tuple(bins)
+        nx, ny = self.bins
+        self.layers = None if layers is None else np.asarray(layers, dtype=np.intp)
+        n_layers = 1 if layers is None else max(int(self.layers.max(initial=-1)) + 1, 1)
+        self.counts = np.zeros((n_layers, ny, nx), dtype=np.int64)
+        self.extent = None if extent is None else tuple(float(v) for v in extent)
+        self.auto_expand = extent is None
+        self.stride = max(1, stride)
+        self.margin = margin
+        self._phase = 0
+        self._lock = threading.Lock()
+
+    @property
+    def n_layers(self):
+        return self.counts.shape[0]
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def record(self, positions, velocities=None, potentials=None):
+        """Bin every ``stride``-th step of a (k, n, 2) block of positions"""
+        k = len(positions)
+        sampled = positions[self._phase::self.stride]
+        self._phase = (self._phase - k) % self.stride
+        layers = 0 if self.layers is None else np.broadcast_to(self.layers, sampled.shape[:2])
+        self.add_points(sampled[..., 0], sampled[..., 1], layers)
+
+    def add_points(self, x, y, layer=0):
+        """Bin points given as coordinate arrays, ``layer`` is a scalar or per point"""
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        layer = np.asarray(layer, dtype=np.intp)
+        layer = layer.ravel() if layer.ndim else np.broadcast_to(layer, x.shape)
+        finite = np.isfinite(x) & np.isfinite(y)
+        if not finite.all():
+            x, y, layer = x[finite], y[finite], layer[finite]
+        if x.size == 0:
+            return
+
+        with self._lock:
+            if self.extent is None:
+                self.extent = self._initial_extent(x, y)
+            elif self.auto_expand:
+                self._expand(0, x.min(), x.max())
+                self._expand(1, y.min(), y.max())
+            self.counts += bin_positions(x, y, layer, self.bins, self.extent, self.n_layers)
+
+    def histogram(self, layer=None):
+        """Return the (ny, nx) counts of one layer, or of all layers summed, and the extent"""
+        with self._lock:
+            if layer is None:
+                return self.counts.sum(axis=0), self.extent
+            return self.counts[layer].copy(), self.extent
+
+    def layer_histograms(self):
+        """Return a copy of the (n_layers, ny, nx) counts and the extent"""
+        with self._lock:
+            return self.counts.copy(), self.extent
+
+    def marginals(self, axis):
+        """Per-layer counts along X (axis=0) or Y (axis=1) and their bin edges"""
+        counts, extent = self.layer_histograms()
+        if extent is None:
+            return None
+        edges = np.linspace(extent[2 * axis], extent[2 * axis + 1], self.bins[axis] + 1)
+        return counts.sum(axis=1 if axis == 0 else 2), edges
+
+    def _initial_extent(self, x, y):
+        extent = []
+        for values in (x, y):
+            lo, hi = values.min(), values.max()
+            span = hi - lo
+            if span == 0:
+                span = max(abs(lo), 1.0)
+            extent.extend((float(lo - span * self.margin), float(hi + span * self.margin)))
+        return tuple(extent)
+
+    def _expand(self, axis, lo, hi):
+        """Double the extent along ``axis`` until it covers [lo, hi]"""
+        start, stop = self.extent[2 * axis:2 * axis + 2]
+        counts = self.counts
+        n = self.bins[axis]
+        while lo < start or hi > stop:
+            width = stop - start
+            if lo < start:
+                # The old cells become the upper half of the new grid
+                start -= width
+                counts = _fold(counts, 2 - axis, n)
+            else:
+                stop += width
+                counts = _fold(counts, 2 - axis, 0)
+        if counts is not self.counts:
+            self.counts = counts
+            extent = list(self.extent)
+            extent[2 * axis:2 * axis + 2] = start, stop
+            self.extent = tuple(extent)
@@ -0,0 +1,127 @@
+"""Energy and conserved quantities recorded while integrating."""
+import threading
+
+import numpy as np
+
+from .forces import potential_energy
+
+# Bytes of temporaries a chunk of frames may use in trajectory_energy
+ENERGY_BUDGET = 1 << 23
+
+
+def energy_weights(state):
+    """(electric, gravitational) weights of the potentials in the conserved total energy.
+
+    An interaction that moves no particle does no work, so its potential
+    is left out of the total.
+    """
+    return np.array([state.moving_ch.any(), state.moving_m.any()], dtype=float)
+
+
+def frames_per_chunk(n, memory_budget=ENERGY_BUDGET):
+    """Number of frames of n particles whose temporaries fit in ``memory_budget`` bytes"""
+    # The float copies of positions and velocities plus the pair row temporaries
+    return max(1, int(memory_budget) // (8 * 8 * max(n, 1)))
+
+
+def trajectory_energy(positions, velocities, charge, mass, k=1.0, G=1.0,
+                      memory_budget=ENERGY_BUDGET):
+    """Kinetic, electric and gravitational energy of every frame of a trajectory.
+
+    ``positions`` and ``velocities`` are (T, n, 2) arrays, memory-mapped
+    ones included: they are read in time chunks sized to
+    ``memory_budget``, and every chunk is evaluated at once over all its
+    frames and pairs. Returns three (T,) arrays.
+    """
+    charge = np.asarray(charge, dtype=float)
+    mass = np.asarray(mass, dtype=float)
+    T = len(positions)
+    kinetic = np.empty(T)
+    potentials = np.empty((T, 2))
+    chunk = frames_per_chunk(np.shape(positions)[1], memory_budget)
+    for start in range(0, T, chunk):
+        end = min(start + chunk, T)
+        x = np.asarray(positions[start:end], dtype=float)
+        v = np.asarray(velocities[start:end], dtype=float)
+        kinetic[start:end] = 0.5 * np.einsum('n,tnk,tnk->t', mass, v, v)
+        potentials[start:end] = potential_energy(x, charge, mass, k, G)
+    return kinetic, potentials[:, 0], potentials[:, 1]
+
+
+class EnergyRecorder:
+    """Kinetic and potential energy, momentum and angular momentum of every step.
+
+    Attached to a :class:`~particle_core.engine.Simulation` the recorder
+    receives the potential energy the force kernel computed at the end of
+    each step, so recording costs no extra pair loop. Blocks recorded
+    without potentials (stored trajectories) are evaluated in chunks with
+    :func:`trajectory_energy`.
+
+    Values live in preallocated arrays that double in size when full;
+    :meth:`snapshot` returns views of the recorded part.
+    """
+    needs_potential = True
+
+    def __init__(self, charge, mass, k=1.0, G=1.0, capacity=1024):
+        self.charge = np.asarray(charge, dtype=float)
+        self.mass = np.asarray(mass, dtype=float)
+        self.k = k
+        self.G = G
+        self.count = 0
+        self._lock = threading.Lock()
+        self._allocate(max(1, capacity))
+
+    @classmethod
+    def from_state(cls, state, capacity=1024):
+        return cls(state.charge, state.mass, state.k, state.G, capacity)
+
+    def _allocate(self, capacity):
+        self.kinetic = np.empty(capacity)
+        self.electric = np.empty(capacity)
+        self.gravitational = np.empty(capacity)
+        self.momentum = np.empty((capacity, 2))
+        self.angular_momentum = np.empty(capacity)
+
+    def _reserve(self, k):
+        capacity = len(self.kinetic)
+        if self.count + k <= capacity:
+            return
+        old = (self.kinetic, self.electric, self.gravitational, self.momentum, self.angular_momentum)
+        self._allocate(max(2 * capacity, self.count + k))
+        new = (self.kinetic, self.electric, self.gravitational, self.momentum, self.angular_momentum)
+        for src, dst in zip(old, new):
+            dst[:self.count] = src[:self.count]
+
+    def record(self, positions, velocities, potentials=None):
+        """Append the quantities of a (k, n, 2) block of positions and velocities"""
+        k = len(positions)
+        if k == 0:
+            return
+        mass = self.mass
+        if potentials is None:
+            kinetic, electric, gravitational = trajectory_energy(
+                positions, velocities, self.charge, mass, self.k, self.G)
+        else:
+            kinetic = 0.5 * np.einsum('n,tnk,tnk->t', mass, velocities, velocities)
+            electric, gravitational = potentials[:, 0], potentials[:, 1]
+        momentum = np.einsum('n,tnk->tk', mass, velocities)
+        angular_momentum = np.einsum(
+            'n,tn->t', mass,
+            positions[..., 0] * velocities[..., 1] - positions[..., 1] * velocities[..., 0])
+
+        with self._lock:
+            self._reserve(k)
+            end = self.count + k
+            self.kinetic[self.count:end] = kinetic
+            self.electric[self.count:end] = electric
+            self.gravitational[self.count:end] = gravitational
+            self.momentum[self.count:end] = momentum
+            self.angular_momentum[self.count:end] = angular_momentum
+            self.count = end
+
+    def snapshot(self):
+        """Views of (kinetic, electric, gravitational, momentum, angular_momentum) recorded so far"""
+        with self._lock:
+            n = self.count
+            return (self.kinetic[:n], self.electric[:n], self.gravitational[:n],
+                    self.momentum[:n], self.angular_momentum[:n])
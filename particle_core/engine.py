@@ -0,0 +1,120 @@
+"""Headless simulation engine: a state advanced by one resolved integrator."""
+import time
+
+import numpy as np
+
+from .integrators import get_integrator
+from .state import SimulationState
+from .watchdog import EnergyDriftError
+
+
+class Simulation:
+    """A particle system together with the integrator that advances it.
+
+    ``advance`` integrates a block of steps and returns the positions and
+    velocities of every step as (k, n, 2) arrays, which is what the front
+    ends append to the particle trajectories. Every block is also passed to
+    the attached recorders (objects with a
+    ``record(positions, velocities, potentials)`` method), which lets
+    statistics follow the whole run without the trajectory being stored.
+    Recorders that set ``needs_potential`` get the (k, 2) electric and
+    gravitational potential energy of every step, otherwise None.
+
+    With an :class:`~particle_core.watchdog.EnergyWatchdog` set, blocks are
+    integrated in checked segments. If the watchdog aborts, the steps that
+    passed the check are still recorded and attached to the raised
+    :class:`~particle_core.watchdog.EnergyDriftError` as ``block``.
+
+    :meth:`set_timers` instruments the run: force kernel calls, the rest of
+    the integrator stages and the recorders are timed as the ``forces``,
+    ``stages`` and ``record`` phases.
+    """
+
+    def __init__(self, state, integrator):
+        self.state = state
+        self.integrator = integrator
+        self.integrator.prepare(state)
+        self.recorders = []
+        self.watchdog = None
+        self.timers = None
+        self._evaluations_start = 0
+
+    @classmethod
+    def from_particles(cls, particles, constants, method="verlet", **options):
+        state = SimulationState.from_particles(particles, constants)
+        return cls(state, get_integrator(method, **options))
+
+    @property
+    def method(self):
+        return self.integrator.name
+
+    def add_recorder(self, recorder):
+        if getattr(recorder, "needs_potential", False):
+            self.integrator.track_potential = True
+        self.recorders.append(recorder)
+        return recorder
+
+    def set_watchdog(self, watchdog):
+        self.integrator.track_potential = True
+        watchdog.start(self.state, self.integrator)
+        self.watchdog = watchdog
+        return watchdog
+
+    def set_timers(self, timers):
+        self.timers = self.integrator.timers = timers
+        self._evaluations_start = self.integrator.force_evaluations
+        return timers
+
+    def timing_report(self):
+        """Phase timings of an instrumented run together with the run parameters"""
+        timers = self.timers
+        evaluations = self.integrator.force_evaluations - self._evaluations_start
+        return timers.report(
+            method=self.method,
+            particles=self.state.n,
+            dt=self.state.dt,
+            force_evaluations=evaluations,
+            force_evaluations_per_step=evaluations / timers.steps if timers.steps else None,
+        )
+
+    def advance(self, k):
+        """Integrate k steps and return the recorded (positions, velocities)"""
+        n = self.state.n
+        positions = np.empty((k, n, 2))
+        velocities = np.empty((k, n, 2))
+        potentials = np.empty((k, 2)) if self.integrator.track_potential else None
+        error = None
+        timers = self.timers
+        if timers is not None:
+            start = time.perf_counter()
+            forces_before = timers.seconds.get("forces", 0.0)
+        if self.watchdog is None:
+            self.integrator.step_many(self.state, k, positions, velocities, potentials)
+        else:
+            try:
+                self.watchdog.advance(self.state, self.integrator, k, positions, velocities, potentials)
+            except EnergyDriftError as e:
+                error = e
+                k = e.accepted
+                positions, velocities, potentials = positions[:k], velocities[:k], potentials[:k]
+        if timers is not None:
+            # Everything but the force kernel calls made meanwhile
+            forces = timers.seconds.get("forces", 0.0) - forces_before
+            timers.add("stages", time.perf_counter() - start - forces)
+            timers.add_steps(k)
+            start = time.perf_counter()
+        for recorder in self.recorders:
+            recorder.record(positions, velocities, potentials)
+        if timers is not None:
+            timers.add("record", time.perf_counter() - start)
+        if error is not None:
+            error.block = (positions, velocities)
+            raise error
+        return positions, velocities
+
+    def run(self, steps, chunk=1000):
+        """Integrate ``steps`` steps, yielding the recorded blocks as they are produced"""
+        while steps > 0:
+            k = min(steps, chunk)
+            yield self.advance(k)
+            steps -= k
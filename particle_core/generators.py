@@ -0,0 +1,164 @@
+"""Procedural scenes built as arrays: lattices, random gases, disks and electron clouds.
+
+Every generator returns the columns of a scene (see
+:mod:`particle_core.scene`) computed with whole-array operations from a
+seeded ``numpy.random.Generator``, so the same arguments always give the
+same scene. The columns go straight into the engine with
+:meth:`SimulationState.from_columns <particle_core.state.SimulationState.from_columns>`
+or to disk with :func:`~particle_core.scene.save_scene_columns`; no
+per-particle object is built. Scenes combine with :func:`merge_scenes`.
+"""
+import numpy as np
+
+from .scene import SCENE_COLUMNS, SCENE_DEFAULTS
+
+# Colors of positive, negative and neutral particles, as the per charge sign density layers
+CHARGE_COLORS = {1: "red", -1: "blue", 0: "gray"}
+LATTICE_KINDS = ("square", "hex")
+VELOCITY_DISTRIBUTIONS = ("maxwell", "uniform")
+
+
+def scene_from_arrays(positions, velocities, charge, mass, moving_ch, moving_m, dt, color=None,
+                      max_points=SCENE_DEFAULTS["max_points"]):
+    """Scene columns of particles given as (n, 2) positions and velocities.
+
+    Scalars are broadcast to every particle; without ``color`` particles
+    are colored by the sign of their charge.
+    """
+    positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+    velocities = np.asarray(velocities, dtype=float).reshape(-1, 2)
+    n = len(positions)
+    charge = np.broadcast_to(np.asarray(charge, dtype=float), n)
+    if color is None:
+        color = np.where(charge > 0, CHARGE_COLORS[1],
+                         np.where(charge < 0, CHARGE_COLORS[-1], CHARGE_COLORS[0]))
+    values = {
+        "posx": positions[:, 0],
+        "posy": positions[:, 1],
+        "charge": charge,
+        "mass": mass,
+        "velocity": np.hypot(velocities[:, 0], velocities[:, 1]),
+        "angle": np.degrees(np.arctan2(velocities[:, 1], velocities[:, 0])),
+        "dt": dt,
+        "is_moving_ch": moving_ch,
+        "is_moving_m": moving_m,
+        "color": color,
+        "max_points": max_points,
+    }
+    return {field: np.array(np.broadcast_to(np.asarray(values[field], dtype=dtype), n))
+            for field, dtype in SCENE_COLUMNS.items()}
+
+
+def merge_scenes(*scenes):
+    """One scene with the particles of all ``scenes`` in order"""
+    return {field: np.concatenate([np.asarray(scene[field], dtype=dtype) for scene in scenes])
+            for field, dtype in SCENE_COLUMNS.items()}
+
+
+def lattice(rows, cols, spacing=1.0, kind="square", charge=1.0, mass=1836.0, center=(0.0, 0.0),
+            alternate=False, dt=1e-4):
+    """Fixed ions on a ``rows`` x ``cols`` square or hexagonal lattice around ``center``.
+
+    With ``alternate`` neighbouring ions have opposite charges (a rock-salt
+    pattern on the square lattice, alternating rows on the hexagonal one).
+    """
+    if kind not in LATTICE_KINDS:
+        raise ValueError(f"Unknown lattice kind: {kind!r}")
+    i, j = np.divmod(np.arange(rows * cols), cols)
+    x = j * spacing
+    y = i * spacing
+    if kind == "hex":
+        # Every other row is shifted by half a spacing, rows are sqrt(3)/2 apart
+        x = x + 0.5 * spacing * (i % 2)
+        y = y * (np.sqrt(3) / 2)
+    positions = np.stack([x - x.mean() + center[0], y - y.mean() + center[1]], axis=1)
+    charges = np.full(rows * cols, float(charge))
+    if alternate:
+        parity = (i + j) % 2 if kind == "square" else i % 2
+        charges[parity == 1] *= -1
+    return scene_from_arrays(positions, np.zeros_like(positions), charges, mass, False, False, dt)
+
+
+def random_gas(n, size=10.0, temperature=1.0, mass=1.0, charges=(1.0, -1.0), distribution="maxwell",
+               center=(0.0, 0.0), zero_momentum=True, gravity=False, dt=1e-4, seed=0):
+    """``n`` free particles spread uniformly over a square of side ``size``.
+
+    Velocities follow a 2D Maxwell-Boltzmann distribution of ``temperature``
+    (in units where k_B = 1), or with ``distribution="uniform"`` have a
+    speed uniform up to the thermal speed sqrt(2 T / m) in a random direction.
+    Each particle takes one of ``charges`` at random; ``zero_momentum``
+    removes the drift of the center of mass.
+    """
+    if distribution not in VELOCITY_DISTRIBUTIONS:
+        raise ValueError(f"Unknown velocity distribution: {distribution!r}")
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform(-size / 2, size / 2, (n, 2)) + center
+    if distribution == "maxwell":
+        velocities = rng.normal(0.0, np.sqrt(temperature / mass), (n, 2))
+    else:
+        speed = rng.uniform(0.0, np.sqrt(2 * temperature / mass), n)
+        direction = rng.uniform(0.0, 2 * np.pi, n)
+        velocities = speed[:, None] * np.stack([np.cos(direction), np.sin(direction)], axis=1)
+    if zero_momentum and n:
+        velocities -= velocities.mean(axis=0)
+    charge = rng.choice(np.asarray(charges, dtype=float), n)
+    return scene_from_arrays(positions, velocities, charge, mass, True, gravity, dt)
+
+
+def rotating_disk(n, radius=10.0, central_mass=1000.0, mass=1.0, G=1.0, scale_length=None,
+                  center=(0.0, 0.0), clockwise=False, dt=1e-4, seed=0):
+    """A gravitating disk of ``n`` stars on circular orbits around a central mass.
+
+    Radii follow an exponential surface density with ``scale_length``
+    (``radius / 3`` by default) cut at ``radius``; each star gets the
+    circular speed of the central mass plus the disk mass inside its
+    orbit. The central mass is the first particle of the scene, fixed at
+    ``center``. ``G`` has to match the constant of the run.
+    """
+    rng = np.random.default_rng(seed)
+    scale_length = scale_length or radius / 3
+    # The radii of an exponential disk, r exp(-r / h), are Gamma(2, h); redraw those past the edge
+    r = rng.gamma(2.0, scale_length, n)
+    outside = r > radius
+    while outside.any():
+        r[outside] = rng.gamma(2.0, scale_length, outside.sum())
+        outside = r > radius
+    r = np.maximum(r, radius * 1e-3)
+    phi = rng.uniform(0.0, 2 * np.pi, n)
+    positions = np.stack([r * np.cos(phi), r * np.sin(phi)], axis=1) + center
+
+    enclosed = np.empty(n)
+    enclosed[np.argsort(r)] = np.arange(n) * mass
+    speed = np.sqrt(G * (central_mass + enclosed) / r)
+    sense = -1.0 if clockwise else 1.0
+    velocities = sense * speed[:, None] * np.stack([-np.sin(phi), np.cos(phi)], axis=1)
+
+    core = scene_from_arrays([center], [(0.0, 0.0)], 0.0, central_mass, False, False, dt, "black")
+    stars = scene_from_arrays(positions, velocities, 0.0, mass, False, True, dt, "C0")
+    return merge_scenes(core, stars)
+
+
+def electron_cloud(n, bohr_radius=1.0, nuclear_charge=None, electron_charge=-1.0, electron_mass=1.0,
+                   nuclear_mass=1836.0, k=1.0, center=(0.0, 0.0), dt=1e-4, seed=0):
+    """``n`` electrons around a fixed nucleus, placed like the hydrogen ground state.
+
+    Distances from the nucleus follow the 1s radial density
+    r^2 exp(-2 r / a0); each electron moves on the circular orbit of its
+    radius around the nucleus, in a random sense. The nucleus, charge
+    ``n`` times the electron charge (a neutral atom) unless given, is the
+    first particle of the scene. ``k`` has to match the constant of the run.
+    """
+    rng = np.random.default_rng(seed)
+    if nuclear_charge is None:
+        nuclear_charge = -n * electron_charge
+    r = np.maximum(rng.gamma(3.0, bohr_radius / 2, n), bohr_radius * 1e-3)
+    phi = rng.uniform(0.0, 2 * np.pi, n)
+    positions = np.stack([r * np.cos(phi), r * np.sin(phi)], axis=1) + center
+
+    speed = np.sqrt(k * abs(nuclear_charge * electron_charge) / (electron_mass * r))
+    sense = rng.choice([-1.0, 1.0], n)
+    velocities = (sense * speed)[:, None] * np.stack([-np.sin(phi), np.cos(phi)], axis=1)
+
+    nucleus = scene_from_arrays([center], [(0.0, 0.0)], nuclear_charge, nuclear_mass, False, False, dt)
+    electrons = scene_from_arrays(positions, velocities, electron_charge, electron_mass, True, False, dt)
+    return merge_scenes(nucleus, electrons)
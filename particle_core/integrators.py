@@ -0,0 +1,305 @@
+"""Integrator registry and the built-in integration methods.
+
+An integrator is resolved by name once at the start of a run::
+
+    integrator = get_integrator("leapfrog")
+    integrator.prepare(state)
+    integrator.step_many(state, 1000)
+
+Third-party methods subclass :class:`Integrator` and register themselves
+with :func:`register_integrator`; modules listed in the ``integrator_plugins``
+setting are imported by the front ends at startup.
+"""
+import importlib
+import time
+
+import numpy as np
+
+from .forces import compute_accelerations, fixed_potential_energy, potential_energy
+
+_REGISTRY = {}
+
+
+def register_integrator(cls):
+    """Class decorator that makes an integrator selectable by its ``name``"""
+    if not cls.name:
+        raise ValueError(f"{cls.__name__} must define a name to be registered")
+    _REGISTRY[cls.name] = cls
+    return cls
+
+
+def get_integrator(name, **options):
+    """Create a fresh instance of the integrator registered under ``name``"""
+    try:
+        cls = _REGISTRY[name]
+    except KeyError:
+        raise ValueError(f"Unknown integrator: {name!r}") from None
+    return cls(**options)
+
+
+def available_integrators():
+    """Names of all registered integrators in registration order"""
+    return list(_REGISTRY)
+
+
+def integrator_label(name):
+    """Human-readable label of a registered integrator"""
+    cls = _REGISTRY[name]
+    return cls.label or cls.name
+
+
+def load_integrator_plugins(module_names):
+    """Import plugin modules so that their integrators register themselves"""
+    for module_name in module_names:
+        importlib.import_module(module_name)
+
+
+class Integrator:
+    """Base class for integration methods.
+
+    ``prepare`` is called once per run before the first step, ``step``
+    advances the state by one ``dt`` in place and ``step_many`` advances
+    ``k`` steps in one call, optionally recording every new point.
+
+    With ``track_potential`` set, evaluating the forces at the current
+    positions also stores their potential energy, so methods that end a step
+    with such an evaluation provide the energy of every step for free.
+
+    With ``timers`` set to a :class:`~particle_core.timers.PhaseTimers`
+    every force kernel call is timed as the ``forces`` phase.
+
+    The arrays a method carries from one step to the next are listed in
+    ``carried``; checkpoints save them with :meth:`get_carried` and put them
+    back after ``prepare`` with :meth:`set_carried`, so a resumed run
+    continues exactly where it stopped. Constructor arguments are returned
+    by :meth:`options`.
+    """
+    name = None
+    label = None
+    carried = ()
+
+    def __init__(self):
+        self.force_evaluations = 0
+        self.moving = None
+        self.track_potential = False
+        self.potential = None
+        self.potential_step = None
+        self.fixed_potential = None
+        self._fixed_state = None
+        self.timers = None
+
+    def prepare(self, state):
+        """Set up the internal state before the first step of a run"""
+        self.moving = state.moving
+        # The watchdog prepares again within a run, keep the constant of the same state
+        if state is not self._fixed_state:
+            self.fixed_potential = None
+            self._fixed_state = state
+
+    def options(self):
+        """Keyword arguments that recreate this integrator with :func:`get_integrator`"""
+        return {}
+
+    def get_carried(self):
+        """Copies of the arrays carried between steps, by attribute name"""
+        return {name: np.array(getattr(self, name)) for name in self.carried}
+
+    def set_carried(self, values):
+        for name in self.carried:
+            setattr(self, name, np.array(values[name]))
+
+    def step(self, state):
+        raise NotImplementedError
+
+    def step_many(self, state, k, positions_out=None, velocities_out=None, potentials_out=None):
+        """Advance k steps, filling (k, n, 2) output arrays and a (k, 2) potential array if given"""
+        for i in range(k):
+            self.step(state)
+            if positions_out is not None:
+                positions_out[i] = state.positions
+            if velocities_out is not None:
+                velocities_out[i] = state.velocities
+            if potentials_out is not None:
+                potentials_out[i] = self.current_potential(state)
+        return state
+
+    def evaluate_forces(self, state, positions=None):
+        """Accelerations at ``positions`` (the current ones by default)"""
+        self.force_evaluations += 1
+        potential = None
+        if positions is None:
+            positions = state.positions
+            if self.track_potential:
+                potential = self.potential = np.zeros(2)
+                self.potential_step = state.step
+                if self.fixed_potential is None:
+                    # Constant while the fixed particles stay where they are
+                    self.fixed_potential = fixed_potential_energy(
+                        positions, state.charge, state.mass, self.moving, state.k, state.G)
+        start = time.perf_counter() if self.timers is not None else None
+        accelerations = compute_accelerations(positions, state.charge, state.mass,
+                                              state.moving_ch, state.moving_m, state.k, state.G,
+                                              potential=potential, fixed_potential=self.fixed_potential)
+        if start is not None:
+            self.timers.add("forces", time.perf_counter() - start)
+        return accelerations
+
+    def current_potential(self, state):
+        """Electric and gravitational potential energy at the current positions"""
+        if self.potential_step == state.step:
+            return self.potential
+        return potential_energy(state.positions, state.charge, state.mass, state.k, state.G)
+
+
+@register_integrator
+class VerletIntegrator(Integrator):
+    """Position Verlet carrying the previous positions between steps"""
+    name = "verlet"
+    label = "Verlet"
+    carried = ("prev_positions", "accelerations")
+
+    def prepare(self, state):
+        super().prepare(state)
+        self.prev_positions = state.positions - state.dt * state.velocities
+        self.accelerations = self.evaluate_forces(state)
+
+    def step(self, state):
+        h = state.dt
+        m = self.moving
+        positions = state.positions
+
+        new_positions = 2 * positions[m] - self.prev_positions[m] + h * h * self.accelerations[m]
+        self.prev_positions = positions.copy()
+
+        state.velocities[m] = (new_positions - positions[m]) / h
+        state.velocities[~m] = 0.0
+        positions[m] = new_positions
+        state.step += 1
+
+        # Evaluate at the new positions now and carry the result into the next step
+        self.accelerations = self.evaluate_forces(state)
+
+
+@register_integrator
+class LeapfrogIntegrator(Integrator):
+    """Kick-drift-kick leapfrog with exactly one force evaluation per step"""
+    name = "leapfrog"
+    label = "Leapfrog"
+    carried = ("accelerations",)
+
+    def prepare(self, state):
+        super().prepare(state)
+        self.accelerations = self.evaluate_forces(state)
+
+    def step(self, state):
+        h = state.dt
+        m = self.moving
+
+        # Kick with the acceleration carried over from the previous step, drift
+        state.velocities[m] += 0.5 * h * self.accelerations[m]
+        state.positions[m] += h * state.velocities[m]
+        state.step += 1
+
+        # Recalculate accelerations once and keep them for the next step
+        self.accelerations = self.evaluate_forces(state)
+        state.velocities[m] += 0.5 * h * self.accelerations[m]
+
+
+@register_integrator
+class RK4Integrator(Integrator):
+    """Classic fourth-order Runge-Kutta"""
+    name = "rk4"
+    label = "RK4"
+    carried = ("accelerations",)
+
+    def prepare(self, state):
+        super().prepare(state)
+        self.accelerations = self.evaluate_forces(state)
+
+    def _stage(self, x0, v0, dx, dv, scale):
+        m = self.moving
+        x = x0.copy()
+        v = v0.copy()
+        x[m] += scale * dx[m]
+        v[m] += scale * dv[m]
+        return x, v
+
+    def step(self, state):
+        h = state.dt
+        m = self.moving
+        x0 = state.positions.copy()
+        v0 = state.velocities.copy()
+
+        a1 = self.accelerations
+        x2, v2 = self._stage(x0, v0, v0, a1, 0.5 * h)
+        a2 = self.evaluate_forces(state, x2)
+        x3, v3 = self._stage(x0, v0, v2, a2, 0.5 * h)
+        a3 = self.evaluate_forces(state, x3)
+        x4, v4 = self._stage(x0, v0, v3, a3, h)
+        a4 = self.evaluate_forces(state, x4)
+
+        state.positions[m] = x0[m] + (h / 6) * (v0 + 2 * v2 + 2 * v3 + v4)[m]
+        state.velocities[m] = v0[m] + (h / 6) * (a1 + 2 * a2 + 2 * a3 + a4)[m]
+        state.step += 1
+
+        # The first stage of the next step is the acceleration at the new positions
+        self.accelerations = self.evaluate_forces(state)
+
+
+@register_integrator
+class BulirschStoerIntegrator(Integrator):
+    """Bulirsch-Stoer step built from modified midpoint sequences"""
+    name = "bulirsch-stoer"
+    label = "Bulirsch-Stoer"
+    carried = ("accelerations",)
+    substep_sequence = (2, 4, 6, 8, 12, 16, 24, 32, 48, 64, 96)
+
+    def __init__(self, eps=1e-8):
+        super().__init__()
+        self.eps = eps
+        self.last_substeps = None
+
+    def options(self):
+        return {"eps": self.eps}
+
+    def prepare(self, state):
+        super().prepare(state)
+        self.accelerations = self.evaluate_forces(state)
+
+    def _derivatives(self, state, y):
+        """Derivatives of y = [positions, velocities] with shape (2, n, 2)"""
+        d = np.zeros_like(y)
+        d[0][self.moving] = y[1][self.moving]
+        d[1] = self.evaluate_forces(state, y[0])
+        return d
+
+    def _modified_midpoint_step(self, state, y0, d0, dt, n_substeps):
+        h = dt / n_substeps
+        y = y0
+        y_next = y0 + h * d0
+        for _ in range(1, n_substeps):
+            y, y_next = y_next, y + 2 * h * self._derivatives(state, y_next)
+        return 0.5 * (y_next + y + h * self._derivatives(state, y_next))
+
+    def step(self, state):
+        m = self.moving
+        y0 = np.stack([state.positions, state.velocities])
+        # Derivatives at the start are shared by every substep sequence
+        d0 = np.zeros_like(y0)
+        d0[0][m] = y0[1][m]
+        d0[1] = self.accelerations
+
+        previous = None
+        result = None
+        for i, n_substeps in enumerate(self.substep_sequence):
+            result = self._modified_midpoint_step(state, y0, d0, state.dt, n_substeps)
+            self.last_substeps = n_substeps
+            # Check for convergence after we have at least 3 approximations
+            if i >= 2 and np.max(np.abs(result - previous)) < self.eps:
+                break
+            previous = result
+
+        state.positions[m] = result[0][m]
+        state.velocities[m] = result[1][m]
+        state.step += 1
+        self.accelerations = self.evaluate_forces(state)
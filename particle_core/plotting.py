@@ -0,0 +1,317 @@
+"""Incremental and decimating matplotlib helpers for live plots.
+
+Nothing here imports matplotlib at module level; the helpers only use the
+canvas/artist API of figures the front ends already created.
+"""
+import numpy as np
+
+# A series is decimated once it has more visible points than this many per pixel column
+DECIMATE_POINTS_PER_PIXEL = 4
+
+
+def visible_points(x, y, view):
+    """Indices of the points on segments whose bounding box meets ``view`` = (x0, x1, y0, y1)"""
+    n = len(x)
+    x0, x1, y0, y1 = view
+    if n < 2:
+        return np.flatnonzero((x0 <= x) & (x <= x1) & (y0 <= y) & (y <= y1))
+    segments = ((np.minimum(x[:-1], x[1:]) <= x1) & (np.maximum(x[:-1], x[1:]) >= x0)
+                & (np.minimum(y[:-1], y[1:]) <= y1) & (np.maximum(y[:-1], y[1:]) >= y0))
+    keep = np.zeros(n, dtype=bool)
+    keep[:-1] |= segments
+    keep[1:] |= segments
+    return np.flatnonzero(keep)
+
+
+def _with_gaps(x, y, visible, breaks, selected):
+    """Coordinates of the ``selected`` points, with a NaN wherever the visible stretch changes"""
+    xs, ys = x[selected], y[selected]
+    if len(breaks):
+        # Stretch of every selected point, a new stretch starts after each break
+        stretch = np.searchsorted(visible[breaks], selected)
+        gaps = np.flatnonzero(np.diff(stretch)) + 1
+        xs = np.insert(xs, gaps, np.nan)
+        ys = np.insert(ys, gaps, np.nan)
+    return xs, ys
+
+
+def envelope_line(x, y, buckets, view=None):
+    """Points of a series that draw the same picture on a ``buckets`` pixels wide axes.
+
+    Meant for series sampled at regular x, like energies over time: the
+    visible points are split into ``buckets`` runs of consecutive indices,
+    one per pixel column, and every run keeps its first and last point and
+    its points of minimal and maximal y (a min/max envelope), so spikes
+    survive however many points are dropped. With a
+    ``view`` = (x0, x1, y0, y1) only the segments meeting it are kept; NaNs
+    separate the visible stretches so no line bridges a part that left the
+    view. Series with few points are returned whole.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    visible = np.arange(n) if view is None else visible_points(x, y, view)
+    m = len(visible)
+    if m == n and m <= DECIMATE_POINTS_PER_PIXEL * buckets:
+        return x, y
+    breaks = np.flatnonzero(np.diff(visible) > 1)
+    if m > DECIMATE_POINTS_PER_PIXEL * buckets:
+        size = -(-m // buckets)
+        runs = np.concatenate([visible, np.full(-m % size, visible[-1])]).reshape(-1, size)
+        rows = np.arange(len(runs))
+        run_values = y[runs]
+        selected = np.unique(np.concatenate([
+            runs[:, 0], runs[:, -1], visible[breaks], visible[breaks + 1],
+            runs[rows, run_values.argmin(axis=1)], runs[rows, run_values.argmax(axis=1)],
+        ]))
+    else:
+        selected = visible
+    return _with_gaps(x, y, visible, breaks, selected)
+
+
+def thin_path(x, y, shape, view=None):
+    """Points of a 2D path that draw the same picture on a ``shape`` = (width, height) pixels axes.
+
+    Of consecutive points falling in the same pixel of the view only the
+    first is kept, so the path loses no detail the screen could show and a
+    slow trajectory sampled every step shrinks to about one point per pixel
+    it crosses. ``view`` = (x0, x1, y0, y1) defaults to the bounds of the
+    path; segments outside of it are dropped as in :func:`envelope_line`.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(x) == 0:
+        return x, y
+    if view is None:
+        view = (x.min(), x.max(), y.min(), y.max())
+    visible = visible_points(x, y, view)
+    if len(visible) == 0:
+        return x[visible], y[visible]
+    x0, x1, y0, y1 = view
+    width, height = shape
+    ix = np.floor((x[visible] - x0) * (width / ((x1 - x0) or 1.0)))
+    iy = np.floor((y[visible] - y0) * (height / ((y1 - y0) or 1.0)))
+    breaks = np.flatnonzero(np.diff(visible) > 1)
+    keep = np.ones(len(visible), dtype=bool)
+    keep[1:] = (ix[1:] != ix[:-1]) | (iy[1:] != iy[:-1])
+    keep[breaks] = True
+    keep[breaks + 1] = True
+    keep[-1] = True
+    return _with_gaps(x, y, visible, breaks, visible[keep])
+
+
+class BlitManager:
+    """Redraw animated artists on top of a cached canvas background.
+
+    After every full draw of the canvas the background is captured again.
+    ``update(accumulate=True)`` also keeps what was just painted in the
+    background, which lets growing lines be drawn one new segment at a time.
+    Overlays (e.g. a legend) are drawn on top of the animated artists but are
+    never accumulated into the background.
+    """
+
+    def __init__(self, canvas, artists=(), overlays=()):
+        self.canvas = canvas
+        self.artists = []
+        self.overlays = []
+        self.background = None
+        for artist in artists:
+            self.add_artist(artist)
+        for artist in overlays:
+            artist.set_animated(True)
+            self.overlays.append(artist)
+        self._cid = canvas.mpl_connect("draw_event", self._on_draw)
+
+    def add_artist(self, artist):
+        artist.set_animated(True)
+        self.artists.append(artist)
+
+    def disconnect(self):
+        self.canvas.mpl_disconnect(self._cid)
+
+    def _on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_animated(self.artists + self.overlays)
+
+    def _draw_animated(self, artists):
+        figure = self.canvas.figure
+        for artist in artists:
+            figure.draw_artist(artist)
+
+    def update(self, accumulate=False):
+        if self.background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_animated(self.artists)
+        if accumulate:
+            self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_animated(self.overlays)
+        self.canvas.blit(self.canvas.figure.bbox)
+
+
+class IncrementalLines:
+    """Growing lines whose new points are painted onto a cached background.
+
+    Every series keeps its static ``Line2D`` (holding the full data, drawn on
+    full redraws) plus an animated tail holding only the points added since
+    the previous frame, so a frame costs O(new points) however long the
+    lines get. Axis limits are expanded with a margin when new points fall
+    outside them, which is the only time the whole figure is redrawn.
+    With ``decimated``, the :class:`DecimatedLines` of the static lines,
+    these show a decimation of the full data.
+    """
+
+    def __init__(self, canvas, lines, margin=0.25, decimated=None):
+        self.canvas = canvas
+        self.decimated = decimated
+        self.lines = list(lines)
+        self.ax = self.lines[0].axes
+        self.margin = margin
+        self.tails = [
+            self.ax.plot([], [], color=line.get_color(), linewidth=line.get_linewidth(),
+                         linestyle=line.get_linestyle())[0]
+            for line in self.lines
+        ]
+        self.drawn = [len(line.get_xdata()) for line in self.lines]
+        self.series = None
+        legend = self.ax.get_legend()
+        self.blit = BlitManager(canvas, self.tails, [legend] if legend is not None else [])
+        self._resize_cid = canvas.mpl_connect("resize_event", self._on_resize)
+
+    def disconnect(self):
+        self.blit.disconnect()
+        self.canvas.mpl_disconnect(self._resize_cid)
+
+    def _on_resize(self, event):
+        # The canvas repaints everything after a resize, the static lines must be complete
+        if self.series is not None:
+            self._sync_static(self.series)
+
+    def _sync_static(self, series):
+        if self.decimated is not None:
+            self.decimated.set_series(series)
+        for i, (x, y) in enumerate(series):
+            if self.decimated is None:
+                self.lines[i].set_data(x, y)
+            self.tails[i].set_data([], [])
+            self.drawn[i] = len(x)
+
+    def full_redraw(self, series):
+        self.series = series
+        self._sync_static(series)
+        # Padding the limits switches autoscaling off, recompute them from the data
+        self.ax.set_autoscale_on(True)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self._pad_limits()
+        self.canvas.draw()
+
+    def _pad_limits(self):
+        # Leave room to grow so that the next points can still be blitted
+        for get, set_ in ((self.ax.get_xlim, self.ax.set_xlim), (self.ax.get_ylim, self.ax.set_ylim)):
+            lo, hi = get()
+            pad = (hi - lo) * self.margin
+            set_(lo - pad, hi + pad)
+
+    def update(self, series, incremental=True):
+        """Show ``series``, a list of (x, y) sequences that only grew since the last call"""
+        if not incremental or self.series is None:
+            self.full_redraw(series)
+            return
+        self.series = series
+        if self.decimated is not None:
+            # Zooming redraws the static lines, which then include the blitted tails
+            self.decimated.series = series
+
+        x0, x1 = sorted(self.ax.get_xlim())
+        y0, y1 = sorted(self.ax.get_ylim())
+        tails = []
+        for i, (x, y) in enumerate(series):
+            n = len(x)
+            if n < self.drawn[i]:
+                self.full_redraw(series)
+                return
+            # Start from the last drawn point so the tail joins the static line
+            start = max(self.drawn[i] - 1, 0)
+            tx = np.asarray(x[start:], dtype=float)
+            ty = np.asarray(y[start:], dtype=float)
+            if len(tx) and (tx.min() < x0 or tx.max() > x1 or ty.min() < y0 or ty.max() > y1):
+                self.full_redraw(series)
+                return
+            tails.append((tx, ty, n))
+
+        for i, (tx, ty, n) in enumerate(tails):
+            self.tails[i].set_data(tx, ty)
+            self.drawn[i] = n
+        self.blit.update(accumulate=True)
+        for tail in self.tails:
+            tail.set_data([], [])
+
+
+class DecimatedLines:
+    """Lines drawing long series decimated to the resolution of their axes.
+
+    The full series stay here, the ``Line2D`` objects only hold the
+    decimation of their visible part: the :func:`envelope_line` of time
+    series, or with ``paths`` the :func:`thin_path` of trajectories. It is
+    computed again when the view limits or the size of the axes change
+    (zooming, panning, resizing), so zooming in shows every point of a
+    short stretch, and plain redraws cost nothing extra.
+    """
+
+    def __init__(self, canvas, lines, series, paths=False):
+        self.canvas = canvas
+        self.paths = paths
+        self.lines = list(lines)
+        self.ax = self.lines[0].axes
+        self.series = None
+        self._view = None
+        self._autoscaling = False
+        self._cids = [self.ax.callbacks.connect(name, self._on_view_changed)
+                      for name in ("xlim_changed", "ylim_changed")]
+        self._resize_cid = canvas.mpl_connect("resize_event", self._on_view_changed)
+        self.set_series(series)
+
+    def disconnect(self):
+        for cid in self._cids:
+            self.ax.callbacks.disconnect(cid)
+        self.canvas.mpl_disconnect(self._resize_cid)
+
+    def decimate(self, x, y, view=None):
+        width, height = max(int(self.ax.bbox.width), 1), max(int(self.ax.bbox.height), 1)
+        if self.paths:
+            return thin_path(x, y, (width, height), view)
+        return envelope_line(x, y, width, view)
+
+    def set_series(self, series):
+        """Show new full ``series``, a list of (x, y) sequences, and autoscale to them"""
+        self.series = [(np.asarray(x, dtype=float), np.asarray(y, dtype=float)) for x, y in series]
+        self._view = None
+        # The envelope of all points has the extremes of the data, so the limits fit it exactly
+        for line, (x, y) in zip(self.lines, self.series):
+            line.set_data(*self.decimate(x, y))
+        self._autoscaling = True
+        try:
+            self.ax.relim()
+            self.ax.autoscale_view()
+        finally:
+            self._autoscaling = False
+        self.refresh()
+
+    def _on_view_changed(self, *args):
+        if not self._autoscaling:
+            self.refresh()
+
+    def refresh(self):
+        """Decimate the series again for the current view, if it changed"""
+        if self.series is None:
+            return
+        x0, x1 = sorted(self.ax.get_xlim())
+        y0, y1 = sorted(self.ax.get_ylim())
+        view = (x0, x1, y0, y1, self.ax.bbox.width, self.ax.bbox.height)
+        if view == self._view:
+            return
+        self._view = view
+        for line, (x, y) in zip(self.lines, self.series):
+            line.set_data(*self.decimate(x, y, view[:4]))
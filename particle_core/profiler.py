@@ -0,0 +1,166 @@
+"""cProfile and tracemalloc capture of a single run.
+
+Headless use wraps the run in the profiler::
+
+    with RunProfiler("run_reports") as profiler:
+        for positions, velocities in simulation.run(steps):
+            ...
+    print(profiler.paths)
+
+When the integration happens in another thread (the GUI worker), the
+owner calls :meth:`RunProfiler.start` and :meth:`RunProfiler.stop` and the
+worker thread brackets its loop with :meth:`enable` and :meth:`disable`:
+cProfile only sees the thread it was enabled in, while tracemalloc follows
+every thread.
+"""
+import ast
+import cProfile
+import linecache
+import os
+import time
+import tracemalloc
+
+# Allocation sites listed in the summary
+TOP_ALLOCATIONS = 25
+
+_function_cache = {}
+
+
+def _function_ranges(filename):
+    """(first line, last line, qualified name) of every function defined in a file"""
+    cache = _function_cache
+    if filename not in cache:
+        ranges = []
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                tree = ast.parse(f.read())
+        except (OSError, SyntaxError, ValueError):
+            tree = None
+
+        def visit(node, prefix):
+            for child in ast.iter_child_nodes(node):
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    name = prefix + child.name
+                    ranges.append((child.lineno, child.end_lineno, name))
+                    visit(child, name + ".")
+                elif isinstance(child, ast.ClassDef):
+                    visit(child, prefix + child.name + ".")
+                else:
+                    visit(child, prefix)
+        if tree is not None:
+            visit(tree, "")
+        cache[filename] = ranges
+    return cache[filename]
+
+
+def function_at(filename, lineno):
+    """Name of the innermost function containing a line, or <module>"""
+    best = None
+    for first, last, name in _function_ranges(filename):
+        if first <= lineno <= last and (best is None or first > best[0]):
+            best = (first, name)
+    return best[1] if best else "<module>"
+
+
+def allocation_summary(snapshot, baseline=None, top=TOP_ALLOCATIONS, peak=None):
+    """Text report of the largest allocation sites and of the functions they belong to.
+
+    With a ``baseline`` snapshot only the memory allocated since then and
+    still held (e.g. growing trajectory lists) is counted.
+    """
+    ignored = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ]
+    snapshot = snapshot.filter_traces(ignored)
+    if baseline is not None:
+        stats = [(stat.size_diff, stat.count_diff, stat.traceback[0])
+                 for stat in snapshot.compare_to(baseline.filter_traces(ignored), "lineno")
+                 if stat.size_diff > 0]
+        stats.sort(key=lambda item: -item[0])
+    else:
+        stats = [(stat.size, stat.count, stat.traceback[0]) for stat in snapshot.statistics("lineno")]
+    total = sum(size for size, _, _ in stats)
+
+    by_function = {}
+    for size, count, frame in stats:
+        key = (os.path.basename(frame.filename), function_at(frame.filename, frame.lineno))
+        old_size, old_count = by_function.get(key, (0, 0))
+        by_function[key] = (old_size + size, old_count + count)
+
+    held = "allocated during the run and still held" if baseline is not None else "allocated"
+    lines = [f"Memory {held} at the end: {total / 2**20:.2f} MB"]
+    if peak is not None:
+        lines.append(f"Peak traced memory: {peak / 2**20:.2f} MB")
+    lines += ["", "Allocation hot spots by function:"]
+    for (filename, function), (size, count) in sorted(by_function.items(), key=lambda item: -item[1][0])[:top]:
+        lines.append(f"{size / 2**10:12.1f} KiB {count:9} blocks  {function} ({filename})")
+
+    lines += ["", "Largest allocation sites:"]
+    for size, count, frame in stats[:top]:
+        source = linecache.getline(frame.filename, frame.lineno).strip()
+        lines.append(f"{size / 2**10:12.1f} KiB {count:9} blocks  "
+                     f"{os.path.basename(frame.filename)}:{frame.lineno} "
+                     f"in {function_at(frame.filename, frame.lineno)}")
+        if source:
+            lines.append(f"{'':34}{source}")
+    return "\n".join(lines) + "\n"
+
+
+class RunProfiler:
+    """Collect a cProfile profile and the allocations of one run.
+
+    :meth:`stop` writes ``<name>.pstats`` (load it with :mod:`pstats` or
+    snakeviz) and ``<name>.allocations.txt`` into ``directory`` and stores
+    both paths in ``paths``.
+    """
+
+    def __init__(self, directory, name=None, top=TOP_ALLOCATIONS):
+        self.directory = directory
+        self.name = name or time.strftime("run_%Y%m%d_%H%M%S")
+        self.top = top
+        self.profile = cProfile.Profile()
+        self.paths = None
+        self._baseline = None
+        self._started_tracing = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+        self._baseline = tracemalloc.take_snapshot()
+
+    def enable(self):
+        """Profile the calling thread"""
+        self.profile.enable()
+
+    def disable(self):
+        self.profile.disable()
+
+    def stop(self):
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, self.name)
+        self.profile.dump_stats(base + ".pstats")
+        with open(base + ".allocations.txt", "w") as f:
+            f.write(allocation_summary(snapshot, self._baseline, self.top, peak))
+        self.paths = (base + ".pstats", base + ".allocations.txt")
+        return self.paths
+
+    def __enter__(self):
+        self.start()
+        self.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.disable()
+        self.stop()
+        return False
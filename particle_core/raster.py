@@ -0,0 +1,110 @@
+"""Raster of the paths of many particles, for trajectory clouds too dense to draw as lines."""
+import numpy as np
+
+from .density import DensityAccumulator
+
+# Color mappings of shade in the order of the front end's combo box
+RASTER_SHADINGS = ("log", "eq")
+# Most segments rasterized at once, bounds the temporary arrays of a block
+RASTER_CHUNK = 1 << 20
+
+
+class TrajectoryRaster(DensityAccumulator):
+    """Online (ny, nx) image of every segment the particles moved along.
+
+    Each step joins the previous position of every particle to the new one
+    and the segment is sampled at every pixel it crosses, so the image
+    shows the paths like a line plot of all trajectories would, but costs
+    the same to draw however many steps it holds, and every block of steps
+    adds its segments in O(segments). ``record`` has the signature of a
+    :class:`~particle_core.engine.Simulation` recorder; ``last`` is the
+    position of every particle at the previous step, segments start there.
+    Extent handling is the one of :class:`~particle_core.density.DensityAccumulator`.
+    """
+
+    def __init__(self, shape, extent=None, margin=0.05):
+        super().__init__(shape, extent, margin=margin)
+        self.last = None
+
+    def record(self, positions, velocities=None, potentials=None):
+        """Add the segments of a (k, n, 2) block of positions"""
+        if len(positions) == 0:
+            return
+        path = positions if self.last is None else np.concatenate([self.last[None], positions])
+        self.last = np.array(positions[-1])
+        step = max(1, RASTER_CHUNK // max(path.shape[1], 1))
+        for start in range(0, len(path) - 1, step):
+            chunk = path[start:start + step + 1]
+            self.add_segments(chunk[:-1, :, 0], chunk[:-1, :, 1], chunk[1:, :, 0], chunk[1:, :, 1])
+
+    def add_path(self, x, y):
+        """Add the segments between consecutive points of one path"""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        for start in range(0, len(x) - 1, RASTER_CHUNK):
+            xs = x[start:start + RASTER_CHUNK + 1]
+            ys = y[start:start + RASTER_CHUNK + 1]
+            self.add_segments(xs[:-1], ys[:-1], xs[1:], ys[1:])
+
+    def add_segments(self, x0, y0, x1, y1):
+        """Rasterize the segments from (x0, y0) to (x1, y1), given as coordinate arrays"""
+        x0, y0, x1, y1 = (np.asarray(v, dtype=float).ravel() for v in (x0, y0, x1, y1))
+        finite = np.isfinite(x0) & np.isfinite(y0) & np.isfinite(x1) & np.isfinite(y1)
+        if not finite.all():
+            x0, y0, x1, y1 = x0[finite], y0[finite], x1[finite], y1[finite]
+        if x0.size == 0:
+            return
+        with self._lock:
+            if self.extent is None:
+                self.extent = self._initial_extent(np.concatenate([x0, x1]), np.concatenate([y0, y1]))
+            # Grown before sampling, so the samples are spaced for the final pixel size
+            elif self.auto_expand:
+                self._expand(0, min(x0.min(), x1.min()), max(x0.max(), x1.max()))
+                self._expand(1, min(y0.min(), y1.min()), max(y0.max(), y1.max()))
+            x, y = self._sample(x0, y0, x1, y1)
+        # The extent already covers the samples, add_points only bins them
+        self.add_points(x, y)
+
+    def _sample(self, x0, y0, x1, y1):
+        """Points along every segment, one per pixel it crosses, without its end point"""
+        nx, ny = self.bins
+        x_min, x_max, y_min, y_max = self.extent
+        dx = x1 - x0
+        dy = y1 - y0
+        pixels = np.maximum(np.abs(dx) * (nx / (x_max - x_min)), np.abs(dy) * (ny / (y_max - y_min)))
+        # Segments leaving a fixed extent are cut to the number of pixels across it
+        samples = np.minimum(np.ceil(pixels), nx + ny).astype(np.intp)
+        np.maximum(samples, 1, out=samples)
+        segment = np.repeat(np.arange(len(x0)), samples)
+        first = np.cumsum(samples) - samples
+        t = (np.arange(len(segment)) - first[segment]) / samples[segment]
+        return x0[segment] + t * dx[segment], y0[segment] + t * dy[segment]
+
+    def image(self, shading="log"):
+        """The raster mapped to [0, 1] by ``shading`` and the extent, see :func:`shade`"""
+        counts, extent = self.histogram()
+        return shade(counts, shading), extent
+
+
+def shade(counts, how="log"):
+    """Map counts to [0, 1] for a colormap, empty pixels masked.
+
+    ``"log"`` scales ``log1p(counts)`` to its maximum; ``"eq"`` equalizes
+    the histogram of the non-empty pixels, every level of the colormap
+    then covers about as many pixels, which shows structure across any
+    dynamic range.
+    """
+    if how not in RASTER_SHADINGS:
+        raise ValueError(f"Unknown shading: {how!r}")
+    counts = np.asarray(counts)
+    filled = counts > 0
+    values = np.zeros(counts.shape)
+    if filled.any():
+        if how == "log":
+            logs = np.log1p(counts[filled])
+            values[filled] = logs / logs.max()
+        else:
+            _, rank = np.unique(counts[filled], return_inverse=True)
+            cdf = np.cumsum(np.bincount(rank.ravel()))
+            values[filled] = cdf[rank.ravel()] / cdf[-1]
+    return np.ma.masked_array(values, ~filled)
@@ -0,0 +1,232 @@
+"""Particles of a scene with their stored trajectories, and the scene files.
+
+Scenes hold the initial conditions of every particle, the fields of
+:meth:`Particle.to_dict`. They are saved either as JSON, a list with one
+dictionary per particle, or, for ``.npz`` paths, in a columnar format: one
+array per field (``SCENE_COLUMNS``) plus a versioned JSON ``header`` with
+free-form metadata. Columnar scenes are read without building a Python
+object per particle, uncompressed columns are memory-mapped, and
+:meth:`SimulationState.from_columns <particle_core.state.SimulationState.from_columns>`
+turns them into the engine arrays directly. That path serves headless
+runs (``python -m benchmarks profile --load``); the window keeps a
+:class:`Particle` with its trajectory per particle, converts the columns
+with :func:`particles_from_columns` and refuses scenes larger than it
+can hold. Both formats convert into each other without loss, see
+:func:`convert_scene`.
+"""
+import json
+import math
+import zipfile
+
+import numpy as np
+
+
+class Particle:
+    def __init__(self, posx, posy, charge, mass, velocity, angle, dt, is_moving_ch, is_moving_m, color='blue', max_points=1000):
+        self.charge = charge
+        self.mass = mass
+        self.is_moving_ch = is_moving_ch
+        self.is_moving_m = is_moving_m
+        self.dt = dt
+        self.color = color
+        self.max_points = max_points
+        rad_angle = math.radians(angle)
+        self.x_mass = [posx, posx + velocity * np.cos(rad_angle) * dt]
+        self.y_mass = [posy, posy + velocity * np.sin(rad_angle) * dt]
+        self.ax = 0
+        self.ay = 0
+        self.vx = velocity * np.cos(rad_angle)
+        self.vy = velocity * np.sin(rad_angle)
+        self.velocity = velocity
+        self.angle = angle
+        self.vx_history = [self.vx,self.vx]
+        self.vy_history = [self.vy,self.vy]
+        self.x_mass_init = [posx, posx + velocity * np.cos(rad_angle) * dt]
+        self.y_mass_init = [posy, posy + velocity * np.sin(rad_angle) * dt]
+    def __str__(self):
+        return (f"Pos: ({self.x_mass[-1]:.2f}, {self.y_mass[-1]:.2f}), "
+                f"Q={self.charge}, m={self.mass}, v={self.velocity}, "
+                f"angle={self.angle}, dt={self.dt}, "
+                f"Ch={self.is_moving_ch}, Grav={self.is_moving_m}, Color={self.color}")
+
+    def to_dict(self):
+        return {
+            "posx": self.x_mass[0],
+            "posy": self.y_mass[0],
+            "charge": self.charge,
+            "mass": self.mass,
+            "velocity": self.velocity,
+            "angle": self.angle,
+            "dt": self.dt,
+            "is_moving_ch": self.is_moving_ch,
+            "is_moving_m": self.is_moving_m,
+            "color": self.color,
+            "max_points": self.max_points
+        }
+
+    @staticmethod
+    def from_dict(data):
+        return Particle(**data)
+
+    def add_point(self, x, y, use_limits=True):
+        self.x_mass.append(x)
+        self.y_mass.append(y)
+
+        # Trim arrays if they exceed max_points
+        if use_limits and len(self.x_mass) > self.max_points:
+            self.x_mass = self.x_mass[-self.max_points:]
+            self.y_mass = self.y_mass[-self.max_points:]
+    def add_v(self,vx,vy):
+        self.vx_history.append(vx)
+        self.vy_history.append(vy)
+
+    def add_points(self, xs, ys, use_limits=True):
+        """Append a block of points at once (arrays produced by the simulation core)"""
+        self.x_mass.extend(np.asarray(xs).tolist())
+        self.y_mass.extend(np.asarray(ys).tolist())
+
+        if use_limits and len(self.x_mass) > self.max_points:
+            self.x_mass = self.x_mass[-self.max_points:]
+            self.y_mass = self.y_mass[-self.max_points:]
+
+    def add_vs(self, vxs, vys, use_limits=False):
+        self.vx_history.extend(np.asarray(vxs).tolist())
+        self.vy_history.extend(np.asarray(vys).tolist())
+
+        if use_limits and len(self.vx_history) > self.max_points:
+            self.vx_history = self.vx_history[-self.max_points:]
+            self.vy_history = self.vy_history[-self.max_points:]
+
+
+SCENE_FORMAT = "particle-scene"
+SCENE_VERSION = 1
+COLUMNAR_SUFFIX = ".npz"
+# Fields of a scene in the order of Particle.to_dict, with the dtype of their column
+SCENE_COLUMNS = {
+    "posx": np.float64,
+    "posy": np.float64,
+    "charge": np.float64,
+    "mass": np.float64,
+    "velocity": np.float64,
+    "angle": np.float64,
+    "dt": np.float64,
+    "is_moving_ch": np.bool_,
+    "is_moving_m": np.bool_,
+    "color": np.str_,
+    "max_points": np.int64,
+}
+# Values of the fields a scene may leave out, as in the Particle constructor
+SCENE_DEFAULTS = {"color": "blue", "max_points": 1000}
+
+
+def is_columnar(path):
+    return path.lower().endswith(COLUMNAR_SUFFIX)
+
+
+def scene_columns(records):
+    """One array per field of a list of particle dictionaries"""
+    columns = {}
+    for field, dtype in SCENE_COLUMNS.items():
+        if field in SCENE_DEFAULTS:
+            values = [d.get(field, SCENE_DEFAULTS[field]) for d in records]
+        else:
+            values = [d[field] for d in records]
+        columns[field] = np.array(values, dtype=dtype)
+    return columns
+
+
+def scene_records(columns):
+    """The particle dictionaries of scene columns"""
+    lists = {field: np.asarray(columns[field]).tolist() for field in SCENE_COLUMNS}
+    return [dict(zip(lists, values)) for values in zip(*lists.values())]
+
+
+def save_scene_columns(path, columns, metadata=None):
+    """Write scene columns, columnar for ``.npz`` paths and as JSON otherwise"""
+    if not is_columnar(path):
+        with open(path, "w") as f:
+            json.dump(scene_records(columns), f)
+        return
+    arrays = {field: np.asarray(columns[field], dtype=dtype) for field, dtype in SCENE_COLUMNS.items()}
+    header = {
+        "format": SCENE_FORMAT,
+        "version": SCENE_VERSION,
+        "particles": len(arrays["posx"]),
+        "fields": list(SCENE_COLUMNS),
+        "metadata": metadata or {},
+    }
+    # Stored uncompressed, so the columns can be memory-mapped when loaded
+    np.savez(path, header=np.array(json.dumps(header)), **arrays)
+
+
+def load_scene_columns(path, mmap=True):
+    """Columns and metadata of a scene file of either format.
+
+    With ``mmap`` the columns of a columnar scene are read-only views of
+    the file instead of copies.
+    """
+    if not is_columnar(path):
+        with open(path, "r") as f:
+            return scene_columns(json.load(f)), {}
+    with np.load(path, allow_pickle=False) as data:
+        header = json.loads(str(data["header"]))
+        if header.get("format") != SCENE_FORMAT or header.get("version", 0) > SCENE_VERSION:
+            raise ValueError(f"Unsupported scene file: {header.get('format')!r} "
+                             f"version {header.get('version')!r}")
+        mapped = _map_npz_members(path) if mmap else {}
+        columns = {field: mapped[field] if field in mapped else data[field] for field in SCENE_COLUMNS}
+    return columns, header["metadata"]
+
+
+def _map_npz_members(path):
+    """Read-only memory maps of the uncompressed arrays of an ``.npz`` file, by name"""
+    mapped = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED or not info.filename.endswith(".npy"):
+                continue
+            # The member data follows its local header: 30 bytes, the name and an extra field
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = np.frombuffer(f.read(4), dtype="<u2").tolist()
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            elif version == (2, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            else:
+                continue
+            if dtype.hasobject:
+                continue
+            mapped[info.filename[:-len(".npy")]] = np.memmap(
+                f, dtype=dtype, mode="r", offset=f.tell(), shape=shape,
+                order="F" if fortran_order else "C")
+    return mapped
+
+
+def save_scene(path, particles, metadata=None):
+    """Write the initial conditions of the particles, columnar for ``.npz`` paths and as JSON otherwise"""
+    if is_columnar(path):
+        save_scene_columns(path, scene_columns([p.to_dict() for p in particles]), metadata)
+        return
+    with open(path, "w") as f:
+        json.dump([p.to_dict() for p in particles], f)
+
+
+def load_scene(path):
+    """Particles of a scene file of either format, at their initial conditions"""
+    if is_columnar(path):
+        return particles_from_columns(load_scene_columns(path, mmap=False)[0])
+    with open(path, "r") as f:
+        return [Particle.from_dict(d) for d in json.load(f)]
+
+
+def particles_from_columns(columns):
+    """Particles of scene columns, for the front ends that keep one object per particle"""
+    return [Particle.from_dict(d) for d in scene_records(columns)]
+
+
+def convert_scene(source, target, metadata=None):
+    """Rewrite a scene file in the format of ``target`` (``.npz`` columnar, JSON otherwise)"""
+    columns, stored = load_scene_columns(source, mmap=False)
+    save_scene_columns(target, columns, metadata if metadata is not None else stored)
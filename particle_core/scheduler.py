@@ -0,0 +1,75 @@
+"""Frame-budget scheduling for real-time runs."""
+import time
+
+
+class FrameScheduler:
+    """Choose how many steps to integrate between two rendered frames.
+
+    The cost of one step and of rendering one frame are tracked as
+    exponential moving averages. The step count is chosen so that
+    integration plus rendering fits into the frame period ``1 / target_fps``
+    and, if ``max_time_ratio`` is set, so that a frame never advances the
+    simulation clock by more than ``max_time_ratio`` frame periods.
+    """
+
+    def __init__(self, dt, target_fps=25.0, max_time_ratio=None, initial_steps=10,
+                 max_steps=1000000, smoothing=0.3):
+        self.dt = dt
+        self.target_fps = target_fps
+        self.max_time_ratio = max_time_ratio or None
+        self.max_steps = max_steps
+        self.smoothing = smoothing
+        self.step_cost = None
+        self.render_cost = 0.0
+        self.fps = 0.0
+        self.steps_per_second = 0.0
+        self._last_steps = initial_steps
+        self._last_frame = None
+
+    @property
+    def frame_period(self):
+        return 1.0 / self.target_fps
+
+    def _average(self, old, new):
+        if old is None:
+            return new
+        return old + self.smoothing * (new - old)
+
+    def steps_for_next_frame(self):
+        if self.step_cost is None:
+            steps = self._last_steps
+        else:
+            # Always keep a tenth of the frame for integration, even if rendering is slow
+            budget = max(self.frame_period - self.render_cost, 0.1 * self.frame_period)
+            steps = int(budget / self.step_cost) if self.step_cost > 0 else self.max_steps
+            # Grow gradually so that one cheap frame can't blow the next budget
+            steps = min(steps, 2 * self._last_steps)
+        if self.max_time_ratio is not None:
+            steps = min(steps, int(self.max_time_ratio * self.frame_period / self.dt))
+        steps = max(1, min(steps, self.max_steps))
+        self._last_steps = steps
+        return steps
+
+    def record_integration(self, steps, seconds):
+        if steps > 0:
+            self.step_cost = self._average(self.step_cost, seconds / steps)
+
+    def record_render(self, seconds):
+        self.render_cost = self._average(self.render_cost, seconds)
+
+    def start(self, now=None):
+        """Start the frame clock, the first frame is timed from here"""
+        self._last_frame = time.perf_counter() if now is None else now
+
+    def frame_done(self, steps, now=None):
+        """Register a finished frame and update the achieved FPS and steps/s"""
+        now = time.perf_counter() if now is None else now
+        if self._last_frame is not None and now > self._last_frame:
+            interval = now - self._last_frame
+            self.fps = self._average(self.fps or None, 1.0 / interval)
+            self.steps_per_second = self._average(self.steps_per_second or None, steps / interval)
+        self._last_frame = now
+
+    def time_until_next_frame(self, frame_start, now=None):
+        now = time.perf_counter() if now is None else now
+        return max(0.0, frame_start + self.frame_period - now)
@@ -0,0 +1,84 @@
+"""Array representation of a particle system used by the integrators."""
+import numpy as np
+
+from .scene import scene_columns
+
+
+class SimulationState:
+    """Positions, velocities and per-particle properties as NumPy arrays.
+
+    Integrators advance ``positions`` and ``velocities`` in place; particles
+    that take part in neither interaction never move.
+    """
+
+    def __init__(self, positions, velocities, charge, mass, moving_ch, moving_m, dt, k=1.0, G=1.0):
+        self.positions = np.array(positions, dtype=float).reshape(-1, 2)
+        self.velocities = np.array(velocities, dtype=float).reshape(-1, 2)
+        self.charge = np.array(charge, dtype=float)
+        self.mass = np.array(mass, dtype=float)
+        self.moving_ch = np.array(moving_ch, dtype=bool)
+        self.moving_m = np.array(moving_m, dtype=bool)
+        self.dt = float(dt)
+        self.k = float(k)
+        self.G = float(G)
+        self.step = 0
+
+    @property
+    def n(self):
+        return len(self.positions)
+
+    @property
+    def moving(self):
+        return self.moving_ch | self.moving_m
+
+    @property
+    def time(self):
+        return self.step * self.dt
+
+    @classmethod
+    def from_particles(cls, particles, constants):
+        """Build a state from the current point of each particle's trajectory"""
+        return cls(
+            positions=[(p.x_mass[-1], p.y_mass[-1]) for p in particles],
+            velocities=[(p.vx, p.vy) for p in particles],
+            charge=[p.charge for p in particles],
+            mass=[p.mass for p in particles],
+            moving_ch=[p.is_moving_ch for p in particles],
+            moving_m=[p.is_moving_m for p in particles],
+            dt=particles[0].dt,
+            k=constants["k"],
+            G=constants["G"],
+        )
+
+    @classmethod
+    def from_scene(cls, particles, k=1.0, G=1.0):
+        """Build a state from particle dictionaries as saved by the front ends"""
+        return cls.from_columns(scene_columns(particles), k, G)
+
+    @classmethod
+    def from_columns(cls, columns, k=1.0, G=1.0):
+        """Build a state from the columns of a scene (see :mod:`particle_core.scene`).
+
+        Like a freshly added particle in the GUI, every particle starts one
+        step along its initial velocity.
+        """
+        angle = np.radians(columns["angle"])
+        velocities = np.stack([columns["velocity"] * np.cos(angle),
+                               columns["velocity"] * np.sin(angle)], axis=1)
+        dt = float(columns["dt"][0])
+        positions = np.stack([columns["posx"], columns["posy"]], axis=1) + velocities * dt
+        return cls(positions, velocities, columns["charge"], columns["mass"],
+                   columns["is_moving_ch"], columns["is_moving_m"], dt, k, G)
+
+    def copy(self):
+        state = SimulationState(self.positions, self.velocities, self.charge, self.mass,
+                                self.moving_ch, self.moving_m, self.dt, self.k, self.G)
+        state.step = self.step
+        return state
+
+    def restore(self, checkpoint):
+        """Reset positions, velocities, dt and step to those of a copy, in place"""
+        self.positions[:] = checkpoint.positions
+        self.velocities[:] = checkpoint.velocities
+        self.dt = checkpoint.dt
+        self.step = checkpoint.step
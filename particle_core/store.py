@@ -0,0 +1,386 @@
+"""Chunked on-disk storage of full-resolution trajectories.
+
+A :class:`TrajectoryStore` is a recorder: attached to a
+:class:`~particle_core.engine.Simulation` it collects the recorded steps in
+a preallocated block and appends every full block to disk, so a run keeps
+every step at constant memory. Two layouts are supported:
+
+* a directory of ``.npy`` chunks (or ``.npz`` with ``compress=True``) next
+  to an ``index.json`` describing the run, needing only NumPy;
+* an HDF5 file (``.h5``/``.hdf5`` paths) with resizable, chunked
+  ``positions`` and ``velocities`` datasets, which needs h5py.
+
+Chunk ``i`` of a directory store holds steps ``i * chunk_steps`` up to the
+next chunk; only the last one may be shorter. The index is rewritten after
+every chunk, so the store of an interrupted run is readable up to its last
+complete chunk.
+
+:func:`open_trajectory` reads a store back without loading it: its fields
+are (T, n, 2) :class:`ChunkedArray` views over memory-mapped ``.npy``
+chunks (or the HDF5 datasets), and slicing one only reads the frames of
+the requested time window and stride.
+"""
+import json
+import operator
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+FORMAT_VERSION = 1
+INDEX_FILE = "index.json"
+# Bytes of one field of a chunk, and the most steps a chunk holds
+CHUNK_BYTES = 1 << 24
+MAX_CHUNK_STEPS = 1 << 16
+HDF5_SUFFIXES = (".h5", ".hdf5")
+
+
+def chunk_steps_for(n, chunk_bytes=CHUNK_BYTES):
+    """Number of steps of n particles whose positions fit in ``chunk_bytes``"""
+    return int(min(MAX_CHUNK_STEPS, max(1, chunk_bytes // (16 * max(n, 1)))))
+
+
+def chunk_name(field, index, compress=False):
+    if compress:
+        return f"chunk_{index:06d}.npz"
+    return f"{field}_{index:06d}.npy"
+
+
+class TrajectoryStore:
+    """Recorder streaming positions and velocities of every step to disk.
+
+    ``metadata`` (per-particle properties, constants, anything JSON can
+    hold) is stored with the run. With ``potentials=True`` the (T, 2)
+    electric and gravitational potential energy of every step is stored
+    too. Call :meth:`close` (or use the store as a context manager) to
+    write the last, partial chunk.
+    """
+
+    def __init__(self, path, n, dt, first_step=0, metadata=None, chunk_steps=None,
+                 compress=False, potentials=False):
+        self.path = path
+        self.n = n
+        self.dt = float(dt)
+        self.first_step = first_step
+        self.metadata = metadata or {}
+        self.chunk_steps = chunk_steps or chunk_steps_for(n)
+        self.compress = compress
+        self.needs_potential = potentials
+        self.hdf5 = path.lower().endswith(HDF5_SUFFIXES)
+        if self.hdf5 and h5py is None:
+            raise ImportError("h5py is required for HDF5 trajectory stores")
+
+        self.fields = ["positions", "velocities"] + (["potentials"] if potentials else [])
+        self._buffers = {
+            "positions": np.empty((self.chunk_steps, n, 2)),
+            "velocities": np.empty((self.chunk_steps, n, 2)),
+        }
+        if potentials:
+            self._buffers["potentials"] = np.empty((self.chunk_steps, 2))
+        self._filled = 0
+        self.steps = 0
+        self.chunks = 0
+        self._file = None
+        self.closed = False
+
+        if self.hdf5:
+            self._open_hdf5()
+        else:
+            os.makedirs(path, exist_ok=True)
+            self._write_index()
+
+    @classmethod
+    def from_state(cls, path, state, metadata=None, **options):
+        """A store for a run starting at ``state``, whose current point is its first step"""
+        metadata = dict(metadata or {})
+        metadata.update({
+            "charge": state.charge.tolist(),
+            "mass": state.mass.tolist(),
+            "moving_ch": state.moving_ch.tolist(),
+            "moving_m": state.moving_m.tolist(),
+            "k": state.k,
+            "G": state.G,
+        })
+        store = cls(path, state.n, state.dt, state.step, metadata, **options)
+        potentials = None
+        if store.needs_potential:
+            potentials = np.full((1, 2), np.nan)
+        store.record(state.positions[None], state.velocities[None], potentials)
+        return store
+
+    def record(self, positions, velocities, potentials=None):
+        blocks = {"positions": positions, "velocities": velocities, "potentials": potentials}
+        k = len(positions)
+        done = 0
+        while done < k:
+            take = min(k - done, self.chunk_steps - self._filled)
+            for field in self.fields:
+                self._buffers[field][self._filled:self._filled + take] = blocks[field][done:done + take]
+            self._filled += take
+            done += take
+            if self._filled == self.chunk_steps:
+                self.flush()
+
+    def flush(self):
+        """Append the buffered steps to disk"""
+        k = self._filled
+        if k == 0:
+            return
+        blocks = {field: self._buffers[field][:k] for field in self.fields}
+        if self.hdf5:
+            for field, block in blocks.items():
+                dataset = self._file[field]
+                dataset.resize(self.steps + k, axis=0)
+                dataset[self.steps:] = block
+            self._file.attrs["steps"] = self.steps + k
+            self._file.flush()
+        elif self.compress:
+            np.savez_compressed(os.path.join(self.path, chunk_name(None, self.chunks, True)), **blocks)
+        else:
+            for field, block in blocks.items():
+                np.save(os.path.join(self.path, chunk_name(field, self.chunks)), block)
+        self.steps += k
+        self.chunks += 1
+        self._filled = 0
+        if not self.hdf5:
+            self._write_index()
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _header(self):
+        return {
+            "format": FORMAT_VERSION,
+            "particles": self.n,
+            "dt": self.dt,
+            "first_step": self.first_step,
+            "fields": self.fields,
+            "metadata": self.metadata,
+        }
+
+    def _write_index(self):
+        index = self._header()
+        index.update(chunk_steps=self.chunk_steps, compressed=self.compress,
+                     steps=self.steps, chunks=self.chunks)
+        path = os.path.join(self.path, INDEX_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(index, f)
+        # Readers never see a half-written index
+        os.replace(path + ".tmp", path)
+
+    def _open_hdf5(self):
+        self._file = h5py.File(self.path, "w")
+        compression = "gzip" if self.compress else None
+        for field in self.fields:
+            shape = (self.n, 2) if field != "potentials" else (2,)
+            self._file.create_dataset(field, shape=(0,) + shape, maxshape=(None,) + shape,
+                                      chunks=(self.chunk_steps,) + shape, dtype=float,
+                                      compression=compression)
+        header = self._header()
+        header["metadata"] = json.dumps(header["metadata"])
+        header["fields"] = json.dumps(header["fields"])
+        self._file.attrs.update(header)
+        self._file.attrs["steps"] = 0
+
+
+class ChunkedArray:
+    """Read-only (T, ...) array over the chunks of one stored field.
+
+    Indexing with an integer or a slice (any stride, optionally followed by
+    indices of the remaining axes) returns an in-memory NumPy array built
+    from the touched chunks only; ``np.asarray`` reads everything.
+    ``load(i)`` returns chunk ``i`` as an array-like, e.g. a memory map.
+    """
+
+    # Compressed chunks decompressed at a time
+    CACHED_CHUNKS = 2
+
+    def __init__(self, load, chunk_steps, steps, frame_shape, block_steps=None):
+        self._load = load
+        self._cache = OrderedDict()
+        self.chunk_steps = chunk_steps
+        self.block_steps = block_steps or chunk_steps
+        self.shape = (steps,) + tuple(frame_shape)
+        self.dtype = np.dtype(float)
+
+    def __len__(self):
+        return self.shape[0]
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    def chunk(self, i):
+        if i not in self._cache:
+            self._cache[i] = self._load(i)
+            if len(self._cache) > self.CACHED_CHUNKS:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(i)
+        return self._cache[i]
+
+    def __getitem__(self, key):
+        rest = ()
+        if isinstance(key, tuple):
+            key, rest = key[0], key[1:]
+        if isinstance(key, slice):
+            frames = self._frames(*key.indices(len(self)))
+            return frames[(slice(None),) + rest] if rest else frames
+        i = operator.index(key)
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(f"frame {key} out of range for {len(self)} frames")
+        frame = np.array(self.chunk(i // self.chunk_steps)[i % self.chunk_steps])
+        return frame[rest] if rest else frame
+
+    def _frames(self, start, stop, step):
+        if step < 0:
+            indices = range(start, stop, step)
+            if not indices:
+                return np.empty((0,) + self.shape[1:])
+            return self._frames(indices[-1], indices[0] + 1, -step)[::-1]
+        parts = []
+        while start < stop:
+            c = start // self.chunk_steps
+            offset = c * self.chunk_steps
+            end = min(offset + self.chunk_steps, stop)
+            parts.append(self.chunk(c)[start - offset:end - offset:step])
+            # First frame of the stride past this chunk
+            start += -(-(end - start) // step) * step
+        if not parts:
+            return np.empty((0,) + self.shape[1:])
+        return np.concatenate(parts)
+
+    def __array__(self, dtype=None, copy=None):
+        frames = self[:]
+        return frames if dtype is None else frames.astype(dtype)
+
+    def blocks(self, start=0, stop=None, stride=1):
+        """Yield the frames ``start:stop:stride`` as consecutive arrays of at most one chunk of steps"""
+        start, stop, stride = slice(start, stop, stride).indices(len(self))
+        span = max(stride, self.block_steps - self.block_steps % stride)
+        for first in range(start, stop, span):
+            yield self[first:min(first + span, stop):stride]
+
+
+class StoredTrajectory:
+    """A run written by :class:`TrajectoryStore`, opened lazily.
+
+    ``positions`` and ``velocities`` are (T, n, 2) :class:`ChunkedArray`
+    views, ``potentials`` a (T, 2) one or None. Frame ``i`` is step
+    ``first_step + i`` of the run, at time ``(first_step + i) * dt``.
+    """
+
+    def __init__(self, path):
+        if os.path.basename(path) == INDEX_FILE:
+            path = os.path.dirname(path)
+        self.path = path
+        self._file = None
+        if path.lower().endswith(HDF5_SUFFIXES):
+            if h5py is None:
+                raise ImportError("h5py is required for HDF5 trajectory stores")
+            self._file = h5py.File(path, "r")
+            index = dict(self._file.attrs)
+            index["metadata"] = json.loads(index["metadata"])
+            index["fields"] = json.loads(index["fields"])
+        else:
+            with open(os.path.join(path, INDEX_FILE), "r") as f:
+                index = json.load(f)
+        if index["format"] > FORMAT_VERSION:
+            raise ValueError(f"Unsupported trajectory store format {index['format']}")
+
+        self.n = int(index["particles"])
+        self.dt = float(index["dt"])
+        self.first_step = int(index["first_step"])
+        self.steps = int(index["steps"])
+        self.metadata = index["metadata"]
+        fields = {field: self._field(field, index) for field in index["fields"]}
+        self.positions = fields["positions"]
+        self.velocities = fields["velocities"]
+        self.potentials = fields.get("potentials")
+
+    def _field(self, field, index):
+        frame_shape = (2,) if field == "potentials" else (self.n, 2)
+        if self._file is not None:
+            dataset = self._file[field]
+            # The dataset is one chunk, read in blocks of its HDF5 chunks
+            return ChunkedArray(lambda i: dataset, max(self.steps, 1), self.steps, frame_shape,
+                                dataset.chunks[0])
+        chunk_steps = int(index["chunk_steps"])
+        if index["compressed"]:
+            def load(i):
+                with np.load(os.path.join(self.path, chunk_name(field, i, True))) as chunk:
+                    return chunk[field]
+        else:
+            def load(i):
+                return np.load(os.path.join(self.path, chunk_name(field, i)), mmap_mode="r")
+        return ChunkedArray(load, chunk_steps, self.steps, frame_shape)
+
+    def __len__(self):
+        return self.steps
+
+    def times(self, start=0, stop=None, stride=1):
+        """Times of the frames ``start:stop:stride``"""
+        return (self.first_step + np.arange(*slice(start, stop, stride).indices(self.steps))) * self.dt
+
+    def stride_for(self, max_frames, start=0, stop=None):
+        """Smallest stride that keeps the frames ``start:stop`` to at most ``max_frames``"""
+        frames = len(range(*slice(start, stop).indices(self.steps)))
+        return max(1, -(-frames // max(1, int(max_frames))))
+
+    def blocks(self, start=0, stop=None, stride=1, potentials=False):
+        """Yield (positions, velocities[, potentials]) blocks of the frames ``start:stop:stride``"""
+        fields = [self.positions, self.velocities]
+        if potentials:
+            fields.append(self.potentials)
+        yield from zip(*(field.blocks(start, stop, stride) for field in fields))
+
+    def state(self, frame=0):
+        """The :class:`~particle_core.state.SimulationState` at one frame of the run"""
+        from .state import SimulationState
+        if self.steps == 0:
+            # A run stopped before its first chunk was flushed
+            raise ValueError("store holds no steps")
+        meta = self.metadata
+        frame = operator.index(frame) % self.steps
+        state = SimulationState(self.positions[frame], self.velocities[frame], meta["charge"],
+                                meta["mass"], meta["moving_ch"], meta["moving_m"], self.dt,
+                                meta["k"], meta["G"])
+        state.step = self.first_step + frame
+        return state
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def open_trajectory(path):
+    """Open a trajectory store (directory, its index.json or an HDF5 file) for reading"""
+    return StoredTrajectory(path)
@@ -0,0 +1,102 @@
+"""Per-phase wall-time counters for instrumented runs.
+
+Instrumentation is off unless a :class:`PhaseTimers` is attached: the
+engine and the integrators keep ``timers = None`` and only check for it,
+so uninstrumented runs take no timestamps at all.
+"""
+import os
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def memory_in_use():
+    """Resident memory of this process in bytes, or None if it can't be read"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class _Phase:
+    __slots__ = ("timers", "name", "start")
+
+    def __init__(self, timers, name):
+        self.timers = timers
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timers.add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class PhaseTimers:
+    """Accumulated seconds and call counts per named phase.
+
+    Phases are recorded with ``add`` or ``with timers.phase(name):`` from
+    any thread. They are meant to be exclusive of each other, so that the
+    shares of :meth:`report` add up to the instrumented part of the run.
+    """
+
+    def __init__(self):
+        self.seconds = {}
+        self.calls = {}
+        self.steps = 0
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds, calls=1):
+        with self._lock:
+            self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+            self.calls[name] = self.calls.get(name, 0) + calls
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def add_steps(self, k):
+        with self._lock:
+            self.steps += k
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def shares(self):
+        """Fraction of the instrumented time spent in every phase"""
+        with self._lock:
+            seconds = dict(self.seconds)
+        total = sum(seconds.values())
+        return {name: s / total if total > 0 else 0.0 for name, s in seconds.items()}
+
+    def summary(self, limit=4):
+        """Short text of the largest phase shares, e.g. for a status bar"""
+        shares = sorted(self.shares().items(), key=lambda item: -item[1])[:limit]
+        return ", ".join(f"{name} {share:.0%}" for name, share in shares)
+
+    def report(self, **extra):
+        """Dictionary of every phase plus the given run details, ready for JSON"""
+        shares = self.shares()
+        with self._lock:
+            phases = {name: {"seconds": s, "calls": self.calls[name], "share": shares[name]}
+                      for name, s in self.seconds.items()}
+            steps = self.steps
+        elapsed = self.elapsed()
+        report = {
+            "wall_seconds": elapsed,
+            "steps": steps,
+            "steps_per_second": steps / elapsed if elapsed > 0 else 0.0,
+            "memory_bytes": memory_in_use(),
+            "phases": phases,
+        }
+        report.update(extra)
+        return report
@@ -0,0 +1,144 @@
+"""Energy-drift monitoring with step refinement for long runs."""
+import numpy as np
+
+from .energy import energy_weights
+
+WATCHDOG_ACTIONS = ("refine", "abort")
+
+
+class EnergyDriftError(RuntimeError):
+    """The energy drift of a segment stayed above the watchdog tolerance.
+
+    ``accepted`` is the number of steps of the current block that passed the
+    check; :meth:`Simulation.advance <particle_core.engine.Simulation.advance>`
+    attaches their (positions, velocities) as ``block`` before re-raising.
+    """
+
+    def __init__(self, message, accepted=0):
+        super().__init__(message)
+        self.accepted = accepted
+        self.block = None
+
+
+class EnergyWatchdog:
+    """Check the energy drift every ``interval`` steps while integrating.
+
+    The drift of a segment is the largest deviation of the total energy from
+    its value at the start of the segment, relative to the energy scale
+    ``|K| + |U|`` there. When it exceeds ``tolerance`` the segment is rolled
+    back to its checkpoint and integrated again with ``dt`` halved, up to
+    ``max_refinements`` times, recording only the points at the original
+    step spacing. With ``action="abort"``, or when halving does not help,
+    :class:`EnergyDriftError` is raised with a diagnostic instead and the
+    state is left at the last accepted step.
+
+    The total energy counts the potentials given by
+    :func:`~particle_core.energy.energy_weights`.
+    """
+
+    def __init__(self, tolerance=1e-4, interval=100, max_refinements=4, action="refine"):
+        if action not in WATCHDOG_ACTIONS:
+            raise ValueError(f"Unknown watchdog action: {action!r}")
+        self.tolerance = tolerance
+        self.interval = max(1, interval)
+        self.max_refinements = max_refinements
+        self.action = action
+        self.refined_segments = 0
+        self.max_drift = 0.0
+        self._reference = None
+
+    def start(self, state, integrator):
+        """Take the energy of the current state as the reference of the first segment"""
+        self.mass = state.mass
+        self.weights = energy_weights(state)
+        potential = integrator.current_potential(state)
+        self._reference = self._energies(state.velocities[None], potential[None])
+
+    def _energies(self, velocities, potentials):
+        """Total energy and energy scale of every step of a block"""
+        kinetic = 0.5 * np.einsum('n,tnk,tnk->t', self.mass, velocities, velocities)
+        weighted = potentials * self.weights
+        return kinetic + weighted.sum(axis=1), kinetic + np.abs(weighted).sum(axis=1)
+
+    def drift(self, velocities, potentials):
+        """Largest relative deviation of a block from the reference energy"""
+        total, _ = self._energies(velocities, potentials)
+        reference, scale = self._reference
+        return float(np.max(np.abs(total - reference[-1])) / (scale[-1] or 1.0))
+
+    def options(self):
+        """Keyword arguments that recreate this watchdog"""
+        return {"tolerance": self.tolerance, "interval": self.interval,
+                "max_refinements": self.max_refinements, "action": self.action}
+
+    def get_carried(self):
+        """Reference energy and statistics carried between segments, saved by checkpoints"""
+        total, scale = self._reference
+        return {"reference_total": total.copy(), "reference_scale": scale.copy(),
+                "refined_segments": self.refined_segments, "max_drift": self.max_drift}
+
+    def set_carried(self, values):
+        self._reference = (np.array(values["reference_total"]), np.array(values["reference_scale"]))
+        self.refined_segments = int(values["refined_segments"])
+        self.max_drift = float(values["max_drift"])
+
+    def advance(self, state, integrator, k, positions, velocities, potentials):
+        """Integrate k steps in checked segments, filling the output arrays"""
+        start = 0
+        while start < k:
+            # Segments end on multiples of the interval, however the run is split into blocks
+            seg = slice(start, min(start + self.interval - state.step % self.interval, k))
+            start = seg.stop
+            checkpoint = state.copy()
+            integrator.step_many(state, seg.stop - seg.start,
+                                 positions[seg], velocities[seg], potentials[seg])
+
+            refinement = 0
+            drift = self.drift(velocities[seg], potentials[seg])
+            while drift > self.tolerance:
+                if self.action == "abort" or refinement == self.max_refinements:
+                    message = self.diagnostic(checkpoint, positions[seg], velocities[seg],
+                                              potentials[seg], drift, refinement)
+                    # Leave the state at the last step that passed the check
+                    state.restore(checkpoint)
+                    integrator.prepare(state)
+                    raise EnergyDriftError(message, accepted=seg.start)
+                refinement += 1
+                self._refine(state, integrator, checkpoint, 2 ** refinement,
+                             positions[seg], velocities[seg], potentials[seg])
+                drift = self.drift(velocities[seg], potentials[seg])
+
+            if refinement:
+                self.refined_segments += 1
+            self.max_drift = max(self.max_drift, drift)
+            self._reference = self._energies(velocities[seg.stop - 1:seg.stop],
+                                             potentials[seg.stop - 1:seg.stop])
+
+    def _refine(self, state, integrator, checkpoint, factor, positions, velocities, potentials):
+        """Redo a segment from its checkpoint with dt divided by ``factor``"""
+        dt = checkpoint.dt
+        state.restore(checkpoint)
+        state.dt = dt / factor
+        integrator.prepare(state)
+        for i in range(len(positions)):
+            integrator.step_many(state, factor)
+            positions[i] = state.positions
+            velocities[i] = state.velocities
+            potentials[i] = integrator.current_potential(state)
+
+        # Continue with the original step size
+        state.dt = dt
+        state.step = checkpoint.step + len(positions)
+        integrator.prepare(state)
+
+    def diagnostic(self, checkpoint, positions, velocities, potentials, drift, refinement):
+        total, _ = self._energies(velocities, potentials)
+        worst = int(np.argmax(np.abs(total - self._reference[0][-1])))
+        step = checkpoint.step + worst + 1
+        diff = positions[worst][:, None, :] - positions[worst][None, :, :]
+        r2 = np.einsum('ijk,ijk->ij', diff, diff)
+        np.fill_diagonal(r2, np.inf)
+        closest = np.sqrt(r2.min()) if len(r2) > 1 else np.inf
+        return (f"energy drift {drift:.3g} exceeds tolerance {self.tolerance:.3g} at step {step} "
+                f"(t = {step * checkpoint.dt:.6g}, dt = {checkpoint.dt:.3g}, "
+                f"{refinement} dt refinements, closest pair distance {closest:.3g})")
@@ -0,0 +1,210 @@
+"""Qt worker that runs a :class:`~particle_core.engine.Simulation` off the GUI thread.
+
+This is the only Qt-dependent module of the package and is imported by the
+front ends alone; the engine itself stays usable headless.
+"""
+import threading
+import time
+
+import numpy as np
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from .watchdog import EnergyDriftError
+
+# Minimum time between two published snapshots, bounds the GUI update rate
+SNAPSHOT_INTERVAL = 1 / 30
+
+
+class Snapshot:
+    """Steps integrated since the previous snapshot plus run progress"""
+
+    def __init__(self, positions, velocities, step, total_steps, steps_per_second, fps=None):
+        self.positions = positions
+        self.velocities = velocities
+        self.step = step
+        self.total_steps = total_steps
+        self.steps_per_second = steps_per_second
+        self.fps = fps
+
+
+class SimulationWorker(QObject):
+    """Integrates in chunks and publishes snapshots at a bounded rate.
+
+    Move it to a ``QThread`` and connect ``QThread.started`` to :meth:`run`.
+    :meth:`cancel`, :meth:`pause`, :meth:`resume` and :meth:`advance_steps`
+    may be called from any thread. While paused the worker blocks on a
+    condition variable and uses no CPU.
+
+    With a :class:`~particle_core.scheduler.FrameScheduler` the worker runs
+    in lockstep with the display: every snapshot is one frame, and the next
+    frame is only integrated after :meth:`frame_rendered` was called and the
+    frame period has elapsed.
+
+    A started :class:`~particle_core.profiler.RunProfiler` passed as
+    ``profiler`` profiles the worker thread for the whole run.
+
+    With a :class:`~particle_core.checkpoint.CheckpointWriter` passed as
+    ``checkpoints`` the worker captures its due checkpoints between chunks;
+    :meth:`request_checkpoint` asks for one, also while paused.
+    """
+    snapshot = pyqtSignal(object)
+    finished = pyqtSignal(bool)  # True if the run was cancelled
+    failed = pyqtSignal(str)
+
+    def __init__(self, simulation, steps, chunk=1000, snapshot_interval=SNAPSHOT_INTERVAL, scheduler=None,
+                 profiler=None, checkpoints=None):
+        super().__init__()
+        self.simulation = simulation
+        self.steps = steps
+        self.chunk = max(1, chunk)
+        self.snapshot_interval = snapshot_interval
+        self.scheduler = scheduler
+        self.profiler = profiler
+        self.checkpoints = checkpoints
+        self._frame_pending = False
+        self._cancel = threading.Event()
+        self._condition = threading.Condition()
+        self._paused = False
+        # Steps still allowed while paused (single-step / run N steps)
+        self._budget = 0
+
+    def cancel(self):
+        self._cancel.set()
+        with self._condition:
+            self._condition.notify_all()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def paused(self):
+        return self._paused
+
+    def pause(self):
+        with self._condition:
+            self._paused = True
+            self._budget = 0
+
+    def resume(self):
+        with self._condition:
+            self._paused = False
+            self._budget = 0
+            self._condition.notify_all()
+
+    def advance_steps(self, n):
+        """Pause (if running) and then integrate exactly n more steps"""
+        with self._condition:
+            self._paused = True
+            self._budget += n
+            self._condition.notify_all()
+
+    def request_checkpoint(self):
+        """Capture a checkpoint after the current chunk, or right away if paused"""
+        with self._condition:
+            self.checkpoints.request()
+            self._condition.notify_all()
+
+    def _wait_until_runnable(self):
+        """Block while paused; return the step budget, or None when running freely"""
+        with self._condition:
+            while (self._paused and self._budget == 0 and not self.cancelled
+                   and not (self.checkpoints is not None and self.checkpoints.requested)):
+                self._condition.wait()
+            return self._budget if self._paused else None
+
+    def frame_rendered(self, seconds):
+        """Report that the last published frame was drawn and how long drawing took"""
+        with self._condition:
+            self.scheduler.record_render(seconds)
+            self._frame_pending = False
+            self._condition.notify_all()
+
+    def _wait_for_frame(self, frame_start):
+        """Block until the last frame was rendered and the frame period is over"""
+        with self._condition:
+            while self._frame_pending and not self.cancelled:
+                self._condition.wait()
+            remaining = self.scheduler.time_until_next_frame(frame_start)
+            if remaining > 0 and not self.cancelled:
+                self._condition.wait(remaining)
+
+    def _consume_budget(self, k):
+        with self._condition:
+            if self._paused:
+                self._budget = max(0, self._budget - k)
+                return self._budget == 0
+        return False
+
+    @pyqtSlot()
+    def run(self):
+        done = 0
+        pending = []
+        # Time spent paused is excluded from the steps/s figure
+        active = 0.0
+        last_emit = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.enable()
+        if self.scheduler is not None:
+            self.scheduler.start()
+        try:
+            while done < self.steps:
+                if self._paused and self._budget == 0 and pending:
+                    # Show the exact state the run is paused at
+                    self._publish(pending, done, done / active if active > 0 else 0.0)
+                    pending = []
+                budget = self._wait_until_runnable()
+                if self.cancelled:
+                    break
+                if self.checkpoints is not None:
+                    self.checkpoints.poll(self.simulation)
+                if budget == 0:
+                    # Woken up only to capture a checkpoint
+                    continue
+
+                if self.scheduler is not None:
+                    k = self.scheduler.steps_for_next_frame()
+                else:
+                    k = self.chunk
+                k = min(k, self.steps - done)
+                if budget is not None:
+                    k = min(k, budget)
+                start = time.perf_counter()
+                pending.append(self.simulation.advance(k))
+                now = time.perf_counter()
+                active += now - start
+                done += k
+                budget_spent = self._consume_budget(k)
+
+                if self.scheduler is not None:
+                    self.scheduler.record_integration(k, now - start)
+                    # The rates of this frame go out with its snapshot
+                    self.scheduler.frame_done(k, now)
+                    self._frame_pending = True
+                    self._publish(pending, done, self.scheduler.steps_per_second, self.scheduler.fps)
+                    pending = []
+                    self._wait_for_frame(start)
+                elif budget_spent or now - last_emit >= self.snapshot_interval:
+                    self._publish(pending, done, done / active if active > 0 else 0.0)
+                    pending = []
+                    last_emit = now
+            if pending:
+                self._publish(pending, done, done / active if active > 0 else 0.0)
+        except EnergyDriftError as e:
+            # Show the steps that passed the check before the run was aborted, if any did
+            if len(e.block[0]):
+                pending.append(e.block)
+                done += len(e.block[0])
+            if pending:
+                self._publish(pending, done, done / active if active > 0 else 0.0)
+            self.failed.emit(str(e))
+        except Exception as e:
+            self.failed.emit(str(e))
+        if self.profiler is not None:
+            self.profiler.disable()
+        self.finished.emit(self.cancelled)
+
+    def _publish(self, blocks, done, steps_per_second, fps=None):
+        positions = np.concatenate([b[0] for b in blocks])
+        velocities = np.concatenate([b[1] for b in blocks])
+        self.snapshot.emit(Snapshot(positions, velocities, done, self.steps, steps_per_second, fps))
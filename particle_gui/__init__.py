@@ -0,0 +1,42 @@
+"""Qt front end of the particle simulator, shared by the localized launchers.
+
+The window and its dialogs import PyQt5 and matplotlib, so they are only
+imported by :func:`main`; headless code should use :mod:`particle_core`,
+which imports neither.
+"""
+
+
+def main(language="en", about_file=None, user_guide_file=None, argv=None, quit_when_shown=False):
+    """Run the simulator window in ``language`` until it is closed, return the exit code.
+
+    With ``quit_when_shown`` the application prints the startup report of
+    the window as JSON and quits as soon as the window is up, which is how
+    the benchmarks measure the time to the first window.
+    """
+    import json
+    import sys
+
+    from particle_core import PhaseTimers
+
+    startup = PhaseTimers()
+    with startup.phase("import Qt"):
+        from PyQt5.QtCore import QTimer
+        from PyQt5.QtWidgets import QApplication
+    with startup.phase("import window"):
+        from .translations import install_translator
+        from .window import ParticleSimulator
+    with startup.phase("create application"):
+        app = QApplication.instance() or QApplication(sys.argv if argv is None else argv)
+        install_translator(app, language)
+    window = ParticleSimulator(about_file, user_guide_file, startup)
+    with startup.phase("show"):
+        window.show()
+
+    def shown():
+        window.startup_finished()
+        if quit_when_shown:
+            print(json.dumps(window.startup_report()))
+            app.quit()
+    # Runs once the event loop has processed the first show and paint of the window
+    QTimer.singleShot(0, shown)
+    return app.exec_()
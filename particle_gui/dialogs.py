@@ -0,0 +1,230 @@
+"""Dialogs of the particle simulator window."""
+import math
+
+import numpy as np
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import (
+    QCheckBox, QColorDialog, QComboBox, QDialog, QGridLayout, QHBoxLayout, QLabel, QLineEdit,
+    QMessageBox, QPushButton, QSpinBox, QTextBrowser, QVBoxLayout
+)
+
+from particle_core.generators import electron_cloud, lattice, random_gas, rotating_disk
+
+# Generated scene kinds in the order of the generator combo box
+SCENE_KINDS = ["square lattice", "hex lattice", "gas", "disk", "cloud"]
+# Most particles a generated scene may have: the window keeps one Particle, with its trajectory, per particle
+MAX_GENERATED_PARTICLES = 100000
+
+
+class HelpDialog(QDialog):
+    def __init__(self, title, html_content, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.resize(600, 400)
+
+        layout = QVBoxLayout()
+        self.browser = QTextBrowser()
+        self.browser.setHtml(html_content)
+        layout.addWidget(self.browser)
+
+        close_button = QPushButton(self.tr("Close"))
+        close_button.clicked.connect(self.accept)
+        layout.addWidget(close_button)
+
+        self.setLayout(layout)
+
+
+class ParticleEditDialog(QDialog):
+    def __init__(self, particle, parent=None):
+        super().__init__(parent)
+        self.particle = particle
+        self.setWindowTitle(self.tr("Edit Particle"))
+        self.resize(500, 300)
+        self.initUI()
+
+    def initUI(self):
+        layout = QVBoxLayout()
+
+        # Create form layout for particle properties
+        form_layout = QGridLayout()
+
+        # Create input fields with current particle values
+        self.posx_input = QLineEdit(str(self.particle.x_mass[0]))
+        self.posy_input = QLineEdit(str(self.particle.y_mass[0]))
+        self.charge_input = QLineEdit(str(self.particle.charge))
+        self.mass_input = QLineEdit(str(self.particle.mass))
+        self.velocity_input = QLineEdit(str(self.particle.velocity))
+        self.angle_input = QLineEdit(str(self.particle.angle))
+        self.dt_input = QLineEdit(str(self.particle.dt))
+
+        # Add labels and inputs to form
+        labels = [self.tr("X Position"), self.tr("Y Position"), self.tr("Charge"), self.tr("Mass"),
+                  self.tr("Velocity"), self.tr("Angle"), "dt"]
+        inputs = [self.posx_input, self.posy_input, self.charge_input,
+                 self.mass_input, self.velocity_input, self.angle_input, self.dt_input]
+
+        for i, (label, input_field) in enumerate(zip(labels, inputs)):
+            form_layout.addWidget(QLabel(label), i, 0)
+            form_layout.addWidget(input_field, i, 1)
+
+        # Add checkboxes for interactions
+        self.ch_interact_check = QCheckBox(self.tr("Charge Interaction"))
+        self.mass_interact_check = QCheckBox(self.tr("Mass Interaction"))
+        self.ch_interact_check.setChecked(self.particle.is_moving_ch)
+        self.mass_interact_check.setChecked(self.particle.is_moving_m)
+
+        form_layout.addWidget(self.ch_interact_check, len(labels), 0)
+        form_layout.addWidget(self.mass_interact_check, len(labels), 1)
+
+        # Add color selection button
+        self.current_color = self.particle.color
+        self.color_btn = QPushButton(self.tr("Choose Color"))
+        self.color_btn.setStyleSheet(f"background-color: {self.current_color}")
+        self.color_btn.clicked.connect(self.choose_color)
+        form_layout.addWidget(QLabel(self.tr("Color:")), len(labels) + 1, 0)
+        form_layout.addWidget(self.color_btn, len(labels) + 1, 1)
+
+        # Add form layout to main layout
+        layout.addLayout(form_layout)
+
+        # Add buttons for save/cancel
+        button_layout = QHBoxLayout()
+        save_button = QPushButton(self.tr("Save Changes"))
+        cancel_button = QPushButton(self.tr("Cancel"))
+
+        save_button.clicked.connect(self.save_changes)
+        cancel_button.clicked.connect(self.reject)
+
+        button_layout.addWidget(save_button)
+        button_layout.addWidget(cancel_button)
+
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    def choose_color(self):
+        color = QColorDialog.getColor(QColor(self.current_color))
+        if color.isValid():
+            self.current_color = color.name()
+            self.color_btn.setStyleSheet(f"background-color: {self.current_color}")
+
+    def save_changes(self):
+        try:
+            # Get values from input fields
+            posx = float(self.posx_input.text())
+            posy = float(self.posy_input.text())
+            charge = float(self.charge_input.text())
+            mass = float(self.mass_input.text())
+            velocity = float(self.velocity_input.text())
+            angle = float(self.angle_input.text())
+            dt = float(self.dt_input.text())
+
+            # Update particle properties
+            self.particle.charge = charge
+            self.particle.mass = mass
+            self.particle.is_moving_ch = self.ch_interact_check.isChecked()
+            self.particle.is_moving_m = self.mass_interact_check.isChecked()
+            self.particle.dt = dt
+            self.particle.color = self.current_color
+            self.particle.velocity = velocity
+            self.particle.angle = angle
+
+            # Update position and velocity
+            rad_angle = math.radians(angle)
+            self.particle.vx = velocity * np.cos(rad_angle)
+            self.particle.vy = velocity * np.sin(rad_angle)
+
+            # Reset trajectory to start from new position
+            self.particle.x_mass = [posx, posx + self.particle.vx * dt]
+            self.particle.y_mass = [posy, posy + self.particle.vy * dt]
+
+            self.accept()
+        except ValueError as e:
+            # Show error message if input validation fails
+            QMessageBox.warning(self, self.tr("Input Error"),
+                                self.tr("Please enter valid numeric values: {}").format(e))
+
+
+class GenerateSceneDialog(QDialog):
+    """Choose a procedural scene; :meth:`scene` generates its columns"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(self.tr("Generate Scene"))
+        self.initUI()
+
+    def initUI(self):
+        layout = QVBoxLayout()
+        form_layout = QGridLayout()
+
+        self.kind_combo = QComboBox()
+        self.kind_combo.addItems([
+            self.tr("Square lattice of fixed ions"), self.tr("Hexagonal lattice of fixed ions"),
+            self.tr("Random gas"), self.tr("Rotating disk"), self.tr("Electron cloud"),
+        ])
+        self.count_spin = QSpinBox()
+        self.count_spin.setRange(1, MAX_GENERATED_PARTICLES)
+        self.count_spin.setValue(1000)
+        # Side of the lattice or of the gas box, disk radius or Bohr radius
+        self.size_input = QLineEdit("10.0")
+        self.temperature_input = QLineEdit("1.0")
+        self.dt_input = QLineEdit("0.0001")
+        self.seed_spin = QSpinBox()
+        self.seed_spin.setRange(0, 2**31 - 1)
+
+        labels = [self.tr("Scene:"), self.tr("Particles:"), self.tr("Size:"), self.tr("Temperature:"), "dt:",
+                  self.tr("Seed:")]
+        inputs = [self.kind_combo, self.count_spin, self.size_input, self.temperature_input, self.dt_input,
+                  self.seed_spin]
+        for i, (label, input_field) in enumerate(zip(labels, inputs)):
+            form_layout.addWidget(QLabel(label), i, 0)
+            form_layout.addWidget(input_field, i, 1)
+
+        self.replace_check = QCheckBox(self.tr("Replace the current particles"))
+        self.replace_check.setChecked(True)
+        form_layout.addWidget(self.replace_check, len(labels), 0, 1, 2)
+        limit_label = QLabel(self.tr(
+            "At most {:,} particles, each one is kept with its trajectory. Larger scenes can be made "
+            "with particle_core.generators and run without the window.").format(MAX_GENERATED_PARTICLES))
+        limit_label.setWordWrap(True)
+        form_layout.addWidget(limit_label, len(labels) + 1, 0, 1, 2)
+        layout.addLayout(form_layout)
+
+        button_layout = QHBoxLayout()
+        generate_button = QPushButton(self.tr("Generate"))
+        cancel_button = QPushButton(self.tr("Cancel"))
+        generate_button.clicked.connect(self.check_values)
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(generate_button)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    def check_values(self):
+        try:
+            float(self.size_input.text())
+            float(self.temperature_input.text())
+            float(self.dt_input.text())
+        except ValueError as e:
+            QMessageBox.warning(self, self.tr("Input Error"),
+                                self.tr("Please enter valid numeric values: {}").format(e))
+            return
+        self.accept()
+
+    def scene(self, k=1.0, G=1.0):
+        """Columns of the chosen scene, for a run with the constants ``k`` and ``G``"""
+        kind = SCENE_KINDS[self.kind_combo.currentIndex()]
+        n = self.count_spin.value()
+        size = float(self.size_input.text())
+        dt = float(self.dt_input.text())
+        seed = self.seed_spin.value()
+        if kind in ("square lattice", "hex lattice"):
+            # The first n ions of the smallest near-square lattice holding them, ``size`` wide
+            cols = math.ceil(math.sqrt(n))
+            columns = lattice(math.ceil(n / cols), cols, size / cols, "hex" if kind == "hex lattice" else "square",
+                              dt=dt)
+            return {field: values[:n] for field, values in columns.items()}
+        if kind == "gas":
+            return random_gas(n, size, float(self.temperature_input.text()), dt=dt, seed=seed)
+        if kind == "disk":
+            return rotating_disk(n, size, G=G, dt=dt, seed=seed)
+        return electron_cloud(n, size, k=k, dt=dt, seed=seed)
@@ -0,0 +1,248 @@
+"""Item model of the particle table.
+
+:class:`ParticleTableModel` shows the window's list of particles without
+copying it: a view asks for the cells of its visible rows only, and every
+cell is formatted when it is asked for. Edits go through the model, which
+changes the list in place and signals just the rows concerned, so adding,
+deleting or moving one particle costs the same with three particles or
+with a hundred thousand.
+
+Sorting and filtering are done by the model itself: the rows are an array
+of indices into the list, rebuilt with one pass over the particles and a
+NumPy sort. A ``QSortFilterProxyModel`` would call back into Python for
+every comparison, which takes seconds for a large scene.
+"""
+import operator
+import re
+
+import numpy as np
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QColor
+
+# Columns of the filter combo box, by the name of their particle attribute
+FILTER_COLUMNS = ["charge", "mass", "color"]
+COMPARISONS = {
+    "<=": operator.le,
+    ">=": operator.ge,
+    "!=": operator.ne,
+    "<": operator.lt,
+    ">": operator.gt,
+    "=": operator.eq,
+}
+_COMPARISON = re.compile(r"^\s*(<=|>=|!=|<|>|=)?\s*(.+?)\s*$")
+
+
+def particle_value(p, column):
+    """Raw value of a particle in a column of ``ParticleTableModel.COLUMNS``"""
+    if column == "x":
+        return p.x_mass[-1]
+    if column == "y":
+        return p.y_mass[-1]
+    return getattr(p, column)
+
+
+def value_filter(text):
+    """Predicate of a filter text: a number with an optional comparison, or a substring.
+
+    ``">0"``, ``"<= 2"`` or ``"1836"`` compare numbers; text that is no
+    number matches values containing it, ignoring case. Empty text matches
+    everything.
+    """
+    match = _COMPARISON.match(text)
+    if not text.strip() or match is None:
+        return lambda value: True
+    sign, operand = match.groups()
+    try:
+        number = float(operand)
+    except ValueError:
+        needle = text.strip().lower()
+        return lambda value: needle in str(value).lower()
+    compare = COMPARISONS[sign or "="]
+
+    def accepts(value):
+        try:
+            return compare(float(value), number)
+        except (TypeError, ValueError):
+            return False
+    return accepts
+
+
+class ParticleTableModel(QAbstractTableModel):
+    """Sortable, filterable table over a list of :class:`~particle_core.scene.Particle`.
+
+    The list is shared with its owner and only changed through
+    :meth:`append_particles`, :meth:`remove_particle` and
+    :meth:`move_particle`, or replaced with :meth:`set_particles`. Call
+    :meth:`particle_changed` after editing one particle and :meth:`refresh`
+    after a run moved all of them. Rows and list indices differ while the
+    table is sorted or filtered, see :meth:`particle_index` and :meth:`row_of`.
+    """
+    # Particle attribute shown in every column, "number" is the position in the list
+    COLUMNS = ["number", "x", "y", "charge", "mass", "velocity", "angle", "dt", "is_moving_ch",
+               "is_moving_m", "color"]
+
+    def __init__(self, particles=None, parent=None):
+        super().__init__(parent)
+        self.particles = particles if particles is not None else []
+        self.headers = [self.tr("#"), "X", "Y", self.tr("Charge"), self.tr("Mass"), self.tr("Velocity"),
+                        self.tr("Angle"), "dt", self.tr("Ch"), self.tr("Grav"), self.tr("Color")]
+        # Sorted by list position unless a column is chosen, see sort()
+        self.sort_column = "number"
+        self.descending = False
+        self.filter_column = None
+        self.accepts = None
+        self.rows = self.visible_rows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        i = int(self.rows[index.row()])
+        column = self.COLUMNS[index.column()]
+        p = self.particles[i]
+        if role == Qt.DisplayRole:
+            if column == "number":
+                return i + 1
+            value = particle_value(p, column)
+            if column in ("x", "y"):
+                return f"{value:.2f}"
+            return str(value)
+        if role == Qt.DecorationRole and column == "color":
+            return QColor(p.color)
+        if role == Qt.ToolTipRole:
+            return self.particle_text(p)
+        return None
+
+    def particle_text(self, p):
+        return self.tr("Pos: ({:.2f}, {:.2f}), Q={}, m={}, v={}, angle={}, dt={}, "
+                       "Ch={}, Grav={}, Color={}").format(
+            p.x_mass[-1], p.y_mass[-1], p.charge, p.mass, p.velocity, p.angle, p.dt,
+            p.is_moving_ch, p.is_moving_m, p.color)
+
+    def particle_index(self, row):
+        """Index in the list of the particle shown in ``row``"""
+        return int(self.rows[row])
+
+    def row_of(self, index):
+        """Row showing the particle at ``index`` of the list, -1 if it is filtered out"""
+        found = np.flatnonzero(self.rows == index)
+        return int(found[0]) if len(found) else -1
+
+    def visible_rows(self):
+        """List indices of the rows, filtered and in sort order"""
+        n = len(self.particles)
+        rows = np.arange(n)
+        if self.accepts is not None:
+            mask = np.fromiter((self.accepts(particle_value(p, self.filter_column)) for p in self.particles),
+                               dtype=bool, count=n)
+            rows = rows[mask]
+        if self.sort_column != "number":
+            keys = np.array([particle_value(self.particles[i], self.sort_column) for i in rows.tolist()])
+            rows = rows[np.argsort(keys, kind="stable")] if len(rows) else rows
+        return rows[::-1].copy() if self.descending else rows
+
+    def relayout(self):
+        """Rebuild the rows after the order or the filter changed, keeping the selection"""
+        self.layoutAboutToBeChanged.emit()
+        old = self.rows
+        self.rows = self.visible_rows()
+        new_row = np.full(len(self.particles), -1)
+        new_row[self.rows] = np.arange(len(self.rows))
+        persistent = self.persistentIndexList()
+        moved = []
+        for index in persistent:
+            row = new_row[old[index.row()]] if index.row() < len(old) and old[index.row()] < len(new_row) else -1
+            moved.append(self.index(int(row), index.column()) if row >= 0 else QModelIndex())
+        self.changePersistentIndexList(persistent, moved)
+        self.layoutChanged.emit()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sort_column = self.COLUMNS[column] if column >= 0 else "number"
+        self.descending = order == Qt.DescendingOrder
+        self.relayout()
+
+    def set_value_filter(self, column, text):
+        """Keep the rows whose ``column`` attribute matches ``text``, see :func:`value_filter`"""
+        self.filter_column = column
+        self.accepts = value_filter(text) if text.strip() else None
+        self.relayout()
+
+    def ordered_by_number(self):
+        return self.sort_column == "number" and self.accepts is None
+
+    def set_particles(self, particles):
+        self.beginResetModel()
+        self.particles = particles
+        self.rows = self.visible_rows()
+        self.endResetModel()
+
+    def append_particles(self, particles):
+        if not particles:
+            return
+        start = len(self.particles)
+        if not self.ordered_by_number() or self.descending:
+            self.particles.extend(particles)
+            self.relayout()
+            return
+        self.beginInsertRows(QModelIndex(), start, start + len(particles) - 1)
+        self.particles.extend(particles)
+        self.rows = np.arange(len(self.particles))
+        self.endInsertRows()
+
+    def remove_particle(self, index):
+        row = self.row_of(index)
+        if row >= 0:
+            self.beginRemoveRows(QModelIndex(), row, row)
+        self.particles.pop(index)
+        rows = self.rows[self.rows != index]
+        shifted = rows > index
+        rows[shifted] -= 1
+        self.rows = rows
+        if row >= 0:
+            self.endRemoveRows()
+        # Later particles moved up in the list, their numbers changed
+        changed = np.flatnonzero(shifted)
+        if len(changed):
+            self.dataChanged.emit(self.index(int(changed.min()), 0), self.index(int(changed.max()), 0))
+
+    def move_particle(self, index, target):
+        """Swap the particle at ``index`` of the list with its neighbour at ``target``"""
+        row, target_row = self.row_of(index), self.row_of(target)
+        if self.sort_column == "number" and row >= 0 and target_row >= 0:
+            # Rows in list order stay in place, their particles change rows
+            low, high = sorted((row, target_row))
+            self.beginMoveRows(QModelIndex(), low, low, QModelIndex(), high + 1)
+            self.particles[index], self.particles[target] = self.particles[target], self.particles[index]
+            self.endMoveRows()
+            return
+        # Every row keeps showing its particle, only the numbers change
+        self.particles[index], self.particles[target] = self.particles[target], self.particles[index]
+        for changed, new_index in ((row, target), (target_row, index)):
+            if changed >= 0:
+                self.rows[changed] = new_index
+                self.dataChanged.emit(self.index(changed, 0), self.index(changed, 0))
+
+    def particle_changed(self, index):
+        if not self.ordered_by_number():
+            # The edit may move the row or hide it
+            self.relayout()
+            return
+        row = self.row_of(index)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.COLUMNS) - 1))
+
+    def refresh(self):
+        """Every particle changed its current position, e.g. after a run"""
+        if self.sort_column in ("x", "y"):
+            self.relayout()
+        elif self.rows.size:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.rows) - 1, len(self.COLUMNS) - 1))
@@ -0,0 +1,35 @@
+"""Collapsible panels whose contents are built on first use."""
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QToolButton, QVBoxLayout, QWidget
+
+
+class LazyPanel(QWidget):
+    """A collapsed section that calls ``build()`` for its contents when first expanded.
+
+    ``build`` returns the widget shown under the title button; until then
+    :attr:`content` is None and none of its children exist.
+    """
+
+    def __init__(self, title, build, parent=None):
+        super().__init__(parent)
+        self.build = build
+        self.content = None
+
+        self.toggle = QToolButton()
+        self.toggle.setText(title)
+        self.toggle.setCheckable(True)
+        self.toggle.setToolButtonStyle(Qt.ToolButtonTextBesideIcon)
+        self.toggle.setArrowType(Qt.RightArrow)
+        self.toggle.toggled.connect(self.set_expanded)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.toggle)
+
+    def set_expanded(self, expanded):
+        if expanded and self.content is None:
+            self.content = self.build()
+            self.layout().addWidget(self.content)
+        if self.content is not None:
+            self.content.setVisible(expanded)
+        self.toggle.setArrowType(Qt.DownArrow if expanded else Qt.RightArrow)
@@ -0,0 +1,239 @@
+"""Translations of the user interface.
+
+The window wraps every visible string in ``self.tr``; :func:`install_translator`
+installs a translator that looks the source strings up in the catalogue of
+the chosen language, plus Qt's own translations of the standard dialogs.
+Catalogues are plain dictionaries keyed by the English source string, so
+no compiled ``.qm`` files have to be shipped. Strings without an entry, and
+every string in English, are shown untranslated.
+"""
+from PyQt5.QtCore import QLibraryInfo, QLocale, QTranslator
+
+RUSSIAN = {
+    # Main window
+    "Particle Simulator": "Симулятор частиц",
+    "Error: could not load integrator plugin: {}": "Ошибка: не удалось загрузить модуль интегратора: {}",
+    "Particle Parameters": "Параметры частицы",
+    "Charge": "Заряд",
+    "Mass": "Масса",
+    "Velocity": "Скорость",
+    "Angle": "Угол",
+    "Choose Color": "Выбрать цвет",
+    "Charge Interaction": "Электрическое взаимодействие",
+    "Mass Interaction": "Гравитационное взаимодействие",
+    "Simulation Constants": "Константы симуляции",
+    "Simulation time:": "Время симуляции:",
+    "Max trajectory points:": "Макс. точек траектории:",
+    "Use trajectory limits": "Использовать ограничение траектории",
+    "Grid Size X:": "Размер сетки X:",
+    "Grid Size Y:": "Размер сетки Y:",
+    "Particle Management": "Управление частицами",
+    "Add Particle": "Добавить частицу",
+    "Edit Particle": "Редактировать частицу",
+    "Delete Particle": "Удалить частицу",
+    "Clear Particles": "Очистить частицы",
+    "Save Particles": "Сохранить частицы",
+    "Load Particles": "Загрузить частицы",
+    "Move Up": "Вверх",
+    "Move Down": "Вниз",
+    "Particles": "Частицы",
+    "Filter:": "Фильтр:",
+    "e.g. >0, 1836 or red": "напр. >0, 1836 или red",
+    "#": "№",
+    "Ch": "Эл",
+    "Grav": "Грав",
+    "Color": "Цвет",
+    "Real-world Time Conversion": "Конвертация реального времени",
+    "Real mass 1 (kg):": "Реальная масса 1 (кг):",
+    "Real mass 2 (kg):": "Реальная масса 2 (кг):",
+    "Real distance (m):": "Реальное расстояние (м):",
+    "Real charge 1 (C):": "Реальный заряд 1 (Кл):",
+    "Real charge 2 (C):": "Реальный заряд 2 (Кл):",
+    "Electrostatic time (s):": "Электростатическое время (с):",
+    "Gravitational time (s):": "Гравитационное время (с):",
+    "Calculate Real Times": "Рассчитать реальное время",
+    "Visualization Options": "Настройки визуализации",
+    "Simulation Mode": "Режим симуляции",
+    "Real-time Simulation": "Симуляция в реальном времени",
+    "Default Simulation": "Стандартная симуляция",
+    "Integration Method": "Метод интегрирования",
+    "Visualization Type": "Тип визуализации",
+    "Energy Settings": "Настройки энергии",
+    "Target Energy:": "Целевая энергия:",
+    "Drift tolerance (0 - off):": "Допуск дрейфа (0 - выкл.):",
+    "Refine dt": "Уменьшать dt",
+    "Abort": "Прерывать",
+    "Type:": "Тип:",
+    "Density layers:": "Слои плотности:",
+    "Particle 1": "Частица 1",
+    "Per particle": "По частицам",
+    "Per color": "По цвету",
+    "Per charge sign": "По знаку заряда",
+    "Raster color mapping:": "Цветовая шкала растра:",
+    "Logarithmic": "Логарифмическая",
+    "Histogram equalized": "Выравнивание гистограммы",
+    "Stop iterations for heatmap and histograms": "Остановить итерации для тепловой карты и гистограмм",
+    "Run Simulation": "Запустить симуляцию",
+    "Reset Simulation": "Сбросить симуляцию",
+    "Pause": "Пауза",
+    "Resume": "Продолжить",
+    "Target FPS:": "Целевой FPS:",
+    "Max sim/wall time ratio (0 - unlimited):":
+        "Макс. отношение времени симуляции к реальному (0 - без ограничений):",
+    "Step": "Шаг",
+    "Run N Steps": "Выполнить N шагов",
+    "Steps/s: -": "Шагов/с: -",
+    "Steps/s: {:,.0f}": "Шагов/с: {:,.0f}",
+    "Cancel": "Отмена",
+    "Instrument runs (status bar and report)": "Замерять фазы запуска (строка состояния и отчёт)",
+    "Profile this run (cProfile and tracemalloc)": "Профилировать этот запуск (cProfile и tracemalloc)",
+    "Store every step on disk (independent of trajectory limits)":
+        "Сохранять каждый шаг на диск (независимо от ограничения траектории)",
+    "Pos: ({:.2f}, {:.2f}), Q={}, m={}, v={}, angle={}, dt={}, Ch={}, Grav={}, Color={}":
+        "Позиция: ({:.2f}, {:.2f}), Заряд={}, масса={}, Скорость={}, угол={}, dt={}, "
+        "Уч_эл={}, Уч_грав={}, Цвет={}",
+    "Error: enter valid values.": "Ошибка: введите корректные значения.",
+    "Error: check the values of G, k, the simulation time and the time ratio.":
+        "Ошибка: проверьте значения G, k, времени симуляции и отношения времени.",
+    "Error: simulation failed: {}": "Ошибка: сбой симуляции: {}",
+    "Energy watchdog: dt was refined in {} segments, max drift {:.3g}":
+        "Контроль энергии: dt уменьшался в {} сегментах, макс. дрейф {:.3g}",
+    "Profile written to {}, allocation summary to {}":
+        "Профиль сохранён в {}, сводка выделений памяти в {}",
+    "Steps/s: {:,.0f} | {} | force evals/step: {} | memory: {}":
+        "Шагов/с: {:,.0f} | {} | вычислений сил/шаг: {} | память: {}",
+    "Run report written to {}": "Отчёт о запуске сохранён в {}",
+    "Trajectory of {} steps written to {}": "Траектория из {} шагов сохранена в {}",
+    "Window shown in {:.0f} ms | {}": "Окно открыто за {:.0f} мс | {}",
+    "{:.2e} s": "{:.2e} с",
+    "Error: {}": "Ошибка: {}",
+    "Open Particles": "Открыть список частиц",
+    "JSON Files (*.json)": "JSON файлы (*.json)",
+    "Columnar scenes (*.npz)": "Столбцовые сцены (*.npz)",
+    "Scenes (*.json *.npz)": "Сцены (*.json *.npz)",
+    # Integrators, by their label
+    "Verlet": "Верле",
+    "RK4": "Рунге-Кутт 4 порядка",
+    "Bulirsch-Stoer": "Булирш-Стоер",
+    # Plots
+    "Kinetic Energy": "Кинетическая энергия",
+    "Potential Energy": "Потенциальная энергия",
+    "Total Energy": "Полная энергия",
+    "Time": "Время",
+    "Energy": "Энергия",
+    "Change of Energy in time": "Изменение энергии во времени",
+    "Difference of Energy in time": "Разность энергии во времени",
+    "p{}: Q={}, m={}": "ч{}: Q={}, m={}",
+    "Particle Trajectories": "Траектории частиц",
+    "particle {}": "частица {}",
+    "positive charge": "положительный заряд",
+    "negative charge": "отрицательный заряд",
+    "neutral": "нейтральные",
+    "Probability": "Вероятность",
+    "Particle Density Heatmap ({})": "Тепловая карта плотности частиц ({})",
+    "Particle Density Heatmap": "Тепловая карта плотности частиц",
+    "Trajectory Density Raster": "Растр плотности траекторий",
+    "Normalized Probability": "Нормализованная вероятность",
+    "Count": "Количество",
+    "{}-Axis Position Histogram": "Гистограмма положений по оси {}",
+    # Visualization types
+    "Trajectory Lines": "Линии траекторий",
+    "Density Heatmap": "Тепловая карта плотности",
+    "X-Axis Histogram": "Гистограмма по оси X",
+    "Y-Axis Histogram": "Гистограмма по оси Y",
+    "Electric Energy Plot": "График энергии электрического взаимодействия",
+    "Gravitational Energy Plot": "График энергии гравитационного взаимодействия",
+    "Electric Difference Energy Plot": "График энергии электрического взаимодействия (приближение)",
+    "Gravitational Difference Energy Plot": "График энергии гравитационного взаимодействия (приближение)",
+    # Stored runs
+    "File": "Файл",
+    "Open Stored Run...": "Открыть сохранённый запуск...",
+    "Open Stored Run": "Открыть сохранённый запуск",
+    "Stored runs (index.json *.h5 *.hdf5)": "Сохранённые запуски (index.json *.h5 *.hdf5)",
+    "Could not open the stored run: {}": "Не удалось открыть сохранённый запуск: {}",
+    # Checkpoints
+    "Checkpoint every (min, 0 - off):": "Контрольная точка каждые (мин, 0 - выкл.):",
+    "Save Checkpoint": "Сохранить контрольную точку",
+    "Resume from Checkpoint...": "Продолжить с контрольной точки...",
+    "Resume from Checkpoint": "Продолжить с контрольной точки",
+    "Checkpoints (*.npz)": "Контрольные точки (*.npz)",
+    "Could not read the checkpoint: {}": "Не удалось прочитать контрольную точку: {}",
+    "Checkpoint written to {}": "Контрольная точка сохранена в {}",
+    # Help menu
+    "Help": "Справка",
+    "About": "О программе",
+    "User Guide": "Руководство пользователя",
+    "About Particle Simulator": "О симуляторе частиц",
+    "<h1>About Particle Simulator</h1><p>About file not found. Please create an '{}' file.</p>":
+        "<h1>О симуляторе частиц</h1><p>Файл описания не найден. Пожалуйста, создайте файл '{}'.</p>",
+    "<h1>User Guide</h1><p>User guide file not found. Please create a '{}' file.</p>":
+        "<h1>Руководство пользователя</h1><p>Файл руководства не найден. Пожалуйста, создайте файл '{}'.</p>",
+    "Error": "Ошибка",
+    "Could not open the help file: {}": "Не удалось открыть файл справки: {}",
+    "File not found": "Файл не найден",
+    "Help file '{}' not found.": "Файл справки '{}' не найден.",
+    # Dialogs
+    "Close": "Закрыть",
+    "X Position": "Позиция X",
+    "Y Position": "Позиция Y",
+    "Color:": "Цвет:",
+    "Save Changes": "Сохранить изменения",
+    "Input Error": "Ошибка ввода",
+    "Please enter valid numeric values: {}": "Пожалуйста, введите корректные числовые значения: {}",
+    "Generate Scene...": "Создать сцену...",
+    "Generate Scene": "Создание сцены",
+    "Square lattice of fixed ions": "Квадратная решётка неподвижных ионов",
+    "Hexagonal lattice of fixed ions": "Гексагональная решётка неподвижных ионов",
+    "Random gas": "Случайный газ",
+    "Rotating disk": "Вращающийся диск",
+    "Electron cloud": "Электронное облако",
+    "Scene:": "Сцена:",
+    "Particles:": "Частиц:",
+    "Size:": "Размер:",
+    "Temperature:": "Температура:",
+    "Seed:": "Зерно генератора:",
+    "Replace the current particles": "Заменить текущие частицы",
+    "The scene holds {:,} particles, the window keeps at most {:,}. Run it without "
+    "the window, e.g. python -m benchmarks profile --load {}":
+        "Сцена содержит {:,} частиц, окно хранит не более {:,}. Запустите её без окна, "
+        "например python -m benchmarks profile --load {}",
+    "At most {:,} particles, each one is kept with its trajectory. Larger scenes can be made "
+    "with particle_core.generators and run without the window.":
+        "Не более {:,} частиц, каждая хранится вместе с траекторией. Сцены больше можно создать "
+        "с помощью particle_core.generators и запускать без окна.",
+    "Generate": "Создать",
+}
+
+CATALOGUES = {
+    "en": {},
+    "ru": RUSSIAN,
+}
+
+
+class DictTranslator(QTranslator):
+    """Translator backed by one of the ``CATALOGUES``, for every context"""
+
+    def __init__(self, messages, parent=None):
+        super().__init__(parent)
+        self.messages = messages
+
+    def isEmpty(self):
+        return not self.messages
+
+    def translate(self, context, source_text, disambiguation=None, n=-1):
+        return self.messages.get(source_text, source_text)
+
+
+def install_translator(app, language):
+    """Install the translators of ``language`` into the application and return them"""
+    if language not in CATALOGUES:
+        raise ValueError(f"Unknown language: {language!r}")
+    translators = [DictTranslator(CATALOGUES[language], app)]
+    qt_translator = QTranslator(app)
+    # Buttons of the standard Qt dialogs (color and file choosers)
+    if qt_translator.load(QLocale(language), "qtbase", "_",
+                          QLibraryInfo.location(QLibraryInfo.TranslationsPath)):
+        translators.append(qt_translator)
+    for translator in translators:
+        app.installTranslator(translator)
+    return translators
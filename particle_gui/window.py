@@ -0,0 +1,1734 @@
+"""Main window of the particle simulator, shared by the English and Russian front ends.
+
+Every user-visible string goes through ``self.tr`` and is translated by the
+translator the launcher installs (see :mod:`particle_gui.translations`).
+Visualization types are kept as the untranslated ``VIZ_TYPES`` names.
+
+matplotlib, the plot canvas, the dialogs and the real-world time panel are
+only created when first used, so the window appears before any of them
+is built; ``startup`` times the phases up to the first shown window.
+"""
+import itertools
+import json
+import math
+import os
+import subprocess
+import time
+
+import numpy as np
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QPushButton, QHBoxLayout,
+    QLineEdit, QLabel, QTableView, QCheckBox, QGridLayout, QColorDialog,
+    QFileDialog, QRadioButton, QSpinBox, QComboBox, QGroupBox,
+    QAction, QMainWindow, QDialog, QSplitter, QScrollArea,
+    QProgressBar, QMessageBox, QSizePolicy, QAbstractItemView, QHeaderView
+)
+from PyQt5.QtCore import Qt, QThread, QTimer
+
+from particle_core import (
+    CheckpointWriter, DensityAccumulator, EnergyRecorder, EnergyWatchdog, Particle, Simulation,
+    SimulationState, PhaseTimers, RunProfiler, TrajectoryStore, available_integrators, group_layers,
+    integrator_label, load_checkpoint, load_integrator_plugins, load_scene_columns, open_trajectory,
+    particles_from_columns, save_scene
+)
+from particle_core.plotting import DecimatedLines, IncrementalLines
+from particle_core.raster import RASTER_SHADINGS, TrajectoryRaster
+from particle_core.scheduler import FrameScheduler
+from particle_core.worker import SimulationWorker
+
+from .models import FILTER_COLUMNS, ParticleTableModel
+from .panels import LazyPanel
+
+SETTINGS_FILE = "settings.json"
+# Number of steps integrated per call into the core between trajectory updates
+STEP_CHUNK = 1000
+# Frames drawn before a real-time run that stops after visualization is cancelled
+STOP_AFTER_VIZ_FRAMES = 2
+# Steps between two energy drift checks of the watchdog
+WATCHDOG_INTERVAL = 100
+# Energy watchdog actions in the order of the drift action combo box
+DRIFT_ACTIONS = ["refine", "abort"]
+# Per-run timing reports of instrumented runs
+REPORTS_DIR = "run_reports"
+# Full-resolution trajectories of runs stored on disk
+TRAJECTORY_DIR = "trajectories"
+# Checkpoints of every run, one subdirectory per run
+CHECKPOINT_DIR = "checkpoints"
+# Numbers of the runs of this process, keep runs started within the same second apart
+RUN_NUMBERS = itertools.count(1)
+# Most line points and energy frames drawn from a stored run, which is read with a stride above them
+STORED_LINE_POINTS = 2000000
+STORED_ENERGY_FRAMES = 100000
+# Most positions binned into the density of a stored run
+STORED_DENSITY_POINTS = 50000000
+# Most segments rasterized into the trajectory raster of a stored run
+STORED_RASTER_SEGMENTS = 10000000
+# Smallest side of the trajectory raster in pixels, for a canvas squeezed by the layout
+MIN_RASTER_PIXELS = 100
+# Visualization types in the order of the type combo box
+VIZ_TYPES = [
+    "Trajectory Lines",
+    "Trajectory Density Raster",
+    "Density Heatmap",
+    "X-Axis Histogram",
+    "Y-Axis Histogram",
+    "Electric Energy Plot",
+    "Gravitational Energy Plot",
+    "Electric Difference Energy Plot",
+    "Gravitational Difference Energy Plot"
+]
+# Visualizations drawn from the recorded energies
+ENERGY_VIZ_TYPES = VIZ_TYPES[5:]
+# Density layer modes in the order of the layer combo box
+DENSITY_LAYER_MODES = ["first", "particle", "color", "charge"]
+# Legend labels and colors of the per charge sign density layers
+CHARGE_LAYERS = {
+    1: ("positive charge", "red"),
+    -1: ("negative charge", "blue"),
+    0: ("neutral", "gray")
+}
+
+
+class ParticleSimulator(QMainWindow):
+    def __init__(self, about_file=None, user_guide_file=None, startup=None):
+        super().__init__()
+        self.startup = startup or PhaseTimers()
+        self.startup_seconds = None
+        self.about_file = about_file
+        self.user_guide_file = user_guide_file
+        self.setWindowTitle(self.tr("Particle Simulator"))
+        self.resize(1600, 800)
+        self.particles = []
+        self.constants = {
+            "G": 1.0,
+            "k": 1.0,
+            "tneeded": 10.0,
+            "max_points": 1000,
+            "use_point_limits": False,
+            "grid_size_x": 100,
+            "grid_size_y": 100,
+            "target_fps": 25,
+            "max_time_ratio": 0.0,
+            "heatmap_extent": None,
+            "density_layers": "first",
+            "integrator_plugins": [],
+            "drift_tolerance": 0.0,
+            "drift_action": "refine",
+            "instrument_runs": False,
+            "store_trajectory": False,
+            "checkpoint_minutes": 0,
+            "raster_shading": "log"
+        }
+        with self.startup.phase("settings"):
+            self.load_settings()
+        with self.startup.phase("plugins"):
+            try:
+                load_integrator_plugins(self.constants["integrator_plugins"])
+            except ImportError as e:
+                print(self.tr("Error: could not load integrator plugin: {}").format(e))
+        self.integrator_name = None
+        self.simulation = None
+        self.sim_thread = None
+        self.sim_worker = None
+        self.viz_type = None
+        self.real_time = False
+        self.frames_left = None
+        self.density = None
+        self.raster = None
+        self.density_styles = None
+        # Persistent artists of the current plot, reused by live updates
+        self.live_viz_type = None
+        self.live_lines = None
+        self.decimated_lines = None
+        self.trajectory_lines = []
+        self.energy_lines = []
+        self.heatmap_image = None
+        self.raster_image = None
+        self.histogram_patches = []
+        self.energy = None
+        # Phase timers of the current run, None unless the run is instrumented
+        self.timers = None
+        self.profiler = None
+        # On-disk store of every step of the current run, None unless enabled
+        self.store = None
+        # Writes the periodic and requested checkpoints of the current run
+        self.checkpoints = None
+        # Stored run shown instead of the in-memory trajectories, see show_stored_run
+        self.stored_run = None
+        # Created with its figure on the first draw, see the canvas property
+        self._canvas = None
+        with self.startup.phase("build controls"):
+            self.initUI()
+
+    def initUI(self):
+        # Create central widget
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+
+        # Create menu bar
+        self.create_menu_bar()
+
+        # Main horizontal layout to split controls and graph
+        main_layout = QHBoxLayout(central_widget)
+
+        # Create a splitter for resizable sections
+        splitter = QSplitter(Qt.Horizontal)
+        main_layout.addWidget(splitter)
+
+        # Left side - Controls
+        left_widget = QWidget()
+        left_scroll = QScrollArea()
+        left_scroll.setWidgetResizable(True)
+        left_scroll.setWidget(left_widget)
+        left_layout = QVBoxLayout(left_widget)
+
+        # Right side - Graph and visualization controls
+        right_widget = QWidget()
+        right_layout = QVBoxLayout(right_widget)
+
+        # Add widgets to splitter
+        splitter.addWidget(left_scroll)
+        splitter.addWidget(right_widget)
+
+        # Set initial sizes (controls take about 40%, graph 60%)
+        splitter.setSizes([400, 600])
+
+        # ===== LEFT SIDE - CONTROLS =====
+
+        # Particle parameters
+        param_group = QGroupBox(self.tr("Particle Parameters"))
+        grid = QGridLayout()
+        labels = ["X", "Y", self.tr("Charge"), self.tr("Mass"), self.tr("Velocity"), self.tr("Angle"), "dt"]
+        self.inputs = [QLineEdit("0") for _ in labels]
+        for i, label in enumerate(labels):
+            grid.addWidget(QLabel(label), 0, i)
+            grid.addWidget(self.inputs[i], 1, i)
+        # Set default values for specific fields
+        self.inputs[3].setText("1")      # Mass = 1
+        self.inputs[4].setText("1")      # Velocity = 1
+        self.inputs[6].setText("0.0001") # dt = 0.0001
+        self.color_btn = QPushButton(self.tr("Choose Color"))
+        self.color_btn.clicked.connect(self.choose_color)
+        self.current_color = "blue"
+        grid.addWidget(self.color_btn, 1, len(labels))
+
+        self.ch_interact_check = QCheckBox(self.tr("Charge Interaction"))
+        self.mass_interact_check = QCheckBox(self.tr("Mass Interaction"))
+        self.ch_interact_check.setChecked(True)
+        self.mass_interact_check.setChecked(False)
+
+        grid.addWidget(self.ch_interact_check, 2, 0, 1, 3)
+        grid.addWidget(self.mass_interact_check, 2, 3, 1, 3)
+        param_group.setLayout(grid)
+        left_layout.addWidget(param_group)
+
+        # Constants
+        const_group = QGroupBox(self.tr("Simulation Constants"))
+        const_layout = QGridLayout()
+
+        const_layout.addWidget(QLabel("G:"), 0, 0)
+        self.g_input = QLineEdit(str(self.constants["G"]))
+        const_layout.addWidget(self.g_input, 0, 1)
+
+        const_layout.addWidget(QLabel("k:"), 0, 2)
+        self.k_input = QLineEdit(str(self.constants["k"]))
+        const_layout.addWidget(self.k_input, 0, 3)
+
+        const_layout.addWidget(QLabel(self.tr("Simulation time:")), 1, 0)
+        self.t_input = QLineEdit(str(self.constants["tneeded"]))
+        const_layout.addWidget(self.t_input, 1, 1)
+
+        # Add max points control
+        const_layout.addWidget(QLabel(self.tr("Max trajectory points:")), 1, 2)
+        self.max_points_input = QSpinBox()
+        self.max_points_input.setRange(10, 1000000)
+        self.max_points_input.setValue(self.constants["max_points"])
+        const_layout.addWidget(self.max_points_input, 1, 3)
+
+        self.use_limits_check = QCheckBox(self.tr("Use trajectory limits"))
+        self.use_limits_check.setChecked(self.constants["use_point_limits"])
+        const_layout.addWidget(self.use_limits_check, 2, 0, 1, 4)
+
+        # Add grid size controls for heatmap
+        const_layout.addWidget(QLabel(self.tr("Grid Size X:")), 3, 0)
+        self.grid_size_x_input = QSpinBox()
+        self.grid_size_x_input.setRange(10, 1000)
+        self.grid_size_x_input.setValue(self.constants["grid_size_x"])
+        const_layout.addWidget(self.grid_size_x_input, 3, 1)
+
+        const_layout.addWidget(QLabel(self.tr("Grid Size Y:")), 3, 2)
+        self.grid_size_y_input = QSpinBox()
+        self.grid_size_y_input.setRange(10, 1000)
+        self.grid_size_y_input.setValue(self.constants["grid_size_y"])
+        const_layout.addWidget(self.grid_size_y_input, 3, 3)
+
+        const_group.setLayout(const_layout)
+        left_layout.addWidget(const_group)
+
+        # Particle management buttons
+        self.btn_group = QGroupBox(self.tr("Particle Management"))
+        btn_layout = QGridLayout()
+
+        self.add_btn = QPushButton(self.tr("Add Particle"))
+        self.edit_btn = QPushButton(self.tr("Edit Particle"))
+        self.delete_btn = QPushButton(self.tr("Delete Particle"))
+        self.clear_btn = QPushButton(self.tr("Clear Particles"))
+        self.save_btn = QPushButton(self.tr("Save Particles"))
+        self.load_btn = QPushButton(self.tr("Load Particles"))
+        self.move_up_btn = QPushButton(self.tr("Move Up"))
+        self.move_down_btn = QPushButton(self.tr("Move Down"))
+
+        btn_layout.addWidget(self.add_btn, 0, 0)
+        btn_layout.addWidget(self.edit_btn, 0, 1)
+        btn_layout.addWidget(self.delete_btn, 0, 2)
+        btn_layout.addWidget(self.clear_btn, 0, 3)
+        btn_layout.addWidget(self.save_btn, 1, 0)
+        btn_layout.addWidget(self.load_btn, 1, 1)
+        btn_layout.addWidget(self.move_up_btn, 1, 2)
+        btn_layout.addWidget(self.move_down_btn, 1, 3)
+
+        self.btn_group.setLayout(btn_layout)
+        left_layout.addWidget(self.btn_group)
+
+        # Particle table, rows are formatted only while visible
+        list_group = QGroupBox(self.tr("Particles"))
+        list_layout = QVBoxLayout()
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel(self.tr("Filter:")))
+        self.filter_column_combo = QComboBox()
+        self.filter_column_combo.addItems([self.tr("Charge"), self.tr("Mass"), self.tr("Color")])
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText(self.tr("e.g. >0, 1836 or red"))
+        filter_layout.addWidget(self.filter_column_combo)
+        filter_layout.addWidget(self.filter_input)
+        list_layout.addLayout(filter_layout)
+        self.particle_model = ParticleTableModel(self.particles, self)
+        self.particle_view = QTableView()
+        self.particle_view.setModel(self.particle_model)
+        self.particle_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.particle_view.setSelectionMode(QAbstractItemView.SingleSelection)
+        # Starts in list order, a click on a header sorts by that column
+        self.particle_view.horizontalHeader().setSortIndicator(0, Qt.AscendingOrder)
+        self.particle_view.setSortingEnabled(True)
+        self.particle_view.verticalHeader().hide()
+        # Fixed row heights, so the view never measures rows it does not show
+        self.particle_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.particle_view.horizontalHeader().setStretchLastSection(True)
+        self.filter_column_combo.currentIndexChanged.connect(self.filter_particles)
+        self.filter_input.textChanged.connect(self.filter_particles)
+        list_layout.addWidget(self.particle_view)
+        list_group.setLayout(list_layout)
+        left_layout.addWidget(list_group)
+
+        # Real-world time conversion section, built when first expanded
+        self.real_world_panel = LazyPanel(self.tr("Real-world Time Conversion"),
+                                          self.build_real_world_panel)
+        left_layout.addWidget(self.real_world_panel)
+
+        # Add a stretch to push everything up
+        left_layout.addStretch()
+
+        # ===== RIGHT SIDE - GRAPH AND VISUALIZATION CONTROLS =====
+
+        # Visualization options
+        viz_group = QGroupBox(self.tr("Visualization Options"))
+        viz_layout = QVBoxLayout()
+
+        # Create sub-groups for better organization
+        sim_mode_group = QGroupBox(self.tr("Simulation Mode"))
+        sim_mode_layout = QHBoxLayout()
+        self.real_time_radio = QRadioButton(self.tr("Real-time Simulation"))
+        self.default_radio = QRadioButton(self.tr("Default Simulation"))
+        self.default_radio.setChecked(True)
+        sim_mode_layout.addWidget(self.real_time_radio)
+        sim_mode_layout.addWidget(self.default_radio)
+        sim_mode_group.setLayout(sim_mode_layout)
+        viz_layout.addWidget(sim_mode_group)
+
+        # Integration method group
+        method_group = QGroupBox(self.tr("Integration Method"))
+        method_layout = QHBoxLayout()
+        # One radio button per registered integrator
+        self.method_radios = {}
+        for name in available_integrators():
+            radio = QRadioButton(self.tr(integrator_label(name)))
+            self.method_radios[name] = radio
+            method_layout.addWidget(radio)
+        self.method_radios["verlet"].setChecked(True)  # Default to Verlet
+        method_group.setLayout(method_layout)
+        viz_layout.addWidget(method_group)
+
+        # Visualization type group
+        viz_type_group = QGroupBox(self.tr("Visualization Type"))
+        energy_settings_group = QGroupBox(self.tr("Energy Settings"))
+        energy_layout = QHBoxLayout()
+        energy_layout.addWidget(QLabel(self.tr("Target Energy:")))
+        self.target_energy_input = QLineEdit("-1.0")  # Default value
+        energy_layout.addWidget(self.target_energy_input)
+        # Live energy drift check, rolls back and refines dt or aborts the run
+        energy_layout.addWidget(QLabel(self.tr("Drift tolerance (0 - off):")))
+        self.drift_tolerance_input = QLineEdit(str(self.constants["drift_tolerance"]))
+        energy_layout.addWidget(self.drift_tolerance_input)
+        self.drift_action_combo = QComboBox()
+        self.drift_action_combo.addItems([self.tr("Refine dt"), self.tr("Abort")])
+        self.drift_action_combo.setCurrentIndex(DRIFT_ACTIONS.index(self.constants["drift_action"]))
+        energy_layout.addWidget(self.drift_action_combo)
+        energy_settings_group.setLayout(energy_layout)
+        viz_layout.addWidget(energy_settings_group)
+        viz_type_layout = QVBoxLayout()
+
+        # Горизонтальный layout для комбобокса
+        combo_layout = QHBoxLayout()
+        combo_layout.addWidget(QLabel(self.tr("Type:")))
+        self.viz_type_combo = QComboBox()
+        self.viz_type_combo.addItems([self.tr(viz_type) for viz_type in VIZ_TYPES])
+        combo_layout.addWidget(self.viz_type_combo)
+        viz_type_layout.addLayout(combo_layout)
+
+        # Which particles the heatmap and histograms count, and how they are split
+        layers_layout = QHBoxLayout()
+        layers_layout.addWidget(QLabel(self.tr("Density layers:")))
+        self.density_layers_combo = QComboBox()
+        self.density_layers_combo.addItems([
+            self.tr("Particle 1"),
+            self.tr("Per particle"),
+            self.tr("Per color"),
+            self.tr("Per charge sign")
+        ])
+        self.density_layers_combo.setCurrentIndex(DENSITY_LAYER_MODES.index(self.constants["density_layers"]))
+        layers_layout.addWidget(self.density_layers_combo)
+        viz_type_layout.addLayout(layers_layout)
+
+        # Color mapping of the trajectory raster
+        shading_layout = QHBoxLayout()
+        shading_layout.addWidget(QLabel(self.tr("Raster color mapping:")))
+        self.raster_shading_combo = QComboBox()
+        self.raster_shading_combo.addItems([self.tr("Logarithmic"), self.tr("Histogram equalized")])
+        self.raster_shading_combo.setCurrentIndex(RASTER_SHADINGS.index(self.constants["raster_shading"]))
+        shading_layout.addWidget(self.raster_shading_combo)
+        viz_type_layout.addLayout(shading_layout)
+
+        # Добавляем чекбокс для остановки итераций
+        self.stop_after_viz_check = QCheckBox(self.tr("Stop iterations for heatmap and histograms"))
+        self.stop_after_viz_check.setChecked(True)  # По умолчанию активен
+        viz_type_layout.addWidget(self.stop_after_viz_check)
+
+        viz_type_group.setLayout(viz_type_layout)
+        viz_layout.addWidget(viz_type_group)
+
+        # Run simulation button
+        self.sim_btn = QPushButton(self.tr("Run Simulation"))
+        viz_layout.addWidget(self.sim_btn)
+
+        viz_group.setLayout(viz_layout)
+        right_layout.addWidget(viz_group)
+
+        # Place of the plot canvas until something is drawn
+        self.canvas_placeholder = QWidget()
+        self.canvas_placeholder.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        right_layout.addWidget(self.canvas_placeholder)
+
+        # Add Reset Simulation button
+        self.reset_btn = QPushButton(self.tr("Reset Simulation"))
+        self.reset_btn.clicked.connect(self.reset_simulation)
+        right_layout.addWidget(self.reset_btn)
+
+        # Adding Pause and Periodicity SpinBox
+        self.pause_btn = QPushButton(self.tr("Pause"))
+        self.fps_label = QLabel(self.tr("Target FPS:"))
+        self.fps_spin = QSpinBox()
+        self.fps_spin.setRange(1, 120)
+        self.fps_spin.setValue(int(self.constants["target_fps"]))
+        self.time_ratio_label = QLabel(self.tr("Max sim/wall time ratio (0 - unlimited):"))
+        self.time_ratio_input = QLineEdit(str(self.constants["max_time_ratio"]))
+
+        pause_layout = QHBoxLayout()
+        pause_layout.addWidget(self.pause_btn)
+        pause_layout.addWidget(self.fps_label)
+        pause_layout.addWidget(self.fps_spin)
+        pause_layout.addWidget(self.time_ratio_label)
+        pause_layout.addWidget(self.time_ratio_input)
+        right_layout.addLayout(pause_layout)
+
+        # Debugging controls: advance a paused run by one or N steps
+        step_layout = QHBoxLayout()
+        self.step_btn = QPushButton(self.tr("Step"))
+        self.run_steps_btn = QPushButton(self.tr("Run N Steps"))
+        self.run_steps_spin = QSpinBox()
+        self.run_steps_spin.setRange(1, 1000000)
+        self.run_steps_spin.setValue(100)
+        self.step_btn.setEnabled(False)
+        self.run_steps_btn.setEnabled(False)
+        step_layout.addWidget(self.step_btn)
+        step_layout.addWidget(self.run_steps_btn)
+        step_layout.addWidget(self.run_steps_spin)
+        right_layout.addLayout(step_layout)
+
+        # Run progress, integration throughput and cancellation
+        progress_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setValue(0)
+        self.steps_rate_label = QLabel(self.tr("Steps/s: -"))
+        self.fps_rate_label = QLabel("FPS: -")
+        self.cancel_btn = QPushButton(self.tr("Cancel"))
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_simulation)
+        progress_layout.addWidget(self.progress_bar)
+        progress_layout.addWidget(self.steps_rate_label)
+        progress_layout.addWidget(self.fps_rate_label)
+        progress_layout.addWidget(self.cancel_btn)
+        right_layout.addLayout(progress_layout)
+
+        self.instrument_check = QCheckBox(self.tr("Instrument runs (status bar and report)"))
+        self.instrument_check.setChecked(self.constants["instrument_runs"])
+        right_layout.addWidget(self.instrument_check)
+        self.profile_check = QCheckBox(self.tr("Profile this run (cProfile and tracemalloc)"))
+        right_layout.addWidget(self.profile_check)
+        self.store_check = QCheckBox(self.tr("Store every step on disk (independent of trajectory limits)"))
+        self.store_check.setChecked(self.constants["store_trajectory"])
+        right_layout.addWidget(self.store_check)
+        checkpoint_layout = QHBoxLayout()
+        checkpoint_layout.addWidget(QLabel(self.tr("Checkpoint every (min, 0 - off):")))
+        self.checkpoint_spin = QSpinBox()
+        self.checkpoint_spin.setRange(0, 1440)
+        self.checkpoint_spin.setValue(self.constants["checkpoint_minutes"])
+        checkpoint_layout.addWidget(self.checkpoint_spin)
+        right_layout.addLayout(checkpoint_layout)
+
+        self.add_btn.clicked.connect(self.add_particle)
+        self.edit_btn.clicked.connect(self.edit_particle)
+        self.delete_btn.clicked.connect(self.delete_particle)
+        self.clear_btn.clicked.connect(self.clear_particles)
+        self.sim_btn.clicked.connect(self.run_simulation)
+        self.save_btn.clicked.connect(self.save_particles_to_file)
+        self.load_btn.clicked.connect(self.load_particles_from_file)
+        self.pause_btn.clicked.connect(self.toggle_pause)
+        self.step_btn.clicked.connect(self.step_simulation)
+        self.run_steps_btn.clicked.connect(self.run_simulation_steps)
+        self.move_up_btn.clicked.connect(self.move_particle_up)
+        self.move_down_btn.clicked.connect(self.move_particle_down)
+
+        # The default scene is added once the window is up
+        QTimer.singleShot(0, self.add_default_particles)
+
+        # Variables for pausing control
+        self.is_paused = False
+        self.edit_btn.clicked.connect(self.edit_particle)
+        self.delete_btn.clicked.connect(self.delete_particle)  # Add this line
+
+    def build_real_world_panel(self):
+        real_world_group = QWidget()
+        real_world_layout = QGridLayout()
+
+        # Input fields for real-world values
+        real_world_layout.addWidget(QLabel(self.tr("Real mass 1 (kg):")), 0, 0)
+        self.real_mass1_input = QLineEdit("9.1e-31")  # Default: electron mass
+        real_world_layout.addWidget(self.real_mass1_input, 0, 1)
+
+        real_world_layout.addWidget(QLabel(self.tr("Real mass 2 (kg):")), 1, 0)
+        self.real_mass2_input = QLineEdit("1.67e-27")  # Default: proton mass
+        real_world_layout.addWidget(self.real_mass2_input, 1, 1)
+
+        real_world_layout.addWidget(QLabel(self.tr("Real distance (m):")), 2, 0)
+        self.real_distance_input = QLineEdit("5.3e-11")  # Default: Bohr radius
+        real_world_layout.addWidget(self.real_distance_input, 2, 1)
+
+        real_world_layout.addWidget(QLabel(self.tr("Real charge 1 (C):")), 3, 0)
+        self.real_charge1_input = QLineEdit("1.6e-19")  # Default: elementary charge
+        real_world_layout.addWidget(self.real_charge1_input, 3, 1)
+
+        real_world_layout.addWidget(QLabel(self.tr("Real charge 2 (C):")), 4, 0)
+        self.real_charge2_input = QLineEdit("1.6e-19")  # Default: elementary charge
+        real_world_layout.addWidget(self.real_charge2_input, 4, 1)
+
+        # Output fields for real-world time
+        real_world_layout.addWidget(QLabel(self.tr("Electrostatic time (s):")), 5, 0)
+        self.electrostatic_time_output = QLabel("0.0")
+        real_world_layout.addWidget(self.electrostatic_time_output, 5, 1)
+
+        real_world_layout.addWidget(QLabel(self.tr("Gravitational time (s):")), 6, 0)
+        self.gravitational_time_output = QLabel("0.0")
+        real_world_layout.addWidget(self.gravitational_time_output, 6, 1)
+
+        # Calculate button
+        self.calc_real_time_btn = QPushButton(self.tr("Calculate Real Times"))
+        self.calc_real_time_btn.clicked.connect(self.calculate_real_times)
+        real_world_layout.addWidget(self.calc_real_time_btn, 7, 0, 1, 2)
+
+        real_world_group.setLayout(real_world_layout)
+        return real_world_group
+
+    @property
+    def canvas(self):
+        """The plot canvas, created with its figure on first use"""
+        if self._canvas is None:
+            # An explicit Figure keeps pyplot's global figure manager out of the window
+            from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+            from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT
+            from matplotlib.figure import Figure
+            self._canvas = FigureCanvas(Figure())
+            layout = self.canvas_placeholder.parentWidget().layout()
+            layout.insertWidget(layout.indexOf(self.canvas_placeholder), NavigationToolbar2QT(self._canvas, self))
+            layout.replaceWidget(self.canvas_placeholder, self._canvas)
+            self.canvas_placeholder.deleteLater()
+            self.canvas_placeholder = None
+        return self._canvas
+
+    def clear_canvas(self):
+        """Blank the plot, unless nothing was drawn yet"""
+        if self._canvas is not None:
+            self._canvas.figure.clear()
+            self._canvas.draw()
+
+    def selected_particle(self):
+        """Index in ``self.particles`` of the particle selected in the table, -1 if none"""
+        rows = self.particle_view.selectionModel().selectedRows()
+        if not rows:
+            return -1
+        return self.particle_model.particle_index(rows[0].row())
+
+    def select_particle(self, index):
+        """Select the row of ``self.particles[index]`` in the table"""
+        row = self.particle_model.row_of(index)
+        if row >= 0:
+            self.particle_view.selectRow(row)
+
+    def filter_particles(self):
+        self.particle_model.set_value_filter(FILTER_COLUMNS[self.filter_column_combo.currentIndex()],
+                                             self.filter_input.text())
+
+    def delete_particle(self):
+        # Get the index of the selected particle
+        selected_index = self.selected_particle()
+        if selected_index < 0 or selected_index >= len(self.particles):
+            return  # No particle selected
+
+        # Remove the particle from the list and its row from the table
+        self.close_stored_run()
+        self.particle_model.remove_particle(selected_index)
+
+        # Clear the canvas and redraw if needed
+        # self.canvas.figure.clear()
+        # self.canvas.draw()
+    def move_particle_up(self):
+        """Move the selected particle up in the list"""
+        # Get the selected particle index
+        selected_index = self.selected_particle()
+
+        # Check if a particle is selected and it's not already at the top
+        if selected_index <= 0 or selected_index >= len(self.particles):
+            return
+
+        # Swap the particle with the one above it
+        self.close_stored_run()
+        self.particle_model.move_particle(selected_index, selected_index-1)
+
+        # Keep the same particle selected
+        self.select_particle(selected_index-1)
+
+    def move_particle_down(self):
+        """Move the selected particle down in the list"""
+        # Get the selected particle index
+        selected_index = self.selected_particle()
+
+        # Check if a particle is selected and it's not already at the bottom
+        if selected_index < 0 or selected_index >= len(self.particles) - 1:
+            return
+
+        # Swap the particle with the one below it
+        self.close_stored_run()
+        self.particle_model.move_particle(selected_index, selected_index+1)
+
+        # Keep the same particle selected
+        self.select_particle(selected_index+1)
+
+# Then add the edit_particle method to the ParticleSimulator class:
+    def edit_particle(self):
+        # Get the index of the selected particle
+        selected_index = self.selected_particle()
+        if selected_index < 0 or selected_index >= len(self.particles):
+            return  # No particle selected
+
+        # Get the particle to edit
+        particle = self.particles[selected_index]
+
+        # Create and show the edit dialog
+        from .dialogs import ParticleEditDialog
+        dialog = ParticleEditDialog(particle, self)
+        result = dialog.exec_()
+
+        # If the dialog was accepted (user clicked Save), update its row
+        if result == QDialog.Accepted:
+            self.close_stored_run()
+            self.particle_model.particle_changed(selected_index)
+
+            # Clear the canvas and redraw if needed
+            self.clear_canvas()
+
+
+    def choose_color(self):
+        color = QColorDialog.getColor()
+        if color.isValid():
+            self.current_color = color.name()
+
+    def add_particle(self):
+        try:
+            values = [float(inp.text()) for inp in self.inputs]
+            x, y, q, m, v, angle, dt = values
+            color = self.current_color
+            max_points = self.max_points_input.value()
+            p = Particle(x, y, q, m, v, angle, dt,
+                         self.ch_interact_check.isChecked(),
+                         self.mass_interact_check.isChecked(),
+                         color, max_points)
+            self.close_stored_run()
+            self.particle_model.append_particles([p])
+        except ValueError:
+            print(self.tr("Error: enter valid values."))
+
+    def clear_particles(self):
+        self.particles = []
+        self.density = None
+        self.raster = None
+        self.density_styles = None
+        self.energy = None
+        self.update_particle_list()
+        self.clear_canvas()
+
+    def update_particle_list(self):
+        """Show a replaced ``self.particles`` in the table"""
+        # Changed particles no longer match a stored run being shown
+        self.close_stored_run()
+        self.particle_model.set_particles(self.particles)
+
+    def run_simulation(self):
+        if not self.particles:
+            return
+        # A shown stored run is continued from its last step
+        self.close_stored_run()
+        if not self.read_run_settings():
+            return
+        h = self.particles[0].dt
+        steps = int(self.constants["tneeded"] / h) - 2
+        self.simulation = Simulation.from_particles(self.particles, self.constants, self.selected_integrator())
+        self.start_run(steps)
+
+    def read_run_settings(self):
+        """Take the run settings from the controls and save them, False if a value is invalid"""
+        try:
+            self.constants["G"] = float(self.g_input.text())
+            self.constants["k"] = float(self.k_input.text())
+            self.constants["tneeded"] = float(self.t_input.text())
+            self.constants["max_points"] = self.max_points_input.value()
+            self.constants["use_point_limits"] = self.use_limits_check.isChecked()
+            self.constants["grid_size_x"] = self.grid_size_x_input.value()
+            self.constants["grid_size_y"] = self.grid_size_y_input.value()
+            self.constants["target_fps"] = self.fps_spin.value()
+            self.constants["max_time_ratio"] = float(self.time_ratio_input.text())
+            self.constants["density_layers"] = DENSITY_LAYER_MODES[self.density_layers_combo.currentIndex()]
+            self.constants["drift_tolerance"] = float(self.drift_tolerance_input.text())
+            self.constants["drift_action"] = DRIFT_ACTIONS[self.drift_action_combo.currentIndex()]
+            self.constants["instrument_runs"] = self.instrument_check.isChecked()
+            self.constants["store_trajectory"] = self.store_check.isChecked()
+            self.constants["checkpoint_minutes"] = self.checkpoint_spin.value()
+            self.constants["raster_shading"] = RASTER_SHADINGS[self.raster_shading_combo.currentIndex()]
+        except ValueError:
+            print(self.tr("Error: check the values of G, k, the simulation time and the time ratio."))
+            return False
+
+        # Update max_points for all particles
+        max_points = self.constants["max_points"]
+        for p in self.particles:
+            p.max_points = max_points
+
+        self.save_settings()
+        return True
+
+    def start_run(self, steps):
+        """Attach the recorders of a run to ``self.simulation`` and integrate ``steps`` steps"""
+        self.set_paused(False)
+        h = self.particles[0].dt
+        # The integration method was resolved once when the simulation was created
+        self.integrator_name = self.simulation.method
+        # Names the store, checkpoints and reports of this run
+        self.run_name = time.strftime("run_%Y%m%d_%H%M%S_") + str(next(RUN_NUMBERS))
+        self.timers = None
+        if self.constants["instrument_runs"]:
+            self.timers = self.simulation.set_timers(PhaseTimers())
+        self.profiler = None
+        if self.profile_check.isChecked():
+            # Allocations are traced from here on, the worker thread is profiled
+            self.profiler = RunProfiler(REPORTS_DIR, self.run_name)
+            self.profiler.start()
+        # The heatmap follows every integrated step, seeded with the stored trajectory
+        self.density, self.density_styles = self.history_density()
+        self.simulation.add_recorder(self.density)
+        self.store = None
+        if self.constants["store_trajectory"]:
+            path = os.path.join(TRAJECTORY_DIR, self.run_name)
+            self.store = self.simulation.add_recorder(TrajectoryStore.from_state(
+                path, self.simulation.state, {"colors": [p.color for p in self.particles]}))
+        # A resumed run keeps the watchdog of its checkpoint
+        if self.constants["drift_tolerance"] > 0 and self.simulation.watchdog is None:
+            self.simulation.set_watchdog(EnergyWatchdog(
+                self.constants["drift_tolerance"], WATCHDOG_INTERVAL,
+                action=self.constants["drift_action"]))
+
+        # Store the current visualization type
+        self.viz_type = VIZ_TYPES[self.viz_type_combo.currentIndex()]
+        stop_after_viz = self.stop_after_viz_check.isChecked()
+        # Energies are recorded from the force evaluations of the run itself when they are
+        # plotted, other views compute them from the trajectory if they are switched to later
+        self.energy = None
+        if self.viz_type in ENERGY_VIZ_TYPES:
+            self.energy = self.simulation.add_recorder(self.history_energy())
+        # The raster follows every integrated segment, seeded with the stored trajectory
+        self.raster = None
+        if self.viz_type == "Trajectory Density Raster":
+            self.raster = self.simulation.add_recorder(self.history_raster())
+
+        # Проверяем, нужно ли останавливать итерации после визуализации
+        should_stop_after_viz = stop_after_viz and self.viz_type not in ("Trajectory Lines",
+                                                                         "Trajectory Density Raster")
+
+        self.real_time = self.real_time_radio.isChecked()
+        if self.real_time:
+            # Real-time simulation mode: steps per frame follow the frame budget
+            ratio = self.constants["max_time_ratio"]
+            scheduler = FrameScheduler(h, self.constants["target_fps"],
+                                       ratio if ratio > 0 else None)
+            self.frames_left = STOP_AFTER_VIZ_FRAMES if should_stop_after_viz else None
+        else:
+            # Default simulation mode: only the final state is drawn
+            scheduler = None
+            if should_stop_after_viz:
+                # Выполняем только одну итерацию
+                steps = 1
+
+        state = self.simulation.state
+        self.checkpoints = CheckpointWriter(
+            os.path.join(CHECKPOINT_DIR, self.run_name),
+            self.constants["checkpoint_minutes"] * 60,
+            {"colors": [p.color for p in self.particles], "end_step": state.step + steps},
+            on_saved=lambda path: print(self.tr("Checkpoint written to {}").format(path)))
+        self.start_simulation_worker(steps, STEP_CHUNK, scheduler)
+
+    def start_simulation_worker(self, steps, chunk, scheduler=None):
+        """Run the integration in a background thread that publishes snapshots"""
+        self.set_running(True)
+        self.progress_bar.setRange(0, max(steps, 1))
+        self.progress_bar.setValue(0)
+        self.live_viz_type = None
+
+        self.sim_thread = QThread(self)
+        self.sim_worker = SimulationWorker(self.simulation, steps, chunk, scheduler=scheduler,
+                                           profiler=self.profiler, checkpoints=self.checkpoints)
+        self.sim_worker.moveToThread(self.sim_thread)
+        self.sim_thread.started.connect(self.sim_worker.run)
+        self.sim_worker.snapshot.connect(self.on_simulation_snapshot)
+        self.sim_worker.failed.connect(self.on_simulation_failed)
+        self.sim_worker.finished.connect(self.on_simulation_finished)
+        self.sim_thread.start()
+
+    def on_simulation_snapshot(self, snapshot):
+        """Append the steps integrated since the last snapshot to the trajectories"""
+        use_limits = self.constants["use_point_limits"]
+        # A run stored on disk keeps only a tail in memory, its history is read back from the store
+        stored = self.store is not None
+        positions = snapshot.positions
+        velocities = snapshot.velocities
+        if len(positions) == 0:
+            return
+        start = self.phase_start()
+        for i, p in enumerate(self.particles):
+            p.add_points(positions[:, i, 0], positions[:, i, 1], use_limits or stored)
+            p.add_vs(velocities[:, i, 0], velocities[:, i, 1], stored)
+            p.vx, p.vy = velocities[-1, i].tolist()
+        self.phase_end("append", start)
+        if self.timers is not None:
+            self.show_run_status()
+
+        self.progress_bar.setValue(snapshot.step)
+        self.steps_rate_label.setText(self.tr("Steps/s: {:,.0f}").format(snapshot.steps_per_second))
+
+        if snapshot.fps is not None:
+            # Every snapshot of a paced run is one frame, report its drawing cost
+            self.fps_rate_label.setText(f"FPS: {snapshot.fps:.1f}")
+            start = time.perf_counter()
+            self.update_visualization(self.viz_type)
+            self.sim_worker.frame_rendered(time.perf_counter() - start)
+            if self.frames_left is not None:
+                self.frames_left -= 1
+                if self.frames_left <= 0:
+                    self.sim_worker.cancel()
+        elif self.is_paused:
+            # A paused run only moves on single-step requests, show each of them
+            self.update_visualization(self.viz_type)
+
+    def on_simulation_failed(self, message):
+        print(self.tr("Error: simulation failed: {}").format(message))
+
+    def on_simulation_finished(self, cancelled):
+        self.sim_thread.quit()
+        self.sim_thread.wait()
+        self.sim_worker.deleteLater()
+        self.sim_thread.deleteLater()
+        self.sim_worker = None
+        self.sim_thread = None
+        self.set_running(False)
+        self.frames_left = None
+
+        watchdog = self.simulation.watchdog
+        if watchdog is not None and watchdog.refined_segments:
+            print(self.tr("Energy watchdog: dt was refined in {} segments, max drift {:.3g}").format(
+                watchdog.refined_segments, watchdog.max_drift))
+
+        if self.store is not None:
+            self.store.close()
+            print(self.tr("Trajectory of {} steps written to {}").format(self.store.steps, self.store.path))
+            # The particles only kept the last points, the plots read the whole run from disk
+            self.stored_run = open_trajectory(self.store.path)
+            self.store = None
+
+        self.draw_visualization(self.viz_type)
+        # The table shows the current positions
+        self.particle_model.refresh()
+        if self.timers is not None:
+            self.show_run_status()
+            self.save_run_report()
+        if self.profiler is not None:
+            pstats_path, summary_path = self.profiler.stop()
+            self.profiler = None
+            print(self.tr("Profile written to {}, allocation summary to {}").format(pstats_path, summary_path))
+        self.checkpoints.close()
+        self.checkpoints = None
+
+        # After the simulation completes, update the real-time calculations
+        if self.real_world_panel.content is not None:
+            self.calculate_real_times()
+
+    def startup_finished(self):
+        """Record the time to the first shown window, shown in the status bar of instrumented runs"""
+        self.startup_seconds = self.startup.elapsed()
+        if self.constants["instrument_runs"]:
+            self.statusBar().showMessage(self.tr("Window shown in {:.0f} ms | {}").format(
+                self.startup_seconds * 1e3, self.startup.summary()))
+
+    def startup_report(self):
+        report = self.startup.report(time_to_first_window=self.startup_seconds)
+        # Startup integrates nothing
+        del report["steps"], report["steps_per_second"]
+        return report
+
+    def phase_start(self):
+        """Start time of a GUI phase of an instrumented run, None otherwise"""
+        return time.perf_counter() if self.timers is not None else None
+
+    def phase_end(self, name, start):
+        if start is not None:
+            self.timers.add(name, time.perf_counter() - start)
+
+    def show_run_status(self):
+        report = self.simulation.timing_report()
+        per_step = report["force_evaluations_per_step"]
+        per_step = f"{per_step:.1f}" if per_step is not None else "-"
+        memory = report["memory_bytes"]
+        memory = f"{memory / 2**20:.0f} MB" if memory is not None else "-"
+        self.statusBar().showMessage(
+            self.tr("Steps/s: {:,.0f} | {} | force evals/step: {} | memory: {}").format(
+                report['steps_per_second'], self.timers.summary(), per_step, memory))
+
+    def save_run_report(self):
+        os.makedirs(REPORTS_DIR, exist_ok=True)
+        path = os.path.join(REPORTS_DIR, self.run_name + ".json")
+        with open(path, "w") as f:
+            json.dump(self.simulation.timing_report(), f, indent=2)
+        print(self.tr("Run report written to {}").format(path))
+
+    def cancel_simulation(self):
+        if self.sim_worker is not None:
+            self.sim_worker.cancel()
+
+    def set_running(self, running):
+        self.sim_btn.setEnabled(not running)
+        self.reset_btn.setEnabled(not running)
+        self.btn_group.setEnabled(not running)
+        self.cancel_btn.setEnabled(running)
+        self.step_btn.setEnabled(running)
+        self.run_steps_btn.setEnabled(running)
+        self.save_checkpoint_action.setEnabled(running)
+        self.resume_checkpoint_action.setEnabled(not running)
+        if not running:
+            self.set_paused(False)
+
+    def closeEvent(self, event):
+        # Stop a running simulation before the window goes away
+        if self.sim_thread is not None:
+            self.sim_worker.cancel()
+            self.sim_thread.quit()
+            self.sim_thread.wait()
+        if self.store is not None:
+            # Keep the steps integrated so far
+            self.store.close()
+        if self.checkpoints is not None:
+            self.checkpoints.close()
+        super().closeEvent(event)
+
+    def draw_visualization(self, viz_type):
+        start = self.phase_start()
+        # A full redraw drops the persistent artists of the previous plot
+        if self.live_lines is not None:
+            self.live_lines.disconnect()
+            self.live_lines = None
+        if self.decimated_lines is not None:
+            self.decimated_lines.disconnect()
+            self.decimated_lines = None
+        self.live_viz_type = None
+        self.trajectory_lines = []
+        self.energy_lines = []
+        self.heatmap_image = None
+        self.raster_image = None
+        self.histogram_patches = []
+        self.canvas.figure.clear()
+
+        if viz_type == "Trajectory Lines":
+            self.draw_trajectory_lines()
+        elif viz_type == "Trajectory Density Raster":
+            self.draw_trajectory_raster()
+        elif viz_type == "Density Heatmap":
+            self.draw_density_heatmap()
+        elif viz_type == "X-Axis Histogram":
+            self.draw_x_histogram()
+        elif viz_type == "Y-Axis Histogram":
+            self.draw_y_histogram()
+        elif viz_type == "Electric Energy Plot":
+            self.draw_electric_energy_plot()
+        elif viz_type == "Gravitational Energy Plot":
+            self.draw_G_energy_plot()
+        elif viz_type == "Electric Difference Energy Plot":
+            self.draw_electric_diff_energy_plot()
+        elif viz_type == "Gravitational Difference Energy Plot":
+            self.draw_G_diff_energy_plot()
+        self.canvas.draw()
+        self.phase_end("draw " + viz_type, start)
+
+    def history_energy(self):
+        """Energy recorder filled with the stored trajectories (without the initial point)"""
+        if self.stored_run is not None:
+            run = self.stored_run
+            energy = EnergyRecorder.from_state(run.state(0))
+            has_potentials = run.potentials is not None
+            for block in run.blocks(1, stride=self.stored_energy_stride(), potentials=has_potentials):
+                energy.record(*block)
+            return energy
+        state = SimulationState.from_particles(self.particles, self.constants)
+        energy = EnergyRecorder.from_state(state)
+        steps = min(len(p.x_mass) for p in self.particles)
+        positions = np.empty((steps, len(self.particles), 2))
+        velocities = np.empty((steps, len(self.particles), 2))
+        for i, p in enumerate(self.particles):
+            positions[:, i, 0] = p.x_mass[-steps:]
+            positions[:, i, 1] = p.y_mass[-steps:]
+            velocities[:, i, 0] = p.vx_history[-steps:]
+            velocities[:, i, 1] = p.vy_history[-steps:]
+        energy.record(positions[1:], velocities[1:])
+        return energy
+
+    def energy_series(self, kind):
+        """Kinetic, potential and total energy arrays for every recorded step"""
+        energy = self.energy if self.energy is not None else self.history_energy()
+        kinetic, electric, gravitational, _, _ = energy.snapshot()
+        potential = electric if kind == "el" else gravitational
+        return kinetic, potential, kinetic + potential
+
+    def energy_difference(self, kind):
+        """Times and deviation of the total energy from the target energy"""
+        _, _, E_list = self.energy_series(kind)
+        try:
+            target_energy = float(self.target_energy_input.text())
+        except ValueError:
+            target_energy= -1.0
+        diff = np.asarray(E_list) - target_energy
+        if self.stored_run is not None and self.energy is None:
+            # Energies computed from the stored run, with its stride
+            return self.stored_run.times(1, stride=self.stored_energy_stride())[:len(diff)], diff
+        return np.arange(len(diff)) * self.particles[0].dt, diff
+
+    def draw_energy_plot(self, kind):
+        K_list, P_list, E_list = self.energy_series(kind)
+        ax = self.canvas.figure.add_subplot(111)
+        self.energy_lines = [
+            ax.plot([], [], label=self.tr('Kinetic Energy'))[0],
+            ax.plot([], [], label=self.tr('Potential Energy'))[0],
+            ax.plot([], [], label=self.tr('Total Energy'))[0],
+        ]
+        index = np.arange(len(E_list))
+        self.decimated_lines = DecimatedLines(self.canvas, self.energy_lines,
+                                              [(index, K_list), (index, P_list), (index, E_list)])
+        ax.legend()
+        ax.grid(True)
+        ax.set_xlabel(self.tr("Time"))
+        ax.set_ylabel(self.tr("Energy"))
+        ax.set_title(self.tr("Change of Energy in time"))
+
+    def draw_energy_diff_plot(self, kind):
+        times, diff = self.energy_difference(kind)
+        ax = self.canvas.figure.add_subplot(111)
+        self.energy_lines = [ax.plot([], [])[0]]
+        self.decimated_lines = DecimatedLines(self.canvas, self.energy_lines, [(times, diff)])
+        ax.axhline(y=0, color='r', linestyle='-')
+        ax.grid(True)
+        ax.set_xlabel(self.tr("Time"))
+        ax.set_ylabel(self.tr("Energy"))
+        ax.set_title(self.tr("Difference of Energy in time"))
+
+    def draw_electric_energy_plot(self):
+        self.draw_energy_plot("el")
+
+    def draw_electric_diff_energy_plot(self):
+        self.draw_energy_diff_plot("el")
+
+    def draw_G_energy_plot(self):
+        self.draw_energy_plot("G")
+
+    def draw_G_diff_energy_plot(self):
+        self.draw_energy_diff_plot("G")
+
+    def draw_trajectory_lines(self):
+        ax = self.canvas.figure.add_subplot(111)
+
+        # Trajectories with per particle legend labels, decimated to the resolution of the axes
+        self.trajectory_lines = []
+        for i, p in enumerate(self.particles):
+            particle_num = i + 1  # Numbered from 1
+            label = self.tr("p{}: Q={}, m={}").format(particle_num, p.charge, p.mass)
+            line, = ax.plot([], [], color=p.color, label=label)
+            self.trajectory_lines.append(line)
+        if self.trajectory_lines:
+            self.decimated_lines = DecimatedLines(self.canvas, self.trajectory_lines, self.trajectory_series(),
+                                                  paths=True)
+
+        # Улучшенная легенда - закреплена в правом верхнем углу с полупрозрачным фоном
+        legend = ax.legend(
+            loc='upper right',     # Положение в правом верхнем углу
+            framealpha=0.3,        # Полупрозрачный фон (30% непрозрачности)
+            fancybox=True,         # Скругленные углы
+            shadow=False,          # Без тени
+            fontsize='small'       # Небольшой размер шрифта
+        )
+
+        # Дополнительные настройки для стабильности легенды
+        ax.set_xlabel('X')
+        ax.set_ylabel('Y')
+        ax.set_title(self.tr('Particle Trajectories'))
+        ax.grid(True)
+
+    def trajectory_series(self):
+        """(x, y) of every particle, a strided read of the stored run when one is shown"""
+        if self.stored_run is None:
+            return [(p.x_mass, p.y_mass) for p in self.particles]
+        run = self.stored_run
+        positions = run.positions[::run.stride_for(max(2, STORED_LINE_POINTS // run.n))]
+        return [(positions[:, i, 0], positions[:, i, 1]) for i in range(run.n)]
+
+    def raster_shape(self):
+        """(width, height) in pixels of the axes of a single plot on the canvas"""
+        figure = self.canvas.figure
+        pars = figure.subplotpars
+        width, height = self.canvas.get_width_height()
+        return (max(int(width * (pars.right - pars.left)), MIN_RASTER_PIXELS),
+                max(int(height * (pars.top - pars.bottom)), MIN_RASTER_PIXELS))
+
+    def history_raster(self):
+        """Raster of the paths of all particles in the stored trajectories"""
+        raster = TrajectoryRaster(self.raster_shape(), self.constants["heatmap_extent"])
+        if self.stored_run is not None:
+            run = self.stored_run
+            for positions in run.positions.blocks(stride=run.stride_for(STORED_RASTER_SEGMENTS // run.n)):
+                raster.record(positions)
+            return raster
+        for p in self.particles:
+            raster.add_path(p.x_mass, p.y_mass)
+        if self.particles:
+            # The segments of a run start at the current points
+            raster.last = np.array([[p.x_mass[-1], p.y_mass[-1]] for p in self.particles])
+        return raster
+
+    def current_raster(self):
+        """The raster of the running or last run, otherwise one drawn from the trajectories"""
+        if self.raster is not None:
+            return self.raster
+        return self.history_raster()
+
+    def draw_trajectory_raster(self):
+        if not self.particles:
+            return
+        image, extent = self.current_raster().image(self.constants["raster_shading"])
+        if extent is None:
+            return
+        ax = self.canvas.figure.add_subplot(111)
+        # One image of fixed size, however many segments it holds
+        self.raster_image = ax.imshow(image, extent=extent, origin='lower', cmap='inferno',
+                                      vmin=0, vmax=1, aspect='auto', interpolation='nearest')
+        ax.set_xlabel('X')
+        ax.set_ylabel('Y')
+        ax.set_title(self.tr('Trajectory Density Raster'))
+
+    def density_layers(self):
+        """Layer of every particle and the (label, color) of every layer for the selected mode"""
+        mode = self.constants["density_layers"]
+        if mode == "particle":
+            keys = list(range(len(self.particles)))
+        elif mode == "color":
+            keys = [p.color for p in self.particles]
+        elif mode == "charge":
+            keys = [int(np.sign(p.charge)) for p in self.particles]
+        else:
+            keys = [0] + [None] * (len(self.particles) - 1)
+        layers, labels = group_layers(keys)
+
+        styles = []
+        for key in labels:
+            if mode == "particle":
+                styles.append((self.tr("particle {}").format(key + 1), self.particles[key].color))
+            elif mode == "color":
+                styles.append((key, key))
+            elif mode == "charge":
+                label, color = CHARGE_LAYERS[key]
+                styles.append((self.tr(label), color))
+            else:
+                styles.append((self.tr("particle {}").format(1), self.particles[0].color))
+        return layers, styles
+
+    def history_density(self):
+        """Density layers binned from the stored trajectories and their (label, color) styles"""
+        layers, styles = self.density_layers()
+        density = DensityAccumulator((self.constants["grid_size_x"], self.constants["grid_size_y"]),
+                                     self.constants["heatmap_extent"], layers)
+        if self.stored_run is not None:
+            run = self.stored_run
+            # Streamed block by block, a long run is sampled with a stride
+            for positions in run.positions.blocks(stride=run.stride_for(STORED_DENSITY_POINTS // run.n)):
+                density.record(positions)
+            return density, styles
+        for p, layer in zip(self.particles, layers):
+            if layer >= 0:
+                density.add_points(p.x_mass, p.y_mass, layer)
+        return density, styles
+
+    def current_density(self):
+        """The accumulator of the running or last run, otherwise one binned from the trajectories"""
+        if self.density is not None:
+            return self.density, self.density_styles
+        return self.history_density()
+
+    def density_grid(self):
+        """Normalized (layers, ny, nx) position counts, the (x_min, x_max, y_min, y_max) extent and layer styles"""
+        if not self.particles:
+            return None
+
+        density, styles = self.current_density()
+        counts, extent = density.layer_histograms()
+        if extent is None:
+            return None
+
+        # Normalize the counts over all layers
+        total_count = counts.sum()
+        if total_count > 0:
+            return counts / total_count, extent, styles
+        return counts, extent, styles
+
+    def layer_image(self, counts, styles):
+        """Blend the density layers into one RGB image, each layer in its own color"""
+        # Scale every layer to its own peak, a fixed particle would hide all others
+        peaks = counts.max(axis=(1, 2), keepdims=True)
+        peaks[peaks == 0] = 1
+        from matplotlib.colors import to_rgb
+        colors = np.array([to_rgb(color) for _, color in styles])
+        return np.clip(np.einsum('lyx,lc->yxc', counts / peaks, colors), 0, 1)
+
+    def draw_density_heatmap(self):
+        grid = self.density_grid()
+        if grid is None:
+            return
+        normalized_counts, extent, styles = grid
+
+        # Plot the heatmap
+        ax = self.canvas.figure.add_subplot(111)
+        if len(styles) == 1:
+            im = ax.imshow(normalized_counts[0], extent=extent,
+                          origin='lower', cmap='magma', aspect='auto')
+            # Add colorbar
+            self.canvas.figure.colorbar(im, ax=ax, label=self.tr('Probability'))
+            ax.set_title(self.tr('Particle Density Heatmap ({})').format(styles[0][0]))
+        else:
+            # Several layers share one image, told apart by their colors
+            im = ax.imshow(self.layer_image(normalized_counts, styles), extent=extent,
+                          origin='lower', aspect='auto')
+            from matplotlib.patches import Patch
+            ax.legend(handles=[Patch(color=color, label=label) for label, color in styles])
+            ax.set_title(self.tr('Particle Density Heatmap'))
+        self.heatmap_image = im
+
+        # Add labels
+        ax.set_xlabel('X')
+        ax.set_ylabel('Y')
+
+    def position_histogram(self, axis):
+        """Normalized marginals of the density layers along X (axis=0) or Y (axis=1)"""
+        if not self.particles:
+            return None
+
+        # The histograms are the marginals of the same 2D counts as the heatmap
+        density, styles = self.current_density()
+        result = density.marginals(axis)
+        if result is None:
+            return None
+        hist_counts, bin_edges = result
+
+        # Normalize the counts
+        total_count = hist_counts.sum()
+        if total_count > 0:
+            hist_counts = hist_counts / total_count  # Normalize to get probabilities
+        return hist_counts, bin_edges, total_count, styles
+
+    def draw_position_histogram(self, axis):
+        """Draw histogram of particle positions along the X (axis=0) or Y (axis=1) axis"""
+        result = self.position_histogram(axis)
+        if result is None:
+            return
+        hist_counts, bin_edges, total_count, styles = result
+        axis_name = 'X' if axis == 0 else 'Y'
+
+        # Plot every layer as a step patch that live updates can reuse
+        ax = self.canvas.figure.add_subplot(111)
+        if len(styles) == 1:
+            self.histogram_patches = [ax.stairs(
+                hist_counts[0],
+                bin_edges,
+                fill=True,
+                color='black',
+                alpha=0.7
+            )]
+        else:
+            self.histogram_patches = [
+                ax.stairs(counts, bin_edges, fill=True, color=color, alpha=0.5, label=label)
+                for counts, (label, color) in zip(hist_counts, styles)
+            ]
+            ax.legend()
+
+        # Add labels and grid
+        ax.set_xlabel(axis_name)
+        ax.set_ylabel(self.tr('Normalized Probability') if total_count > 0 else self.tr('Count'))
+        ax.set_title(self.tr('{}-Axis Position Histogram').format(axis_name))
+        ax.grid(True)
+
+    def draw_x_histogram(self):
+        """Draw histogram of particle positions along X-axis"""
+        self.draw_position_histogram(0)
+
+    def draw_y_histogram(self):
+        """Draw histogram of particle positions along Y-axis"""
+        self.draw_position_histogram(1)
+
+    def update_visualization(self, viz_type):
+        """Refresh the live plot through its persistent artists instead of rebuilding the figure"""
+        if self.live_viz_type != viz_type:
+            self.draw_visualization(viz_type)
+            self.live_viz_type = viz_type
+            return
+
+        start = self.phase_start()
+        # Trimmed lists drop their oldest points, only growing ones can be drawn as tails
+        incremental = not (self.constants["use_point_limits"] or self.store is not None)
+        if viz_type == "Trajectory Lines":
+            self.update_trajectory_lines(incremental)
+        elif viz_type == "Trajectory Density Raster":
+            self.update_trajectory_raster()
+        elif viz_type == "Density Heatmap":
+            self.update_density_heatmap()
+        elif viz_type == "X-Axis Histogram":
+            self.update_position_histogram(0)
+        elif viz_type == "Y-Axis Histogram":
+            self.update_position_histogram(1)
+        elif viz_type == "Electric Energy Plot":
+            self.update_energy_plot("el")
+        elif viz_type == "Gravitational Energy Plot":
+            self.update_energy_plot("G")
+        elif viz_type == "Electric Difference Energy Plot":
+            self.update_energy_diff_plot("el")
+        elif viz_type == "Gravitational Difference Energy Plot":
+            self.update_energy_diff_plot("G")
+        self.phase_end("live " + viz_type, start)
+
+    def update_trajectory_lines(self, incremental):
+        self.update_live_lines([(p.x_mass, p.y_mass) for p in self.particles],
+                               self.trajectory_lines, incremental)
+
+    def update_density_heatmap(self):
+        grid = self.density_grid()
+        if grid is None or self.heatmap_image is None:
+            return
+        normalized_counts, extent, styles = grid
+        if len(styles) == 1:
+            self.heatmap_image.set_data(normalized_counts[0])
+            self.heatmap_image.set_clim(0, normalized_counts.max() or 1)
+        else:
+            self.heatmap_image.set_data(self.layer_image(normalized_counts, styles))
+        self.heatmap_image.set_extent(extent)
+        self.canvas.draw()
+
+    def update_trajectory_raster(self):
+        if self.raster_image is None or not self.particles:
+            return
+        image, extent = self.current_raster().image(self.constants["raster_shading"])
+        if extent is None:
+            return
+        self.raster_image.set_data(image)
+        self.raster_image.set_extent(extent)
+        self.canvas.draw()
+
+    def update_position_histogram(self, axis):
+        result = self.position_histogram(axis)
+        if result is None or not self.histogram_patches:
+            return
+        hist_counts, bin_edges, _, _ = result
+        for patch, counts in zip(self.histogram_patches, hist_counts):
+            patch.set_data(counts, bin_edges)
+        ax = self.histogram_patches[0].axes
+        ax.relim()
+        ax.autoscale_view()
+        self.canvas.draw()
+
+    def update_energy_plot(self, kind):
+        # Energies are recorded for every step, so the series only ever grow
+        K_list, P_list, E_list = self.energy_series(kind)
+        index = np.arange(len(E_list))
+        self.update_live_lines([(index, K_list), (index, P_list), (index, E_list)],
+                               self.energy_lines, True)
+
+    def update_energy_diff_plot(self, kind):
+        times, diff = self.energy_difference(kind)
+        self.update_live_lines([(times, diff)], self.energy_lines, True)
+
+    def update_live_lines(self, series, lines, incremental):
+        if not lines:
+            return
+        if self.live_lines is None:
+            self.live_lines = IncrementalLines(self.canvas, lines, decimated=self.decimated_lines)
+        self.live_lines.update(series, incremental)
+
+    def selected_integrator(self):
+        for name, radio in self.method_radios.items():
+            if radio.isChecked():
+                return name
+        return "verlet"
+
+    def add_default_particles(self):
+        if self.particles:
+            # A scene was loaded before the window got to it
+            return
+        max_points = self.constants["max_points"]
+        self.particles.append(Particle(0, 0, -1, 1, 1, 45, 0.0001, True, False, 'red', max_points))
+        self.particles.append(Particle(-1, 0, 1, 1836, 0, 0, 0.0001, False, False, 'green', max_points))
+        self.particles.append(Particle(1, 0, 1, 1836, 0, 0, 0.0001, False, False, 'blue', max_points))
+        self.update_particle_list()
+
+    def save_particles_to_file(self):
+        columnar = self.tr("Columnar scenes (*.npz)")
+        filename, selected = QFileDialog.getSaveFileName(
+            self, self.tr("Save Particles"), "", ";;".join([self.tr("JSON Files (*.json)"), columnar]))
+        if filename:
+            if selected == columnar and not filename.lower().endswith(".npz"):
+                filename += ".npz"
+            save_scene(filename, self.particles)
+
+    def generate_scene(self):
+        from .dialogs import GenerateSceneDialog
+        dialog = GenerateSceneDialog(self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        try:
+            k, G = float(self.k_input.text()), float(self.g_input.text())
+        except ValueError:
+            k, G = self.constants["k"], self.constants["G"]
+        particles = particles_from_columns(dialog.scene(k, G))
+        if dialog.replace_check.isChecked():
+            self.particles = particles
+        else:
+            self.particles.extend(particles)
+        self.update_particle_list()
+
+    def open_stored_run(self):
+        filename, _ = QFileDialog.getOpenFileName(
+            self, self.tr("Open Stored Run"), TRAJECTORY_DIR,
+            self.tr("Stored runs (index.json *.h5 *.hdf5)"))
+        if filename:
+            run = None
+            try:
+                run = open_trajectory(filename)
+                self.show_stored_run(run)
+            except (OSError, ValueError, KeyError, ImportError) as e:
+                if run is not None:
+                    run.close()
+                QMessageBox.warning(self, self.tr("Error"), self.tr("Could not open the stored run: {}").format(e))
+
+    def show_stored_run(self, run):
+        """Show a stored run: its particles at their last step, its trajectories read from disk on demand"""
+        self.show_state(run.state(-1), run.metadata.get("colors"))
+        self.stored_run = run
+        self.draw_visualization(VIZ_TYPES[self.viz_type_combo.currentIndex()])
+
+    def show_state(self, state, colors=None):
+        """Replace the particles with those of a simulation state, at its current point"""
+        colors = colors or [f"C{i % 10}" for i in range(state.n)]
+        particles = []
+        for i in range(state.n):
+            (x, y), (vx, vy) = state.positions[i].tolist(), state.velocities[i].tolist()
+            # A new particle is one step along its velocity, which has to end at the current point
+            p = Particle(x - vx * state.dt, y - vy * state.dt, state.charge[i].item(), state.mass[i].item(),
+                         math.hypot(vx, vy), math.degrees(math.atan2(vy, vx)), state.dt,
+                         bool(state.moving_ch[i]), bool(state.moving_m[i]), colors[i],
+                         self.max_points_input.value())
+            p.x_mass[-1], p.y_mass[-1] = x, y
+            particles.append(p)
+        self.particles = particles
+        self.density = None
+        self.raster = None
+        self.density_styles = None
+        self.energy = None
+        self.update_particle_list()
+        self.k_input.setText(str(state.k))
+        self.g_input.setText(str(state.G))
+
+    def save_checkpoint(self):
+        if self.sim_worker is not None:
+            self.sim_worker.request_checkpoint()
+
+    def resume_from_checkpoint(self):
+        filename, _ = QFileDialog.getOpenFileName(
+            self, self.tr("Resume from Checkpoint"), CHECKPOINT_DIR, self.tr("Checkpoints (*.npz)"))
+        if not filename:
+            return
+        try:
+            checkpoint = load_checkpoint(filename)
+            simulation = checkpoint.simulation()
+        except (OSError, ValueError, KeyError) as e:
+            QMessageBox.warning(self, self.tr("Error"), self.tr("Could not read the checkpoint: {}").format(e))
+            return
+        state = simulation.state
+        self.show_state(state, checkpoint.metadata.get("colors"))
+        if simulation.method in self.method_radios:
+            self.method_radios[simulation.method].setChecked(True)
+        if not self.read_run_settings():
+            return
+        # Continue up to the end of the checkpointed run, or for the simulation time if it got there
+        steps = checkpoint.metadata.get("end_step", state.step) - state.step
+        if steps <= 0:
+            steps = int(self.constants["tneeded"] / state.dt)
+        self.simulation = simulation
+        self.start_run(steps)
+
+    def close_stored_run(self):
+        if self.stored_run is not None:
+            self.stored_run.close()
+            self.stored_run = None
+
+    def stored_energy_stride(self):
+        return self.stored_run.stride_for(STORED_ENERGY_FRAMES, 1)
+
+    def load_particles_from_file(self):
+        filename, _ = QFileDialog.getOpenFileName(
+            self, self.tr("Open Particles"), "",
+            ";;".join([self.tr("Scenes (*.json *.npz)"), self.tr("JSON Files (*.json)"),
+                       self.tr("Columnar scenes (*.npz)")]))
+        if not filename:
+            return
+        from .dialogs import MAX_GENERATED_PARTICLES
+        # Columns are memory-mapped, the size is known before any Particle is built
+        columns, _ = load_scene_columns(filename)
+        count = len(columns["posx"])
+        if count > MAX_GENERATED_PARTICLES:
+            QMessageBox.warning(self, self.tr("Error"), self.tr(
+                "The scene holds {:,} particles, the window keeps at most {:,}. Run it without "
+                "the window, e.g. python -m benchmarks profile --load {}").format(
+                    count, MAX_GENERATED_PARTICLES, filename))
+            return
+        self.particles = particles_from_columns(columns)
+        self.update_particle_list()
+
+    def save_settings(self):
+        settings = {
+            "G": self.constants["G"],
+            "k": self.constants["k"],
+            "tneeded": self.constants["tneeded"],
+            "use_point_limits": self.constants["use_point_limits"],
+            "target_fps": self.constants["target_fps"],
+            "max_time_ratio": self.constants["max_time_ratio"],
+            "heatmap_extent": self.constants["heatmap_extent"],
+            "density_layers": self.constants["density_layers"],
+            "integrator_plugins": self.constants["integrator_plugins"],
+            "drift_tolerance": self.constants["drift_tolerance"],
+            "drift_action": self.constants["drift_action"],
+            "instrument_runs": self.constants["instrument_runs"],
+            "store_trajectory": self.constants["store_trajectory"],
+            "checkpoint_minutes": self.constants["checkpoint_minutes"],
+            "raster_shading": self.constants["raster_shading"]
+        }
+        with open(SETTINGS_FILE, "w") as f:
+            json.dump(settings, f)
+
+    def load_settings(self):
+        if os.path.exists(SETTINGS_FILE):
+            with open(SETTINGS_FILE, "r") as f:
+                settings = json.load(f)
+            self.constants.update(settings)
+
+    def toggle_pause(self):
+        self.set_paused(not self.is_paused)
+        if self.sim_worker is not None:
+            if self.is_paused:
+                self.sim_worker.pause()
+            else:
+                self.sim_worker.resume()
+
+    def set_paused(self, paused):
+        self.is_paused = paused
+        self.pause_btn.setText(self.tr("Resume") if paused else self.tr("Pause"))
+
+    def step_simulation(self):
+        self.advance_paused_simulation(1)
+
+    def run_simulation_steps(self):
+        self.advance_paused_simulation(self.run_steps_spin.value())
+
+    def advance_paused_simulation(self, steps):
+        """Pause the running simulation and let it integrate exactly ``steps`` steps"""
+        if self.sim_worker is None:
+            return
+        self.set_paused(True)
+        self.sim_worker.advance_steps(steps)
+
+    def calculate_real_times(self):
+        try:
+            # Get values from input fields
+            real_mass1 = float(self.real_mass1_input.text())
+            real_mass2 = float(self.real_mass2_input.text())
+            real_distance = float(self.real_distance_input.text())
+            real_charge1 = float(self.real_charge1_input.text())
+            real_charge2 = float(self.real_charge2_input.text())
+
+            # Constants in SI units
+            k_real = 9e9  # Coulomb constant (N·m²/C²)
+            G_real = 6.67430e-11  # Gravitational constant (m³/kg·s²)
+
+            # Calculate electrostatic time using the formula: sqrt(m*r/(k*|Q|*|q|))
+            electrostatic_time = math.sqrt(real_mass1 * real_distance**3 / (k_real * abs(real_charge1) * abs(real_charge2)))
+
+            # Calculate gravitational time using the formula: sqrt(r³/(G*(m1+m2)))
+            gravitational_time = math.sqrt(real_distance**3 / (G_real * (real_mass2)))#real_mass1+
+
+            # Display the results
+            self.electrostatic_time_output.setText(self.tr("{:.2e} s").format(electrostatic_time))
+            self.gravitational_time_output.setText(self.tr("{:.2e} s").format(gravitational_time))
+
+        except ValueError as e:
+            self.electrostatic_time_output.setText(self.tr("Error: {}").format(e))
+            self.gravitational_time_output.setText(self.tr("Error: {}").format(e))
+
+    def create_menu_bar(self):
+        menubar = self.menuBar()
+
+        # File menu
+        file_menu = menubar.addMenu(self.tr("File"))
+        open_run_action = QAction(self.tr("Open Stored Run..."), self)
+        open_run_action.triggered.connect(self.open_stored_run)
+        file_menu.addAction(open_run_action)
+        generate_action = QAction(self.tr("Generate Scene..."), self)
+        generate_action.triggered.connect(self.generate_scene)
+        file_menu.addAction(generate_action)
+        file_menu.addSeparator()
+        self.save_checkpoint_action = QAction(self.tr("Save Checkpoint"), self)
+        self.save_checkpoint_action.setEnabled(False)
+        self.save_checkpoint_action.triggered.connect(self.save_checkpoint)
+        file_menu.addAction(self.save_checkpoint_action)
+        self.resume_checkpoint_action = QAction(self.tr("Resume from Checkpoint..."), self)
+        self.resume_checkpoint_action.triggered.connect(self.resume_from_checkpoint)
+        file_menu.addAction(self.resume_checkpoint_action)
+
+        # Help menu
+        help_menu = menubar.addMenu(self.tr("Help"))
+
+        # About action
+        about_action = QAction(self.tr("About"), self)
+        about_action.triggered.connect(self.show_about)
+        help_menu.addAction(about_action)
+
+        # User Guide action
+        user_guide_action = QAction(self.tr("User Guide"), self)
+        user_guide_action.triggered.connect(self.show_user_guide)
+        help_menu.addAction(user_guide_action)
+
+    def show_about(self):
+        try:
+            with open(self.about_file, "r", encoding="utf-8") as file:
+                about_content = file.read()
+        except (FileNotFoundError, TypeError):
+            about_content = self.tr("<h1>About Particle Simulator</h1><p>About file not found. Please create an '{}' file.</p>").format(
+                os.path.basename(self.about_file or "about.html"))
+
+        from .dialogs import HelpDialog
+        dialog = HelpDialog(self.tr("About Particle Simulator"), about_content, self)
+        dialog.exec_()
+
+    def show_user_guide(self):
+        guide_file = self.user_guide_file or "user_guide.html"
+        if guide_file.lower().endswith(".chm"):
+            # Compiled HTML help opens in the Windows help viewer
+            if os.path.exists(guide_file):
+                try:
+                    subprocess.Popen(f'hh.exe "{os.path.abspath(guide_file)}"', shell=True)
+                except Exception as e:
+                    QMessageBox.warning(self, self.tr("Error"), self.tr("Could not open the help file: {}").format(e))
+            else:
+                QMessageBox.warning(self, self.tr("File not found"),
+                                    self.tr("Help file '{}' not found.").format(os.path.basename(guide_file)))
+            return
+
+        try:
+            with open(guide_file, "r", encoding="utf-8") as file:
+                guide_content = file.read()
+        except FileNotFoundError:
+            guide_content = self.tr("<h1>User Guide</h1><p>User guide file not found. Please create a '{}' file.</p>").format(
+                os.path.basename(guide_file))
+
+        from .dialogs import HelpDialog
+        dialog = HelpDialog(self.tr("User Guide"), guide_content, self)
+        dialog.exec_()
+
+    def reset_simulation(self):
+        self.density = None
+        self.raster = None
+        self.energy = None
+        # Reset each particle to its initial state
+        for p in self.particles:
+            # Keep only the first two points (initial position and first step)
+            if len(p.x_mass) > 2:
+                p.x_mass = p.x_mass_init[:2]
+                p.y_mass = p.y_mass_init[:2]
+
+            # Reset velocity to initial values based on angle and velocity
+            rad_angle = math.radians(p.angle)
+            p.vx = p.velocity * np.cos(rad_angle)
+            p.vy = p.velocity * np.sin(rad_angle)
+            p.vx_history=[0,p.vx]
+            p.vy_history=[0,p.vy]
+            # Reset acceleration
+            p.ax = 0
+            p.ay = 0
+
+        # Clear the canvas
+        self.clear_canvas()
+
+        # Update the particle list to show reset positions
+        self.update_particle_list()
@@ -0,0 +1,10 @@
+import pytest
+
+from particle_core import SimulationState
+
+
+@pytest.fixture
+def pair():
+    """A close attracting pair on an eccentric orbit, its energy drifts within a few steps"""
+    return SimulationState([(0.0, 0.0), (1.0, 0.0)], [(0.0, 0.0), (0.0, 0.3)], [1.0, -1.0], [1.0, 1.0],
+                           [True, True], [True, True], 0.01, 1.0, 0.0)
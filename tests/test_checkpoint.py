@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from particle_core import Checkpoint, EnergyWatchdog, Simulation, available_integrators, get_integrator, load_checkpoint
+
+
+@pytest.mark.parametrize("method", available_integrators())
+def test_resume_is_bit_identical(pair, tmp_path, method):
+    reference = Simulation(pair.copy(), get_integrator(method))
+    expected = reference.advance(60)
+
+    simulation = Simulation(pair, get_integrator(method))
+    first = simulation.advance(25)
+    path = Checkpoint.capture(simulation, {"end_step": 60}).save(str(tmp_path / "run.npz"))
+    checkpoint = load_checkpoint(path)
+    resumed = checkpoint.simulation()
+    rest = resumed.advance(35)
+
+    assert checkpoint.metadata == {"end_step": 60}
+    assert resumed.state.step == reference.state.step
+    assert resumed.integrator.force_evaluations == reference.integrator.force_evaluations
+    for got, want in zip(first, expected):
+        np.testing.assert_array_equal(got, want[:25])
+    for got, want in zip(rest, expected):
+        np.testing.assert_array_equal(got, want[25:])
+
+
+def test_resume_with_watchdog_is_bit_identical(pair, tmp_path):
+    def run():
+        simulation = Simulation(pair.copy(), get_integrator("leapfrog"))
+        simulation.set_watchdog(EnergyWatchdog(tolerance=1e-3, interval=10))
+        return simulation
+
+    reference = run()
+    expected = reference.advance(100)
+
+    simulation = run()
+    simulation.advance(45)
+    path = Checkpoint.capture(simulation).save(str(tmp_path / "run.npz"))
+    resumed = load_checkpoint(path).simulation()
+    rest = resumed.advance(55)
+
+    # The close encounter after the checkpoint is refined
+    assert reference.watchdog.refined_segments > 0
+    assert resumed.watchdog.options() == reference.watchdog.options()
+    assert resumed.watchdog.refined_segments == reference.watchdog.refined_segments
+    for got, want in zip(rest, expected):
+        np.testing.assert_array_equal(got, want[45:])
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from particle_core import DensityAccumulator, group_layers
+from particle_core.density import _fold, bin_positions
+
+
+@pytest.mark.parametrize("n, offset", [(8, 0), (8, 8), (7, 0), (7, 7)])
+def test_fold_merges_cells_into_the_doubled_extent(n, offset):
+    counts = np.arange(1, 3 * n + 1).reshape(3, n)
+    folded = _fold(counts, 1, offset)
+    assert folded.shape == counts.shape
+    assert folded.sum() == counts.sum()
+    # Every old cell lies in exactly one new cell
+    want = np.zeros_like(counts)
+    for i in range(n):
+        want[:, (offset + i) // 2] += counts[:, i]
+    np.testing.assert_array_equal(folded, want)
+
+
+@pytest.mark.parametrize("bins", [(8, 8), (7, 9)])
+def test_expanding_extent_bins_like_the_final_extent(bins):
+    rng = np.random.default_rng(0)
+    density = DensityAccumulator(bins)
+    density.add_points([0.0, 1.0], [0.0, 1.0])
+    first = np.array([[0.0, 0.0], [1.0, 1.0]])
+    # Later points leave the extent on every side, it doubles several times
+    batches = [rng.uniform(-0.5, 1.5, (50, 2)), rng.uniform(-3.0, 0.2, (50, 2)), rng.uniform(0.5, 9.0, (50, 2))]
+    for batch in batches:
+        density.add_points(batch[:, 0], batch[:, 1])
+    points = np.vstack([first] + batches)
+    x_min, x_max, y_min, y_max = density.extent
+    # The first extent, 1.1 wide with its margins, doubled four times
+    assert x_max - x_min == pytest.approx(16 * 1.1) and y_max - y_min == pytest.approx(16 * 1.1)
+    assert x_min <= points.min() and points.max() <= min(x_max, y_max)
+    want = bin_positions(points[:, 0], points[:, 1], 0, bins, density.extent)
+    np.testing.assert_array_equal(density.counts, want)
+    assert density.total == len(points)
+
+
+def test_fixed_extent_drops_outside_points():
+    density = DensityAccumulator((4, 4), extent=(0, 1, 0, 1))
+    density.add_points([0.5, 2.0, -1.0, 1.0], [0.5, 0.5, 0.5, 1.0])
+    assert density.extent == (0.0, 1.0, 0.0, 1.0)
+    counts, _ = density.histogram()
+    # The upper edge falls in the last bin
+    assert counts[2, 2] == 1 and counts[3, 3] == 1 and density.total == 2
+
+
+def test_record_bins_every_stride_th_step_across_blocks():
+    positions = np.random.default_rng(1).uniform(0, 1, (10, 3, 2))
+    strided = DensityAccumulator((5, 5), extent=(0, 1, 0, 1), stride=3)
+    for start, stop in ((0, 4), (4, 5), (5, 10)):
+        strided.record(positions[start:stop])
+    whole = DensityAccumulator((5, 5), extent=(0, 1, 0, 1))
+    whole.record(positions[::3])
+    np.testing.assert_array_equal(strided.counts, whole.counts)
+
+
+def test_layers_and_marginals():
+    layers, labels = group_layers(["red", "blue", None, "red"])
+    assert labels == ["red", "blue"]
+    np.testing.assert_array_equal(layers, [0, 1, -1, 0])
+    density = DensityAccumulator((2, 2), extent=(0, 1, 0, 1), layers=layers)
+    density.record(np.array([[[0.1, 0.1], [0.9, 0.1], [0.5, 0.5], [0.9, 0.9]]]))
+    assert density.n_layers == 2
+    counts, edges = density.marginals(0)
+    np.testing.assert_array_equal(counts, [[1, 1], [0, 1]])
+    np.testing.assert_array_equal(edges, [0.0, 0.5, 1.0])
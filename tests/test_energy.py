@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from particle_core import EnergyRecorder, Simulation, get_integrator, trajectory_energy
+
+
+def compute_energy(positions, velocities, charge, mass, k, G, t):
+    """Kinetic, electric and gravitational energy of step t, as the original compute_energy_el/_G loops"""
+    kinetic = sum(0.5 * mass[i] * (velocities[t, i, 0] ** 2 + velocities[t, i, 1] ** 2)
+                  for i in range(len(mass)))
+    electric = gravitational = 0.0
+    for i in range(len(mass)):
+        for j in range(i + 1, len(mass)):
+            R = np.sqrt((positions[t, i, 0] - positions[t, j, 0]) ** 2 + (positions[t, i, 1] - positions[t, j, 1]) ** 2)
+            electric += k * charge[i] * charge[j] / R
+            gravitational -= G * mass[i] * mass[j] / R
+    return kinetic, electric, gravitational
+
+
+@pytest.fixture
+def trio(pair):
+    # A third, fixed particle makes the kernel combine moving and fixed pairs
+    pair.positions = np.vstack([pair.positions, [(-2.0, 1.0)]])
+    pair.velocities = np.vstack([pair.velocities, [(0.0, 0.0)]])
+    pair.charge = np.append(pair.charge, 0.5)
+    pair.mass = np.append(pair.mass, 3.0)
+    pair.moving_ch = np.append(pair.moving_ch, False)
+    pair.moving_m = np.append(pair.moving_m, False)
+    pair.k, pair.G = 2.0, 0.25
+    return pair
+
+
+@pytest.mark.parametrize("method", ["verlet", "leapfrog", "rk4"])
+def test_recorded_energy_matches_pairwise_loops(trio, method):
+    simulation = Simulation(trio, get_integrator(method))
+    energy = simulation.add_recorder(EnergyRecorder.from_state(trio))
+    positions, velocities = simulation.advance(40)
+    kinetic, electric, gravitational, momentum, angular = energy.snapshot()
+    assert energy.count == 40
+    want = np.array([compute_energy(positions, velocities, trio.charge, trio.mass, trio.k, trio.G, t)
+                     for t in range(40)])
+    np.testing.assert_allclose(kinetic, want[:, 0], rtol=1e-12)
+    np.testing.assert_allclose(electric, want[:, 1], rtol=1e-12)
+    np.testing.assert_allclose(gravitational, want[:, 2], rtol=1e-12)
+    np.testing.assert_allclose(momentum, np.einsum('n,tnk->tk', trio.mass, velocities), rtol=1e-12)
+    np.testing.assert_allclose(
+        angular, np.einsum('n,tn->t', trio.mass, positions[..., 0] * velocities[..., 1]
+                           - positions[..., 1] * velocities[..., 0]), rtol=1e-12)
+
+
+def test_stored_trajectory_gives_the_same_energies(trio):
+    simulation = Simulation(trio.copy(), get_integrator("leapfrog"))
+    live = simulation.add_recorder(EnergyRecorder.from_state(trio))
+    positions, velocities = simulation.advance(40)
+    stored = EnergyRecorder.from_state(trio, capacity=1)
+    # Recorded in uneven blocks without potentials, the arrays grow on the way
+    for start, stop in ((0, 3), (3, 4), (4, 40)):
+        stored.record(positions[start:stop], velocities[start:stop])
+    for got, want in zip(stored.snapshot(), live.snapshot()):
+        np.testing.assert_allclose(got, want, rtol=1e-12)
+
+
+def test_trajectory_energy_in_small_chunks(trio):
+    positions, velocities = Simulation(trio.copy(), get_integrator("verlet")).advance(30)
+    whole = trajectory_energy(positions, velocities, trio.charge, trio.mass, trio.k, trio.G)
+    # A budget of one frame per chunk
+    chunked = trajectory_energy(positions, velocities, trio.charge, trio.mass, trio.k, trio.G, memory_budget=1)
+    for got, want in zip(chunked, whole):
+        np.testing.assert_allclose(got, want, rtol=1e-14)
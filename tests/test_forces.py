@@ -0,0 +1,77 @@
+import numpy as np
+
+from particle_core import compute_accelerations, fixed_potential_energy, potential_energy
+
+
+def pairwise(positions, charge, mass, moving_ch, moving_m, k, G):
+    """Accelerations and potentials of the pairwise loops of the original simulator"""
+    n = len(positions)
+    accelerations = np.zeros((n, 2))
+    potential = np.zeros(2)
+    for i in range(n):
+        for j in range(n):
+            if i == j:
+                continue
+            d = positions[i] - positions[j]
+            r = np.hypot(*d)
+            if moving_ch[i]:
+                accelerations[i] += k * charge[i] * charge[j] * d / r ** 3 / mass[i]
+            if moving_m[i]:
+                accelerations[i] -= G * mass[i] * mass[j] * d / r ** 3 / mass[i]
+            if i < j:
+                potential += (k * charge[i] * charge[j] / r, -G * mass[i] * mass[j] / r)
+    return accelerations, potential
+
+
+def scene(n=30, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.normal(size=(n, 2)), rng.normal(size=n), rng.uniform(1, 2, n),
+            rng.random(n) < 0.3, rng.random(n) < 0.3)
+
+
+def test_matches_pairwise_loops():
+    positions, charge, mass, moving_ch, moving_m = scene()
+    potential = np.zeros(2)
+    accelerations = compute_accelerations(positions, charge, mass, moving_ch, moving_m, 2.0, 0.5,
+                                          potential=potential)
+    want_accelerations, want_potential = pairwise(positions, charge, mass, moving_ch, moving_m, 2.0, 0.5)
+    np.testing.assert_allclose(accelerations, want_accelerations, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(potential, want_potential, rtol=1e-12)
+
+
+def test_potential_with_cached_fixed_part():
+    positions, charge, mass, moving_ch, moving_m = scene(seed=1)
+    fixed = fixed_potential_energy(positions, charge, mass, moving_ch | moving_m, 2.0, 0.5)
+    potential = np.zeros(2)
+    compute_accelerations(positions, charge, mass, moving_ch, moving_m, 2.0, 0.5,
+                          potential=potential, fixed_potential=fixed)
+    np.testing.assert_allclose(potential, potential_energy(positions, charge, mass, 2.0, 0.5), rtol=1e-12)
+
+
+def test_potential_without_moving_particles():
+    positions, charge, mass, _, _ = scene(seed=2)
+    still = np.zeros(len(positions), dtype=bool)
+    potential = np.zeros(2)
+    accelerations = compute_accelerations(positions, charge, mass, still, still, 1.0, 1.0, potential=potential)
+    assert not accelerations.any()
+    np.testing.assert_allclose(potential, potential_energy(positions, charge, mass, 1.0, 1.0), rtol=1e-12)
+
+
+def test_block_of_rows_gives_the_same_result(monkeypatch):
+    from particle_core import forces
+    positions, charge, mass, moving_ch, moving_m = scene(seed=3)
+    whole = compute_accelerations(positions, charge, mass, moving_ch, moving_m, 1.0, 1.0)
+    monkeypatch.setattr(forces, "PAIR_BLOCK", 2 * len(positions))
+    np.testing.assert_allclose(compute_accelerations(positions, charge, mass, moving_ch, moving_m, 1.0, 1.0),
+                               whole, rtol=1e-14, atol=1e-14)
+
+
+def test_coincident_particles_exert_no_force():
+    positions = np.array([[0.0, 0.0], [0.0, 0.0], [1.0, 0.0]])
+    ones = np.ones(3)
+    moving = np.ones(3, dtype=bool)
+    potential = np.zeros(2)
+    accelerations = compute_accelerations(positions, ones, ones, moving, moving, 1.0, 0.0, potential=potential)
+    assert np.isfinite(accelerations).all()
+    np.testing.assert_allclose(accelerations[0], accelerations[1])
+    np.testing.assert_allclose(potential, [2.0, 0.0])
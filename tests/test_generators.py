@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from particle_core import SimulationState, electron_cloud, lattice, merge_scenes, random_gas, rotating_disk
+from particle_core.scene import SCENE_COLUMNS
+
+
+def velocities(columns):
+    angle = np.radians(columns["angle"])
+    return np.stack([columns["velocity"] * np.cos(angle), columns["velocity"] * np.sin(angle)], axis=1)
+
+
+def assert_scene(columns, n):
+    assert list(columns) == list(SCENE_COLUMNS)
+    for field, dtype in SCENE_COLUMNS.items():
+        assert len(columns[field]) == n, field
+        assert np.asarray(columns[field]).dtype.kind == np.dtype(dtype).kind, field
+
+
+def test_lattice_spacing_and_charges():
+    columns = lattice(3, 4, spacing=0.5, alternate=True, center=(1.0, 2.0))
+    assert_scene(columns, 12)
+    assert not columns["is_moving_ch"].any() and not columns["is_moving_m"].any()
+    assert columns["posx"].mean() == pytest.approx(1.0) and columns["posy"].mean() == pytest.approx(2.0)
+    np.testing.assert_allclose(np.diff(np.unique(columns["posx"])), 0.5)
+    # Rock-salt pattern: neutral overall for an even count, neighbours opposite
+    assert columns["charge"].sum() == 0
+    assert columns["charge"][0] == -columns["charge"][1] == -columns["charge"][4]
+
+
+def test_hex_lattice_rows():
+    columns = lattice(2, 2, spacing=1.0, kind="hex")
+    np.testing.assert_allclose(np.diff(np.unique(columns["posy"])), np.sqrt(3) / 2)
+    assert columns["posx"][2] - columns["posx"][0] == pytest.approx(0.5)
+    with pytest.raises(ValueError, match="Unknown lattice kind"):
+        lattice(2, 2, kind="triangle")
+
+
+def test_random_gas_is_reproducible_without_drift():
+    a = random_gas(1000, size=4.0, temperature=2.0, seed=5)
+    b = random_gas(1000, size=4.0, temperature=2.0, seed=5)
+    assert_scene(a, 1000)
+    for field in SCENE_COLUMNS:
+        np.testing.assert_array_equal(a[field], b[field])
+    assert np.abs(a["posx"]).max() <= 2.0
+    np.testing.assert_allclose(velocities(a).mean(axis=0), 0.0, atol=1e-12)
+    # Two degrees of freedom of T / 2 each
+    assert (0.5 * velocities(a) ** 2).sum(axis=1).mean() == pytest.approx(2.0, rel=0.1)
+    assert set(a["charge"]) == {1.0, -1.0}
+    with pytest.raises(ValueError, match="Unknown velocity distribution"):
+        random_gas(10, distribution="flat")
+
+
+def test_rotating_disk_orbits_are_circular():
+    columns = rotating_disk(200, radius=5.0, central_mass=100.0, G=2.0)
+    assert_scene(columns, 201)
+    assert columns["mass"][0] == 100.0 and not columns["is_moving_m"][0]
+    r = np.hypot(columns["posx"][1:], columns["posy"][1:])
+    assert r.max() <= 5.0
+    v = velocities(columns)[1:]
+    radial = (columns["posx"][1:] * v[:, 0] + columns["posy"][1:] * v[:, 1]) / r
+    np.testing.assert_allclose(radial, 0.0, atol=1e-9)
+    assert (np.hypot(v[:, 0], v[:, 1]) >= np.sqrt(2.0 * 100.0 / r) - 1e-9).all()
+
+
+def test_electron_cloud_is_neutral():
+    columns = electron_cloud(50, k=3.0)
+    assert_scene(columns, 51)
+    assert columns["charge"].sum() == pytest.approx(0.0)
+    assert columns["is_moving_ch"][1:].all() and not columns["is_moving_ch"][0]
+
+
+def test_merged_scenes_start_a_simulation():
+    columns = merge_scenes(lattice(2, 2), random_gas(3, seed=1))
+    assert_scene(columns, 7)
+    state = SimulationState.from_columns(columns)
+    assert state.n == 7 and state.moving.sum() == 3
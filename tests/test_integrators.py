@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from particle_core import (
+    Integrator, Simulation, available_integrators, get_integrator, integrator_label, register_integrator
+)
+from particle_core import integrators
+
+
+def test_builtin_integrators_are_registered_in_order():
+    assert available_integrators()[:4] == ["verlet", "leapfrog", "rk4", "bulirsch-stoer"]
+    assert integrator_label("bulirsch-stoer") == "Bulirsch-Stoer"
+    assert get_integrator("bulirsch-stoer", eps=1e-6).options() == {"eps": 1e-6}
+
+
+def test_get_integrator_returns_fresh_instances():
+    assert get_integrator("leapfrog") is not get_integrator("leapfrog")
+
+
+def test_unknown_integrator_is_refused():
+    with pytest.raises(ValueError, match="Unknown integrator"):
+        get_integrator("euler")
+
+
+def test_plugin_integrator_registers_itself(monkeypatch, pair):
+    monkeypatch.setattr(integrators, "_REGISTRY", dict(integrators._REGISTRY))
+
+    @register_integrator
+    class EulerIntegrator(Integrator):
+        name = "euler"
+
+        def step(self, state):
+            m = self.moving
+            state.positions[m] += state.dt * state.velocities[m]
+            state.velocities[m] += state.dt * self.evaluate_forces(state)[m]
+            state.step += 1
+
+    assert available_integrators()[-1] == "euler"
+    assert integrator_label("euler") == "euler"
+    positions, _ = Simulation(pair, get_integrator("euler")).advance(3)
+    assert positions.shape == (3, 2, 2)
+
+
+def test_integrator_without_name_is_refused():
+    with pytest.raises(ValueError, match="must define a name"):
+        register_integrator(type("Nameless", (Integrator,), {}))
+
+
+@pytest.mark.parametrize("method", ["verlet", "leapfrog"])
+def test_one_force_evaluation_per_step(pair, method):
+    simulation = Simulation(pair, get_integrator(method))
+    # prepare() evaluates the forces of the starting positions once
+    assert simulation.integrator.force_evaluations == 1
+    simulation.advance(50)
+    assert simulation.integrator.force_evaluations == 51
+
+
+@pytest.mark.parametrize("method", ["verlet", "leapfrog"])
+def test_recording_the_potential_costs_no_extra_evaluation(pair, method):
+    simulation = Simulation(pair, get_integrator(method))
+    simulation.integrator.track_potential = True
+    simulation.advance(50)
+    assert simulation.integrator.force_evaluations == 51
+
+
+@pytest.mark.parametrize("method", available_integrators()[:4])
+def test_step_many_matches_single_steps(pair, method):
+    one = pair.copy()
+    integrator = get_integrator(method)
+    integrator.prepare(one)
+    for _ in range(20):
+        integrator.step(one)
+    many = pair.copy()
+    positions = np.empty((20, 2, 2))
+    integrator = get_integrator(method)
+    integrator.prepare(many)
+    integrator.step_many(many, 20, positions)
+    np.testing.assert_array_equal(many.positions, one.positions)
+    np.testing.assert_array_equal(positions[-1], one.positions)
+
+
+def test_fixed_particles_stay_put(pair):
+    pair.moving_ch[1] = pair.moving_m[1] = False
+    fixed = pair.positions[1].copy()
+    for method in available_integrators()[:4]:
+        state = pair.copy()
+        Simulation(state, get_integrator(method)).advance(10)
+        np.testing.assert_array_equal(state.positions[1], fixed)
+        assert state.step == 10
@@ -0,0 +1,71 @@
+import numpy as np
+
+from particle_core.plotting import DECIMATE_POINTS_PER_PIXEL, envelope_line, thin_path, visible_points
+
+
+def test_short_series_are_returned_whole():
+    x = np.arange(10.0)
+    got_x, got_y = envelope_line(x, x ** 2, 100)
+    np.testing.assert_array_equal(got_x, x)
+    np.testing.assert_array_equal(got_y, x ** 2)
+
+
+def test_envelope_keeps_extremes_of_every_bucket():
+    rng = np.random.default_rng(0)
+    x = np.arange(100000.0)
+    y = rng.normal(size=len(x))
+    y[12345] = 50.0
+    y[67890] = -50.0
+    got_x, got_y = envelope_line(x, y, 200)
+    assert len(got_x) <= 4 * 200
+    assert got_x[0] == 0 and got_x[-1] == len(x) - 1
+    assert got_y.max() == 50.0 and got_y.min() == -50.0
+    # Every bucket of 500 steps keeps the steps of its minimum and maximum
+    runs = y.reshape(200, 500)
+    starts = np.arange(0, len(x), 500)
+    assert np.isin(starts + runs.argmax(axis=1), got_x).all()
+    assert np.isin(starts + runs.argmin(axis=1), got_x).all()
+    np.testing.assert_array_equal(got_y, y[got_x.astype(int)])
+
+
+def test_envelope_splits_stretches_outside_the_view():
+    x = np.arange(10000.0)
+    y = np.where((x > 3000) & (x < 6000), 10.0, 0.0)
+    got_x, got_y = envelope_line(x, y, 50, view=(0, 10000, -1, 1))
+    gaps = np.flatnonzero(np.isnan(got_x))
+    assert len(gaps) == 1
+    before, after = got_x[:gaps[0]], got_x[gaps[0] + 1:]
+    assert before.max() <= 3001 and after.min() >= 5999
+
+
+def test_thin_path_keeps_one_point_per_pixel():
+    t = np.linspace(0, 1, 100000)
+    x, y = np.cos(2 * np.pi * t), np.sin(2 * np.pi * t)
+    got_x, got_y = thin_path(x, y, (100, 100))
+    assert len(got_x) < 500
+    assert (got_x[0], got_y[0]) == (x[0], y[0]) and (got_x[-1], got_y[-1]) == (x[-1], y[-1])
+    ix = np.floor((got_x - x.min()) * (100 / np.ptp(x)))
+    iy = np.floor((got_y - y.min()) * (100 / np.ptp(y)))
+    # No two consecutive kept points but the last share a pixel
+    assert ((ix[1:-1] != ix[:-2]) | (iy[1:-1] != iy[:-2])).all()
+
+
+def test_thin_path_of_a_view_drops_what_is_outside():
+    x = np.linspace(-10, 10, 2001)
+    y = np.zeros_like(x)
+    got_x, _ = thin_path(x, y, (10, 10), view=(-1, 1, -1, 1))
+    assert np.nanmin(got_x) >= -1.01 and np.nanmax(got_x) <= 1.01
+
+
+def test_visible_points_keep_segments_crossing_the_view():
+    x = np.array([-5.0, 5.0, 6.0, 7.0])
+    y = np.zeros(4)
+    # The first segment crosses the view although both its ends are outside
+    np.testing.assert_array_equal(visible_points(x, y, (-1, 1, -1, 1)), [0, 1])
+
+
+def test_decimation_threshold():
+    n = DECIMATE_POINTS_PER_PIXEL * 10
+    x = np.arange(float(n))
+    assert len(envelope_line(x, x, 10)[0]) == n
+    assert len(envelope_line(np.arange(n + 1.0), np.arange(n + 1.0), 10)[0]) < n
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from particle_core import TrajectoryRaster, shade
+
+
+def test_segment_marks_every_pixel_it_crosses_once():
+    raster = TrajectoryRaster((10, 10), extent=(0, 10, 0, 10))
+    raster.add_path([0.5, 9.5, 9.5], [0.5, 0.5, 9.5])
+    counts, _ = raster.histogram()
+    want = np.zeros((10, 10), dtype=int)
+    # The bottom row up to the corner, then the right column; the end point is left out
+    want[0, :9] = 1
+    want[:9, 9] += 1
+    np.testing.assert_array_equal(counts, want)
+
+
+def test_record_joins_blocks():
+    positions = np.random.default_rng(0).uniform(0, 4, (12, 3, 2))
+    blocks = TrajectoryRaster((16, 16), extent=(0, 4, 0, 4))
+    for start, stop in ((0, 5), (5, 6), (6, 12)):
+        blocks.record(positions[start:stop])
+    paths = TrajectoryRaster((16, 16), extent=(0, 4, 0, 4))
+    for i in range(3):
+        paths.add_path(positions[:, i, 0], positions[:, i, 1])
+    np.testing.assert_array_equal(blocks.counts, paths.counts)
+    np.testing.assert_array_equal(blocks.last, positions[-1])
+
+
+def test_chunks_give_the_same_image(monkeypatch):
+    from particle_core import raster
+    x, y = np.random.default_rng(1).uniform(-1, 1, (2, 500))
+    whole = TrajectoryRaster((32, 32), extent=(-1, 1, -1, 1))
+    whole.add_path(x, y)
+    monkeypatch.setattr(raster, "RASTER_CHUNK", 7)
+    chunked = TrajectoryRaster((32, 32), extent=(-1, 1, -1, 1))
+    chunked.add_path(x, y)
+    np.testing.assert_array_equal(chunked.counts, whole.counts)
+
+
+def test_extent_grows_before_sampling():
+    raster = TrajectoryRaster((8, 8))
+    raster.add_path([0.0, 1.0], [0.0, 1.0])
+    raster.add_path([1.0, 10.0], [1.0, 1.0])
+    x_min, x_max, _, _ = raster.extent
+    assert x_min <= 0.0 and x_max >= 10.0
+    # A segment is sampled once per pixel of the final extent it crosses
+    counts, _ = raster.histogram()
+    assert counts.sum() <= 2 * 8 + 2
+
+
+def test_non_finite_segments_are_skipped():
+    raster = TrajectoryRaster((4, 4), extent=(0, 4, 0, 4))
+    raster.add_path([0.5, np.nan, 2.5, 3.5], [0.5, 0.5, 0.5, 0.5])
+    assert raster.total == 1
+
+
+@pytest.mark.parametrize("how", ["log", "eq"])
+def test_shade_maps_to_unit_range_and_masks_empty_pixels(how):
+    counts = np.array([[0, 1, 1], [10, 100, 1000]])
+    values = shade(counts, how)
+    np.testing.assert_array_equal(values.mask, counts == 0)
+    assert values.max() == 1.0 and 0 < values.min()
+    # Shading keeps the order of the counts
+    filled = counts > 0
+    assert (np.diff(values[filled][np.argsort(counts[filled], kind="stable")]) >= 0).all()
+
+
+def test_eq_shading_spreads_levels_evenly():
+    values = shade(np.arange(1, 101), "eq")
+    np.testing.assert_allclose(values, np.arange(1, 101) / 100)
+
+
+def test_unknown_shading_is_refused():
+    with pytest.raises(ValueError, match="Unknown shading"):
+        shade(np.ones(3), "linear")
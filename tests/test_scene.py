@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from particle_core import (
+    Particle, SimulationState, convert_scene, lattice, load_scene, load_scene_columns, merge_scenes,
+    random_gas, save_scene, scene_columns
+)
+from particle_core.scene import SCENE_COLUMNS, save_scene_columns
+
+
+@pytest.fixture
+def columns():
+    # Free charges and fixed ions, with both colors and awkward floats
+    return merge_scenes(random_gas(20, size=3.0, temperature=0.7, dt=1e-3, seed=3),
+                        lattice(2, 3, spacing=0.1, alternate=True, dt=1e-3))
+
+
+def assert_same_columns(got, want):
+    assert list(got) == list(SCENE_COLUMNS)
+    for field in SCENE_COLUMNS:
+        assert np.asarray(got[field]).dtype == np.asarray(want[field]).dtype, field
+        np.testing.assert_array_equal(got[field], want[field])
+
+
+def test_json_npz_round_trip_is_lossless(tmp_path, columns):
+    json_path = str(tmp_path / "scene.json")
+    npz_path = str(tmp_path / "scene.npz")
+    back_path = str(tmp_path / "back.json")
+    save_scene_columns(json_path, columns)
+    convert_scene(json_path, npz_path, {"source": "test"})
+    convert_scene(npz_path, back_path)
+
+    loaded, metadata = load_scene_columns(npz_path)
+    assert metadata == {"source": "test"}
+    assert_same_columns(loaded, columns)
+    assert_same_columns(load_scene_columns(back_path)[0], columns)
+    with open(json_path) as a, open(back_path) as b:
+        assert a.read() == b.read()
+
+
+def test_npz_columns_are_memory_mapped(tmp_path, columns):
+    path = str(tmp_path / "scene.npz")
+    save_scene_columns(path, columns)
+    mapped, _ = load_scene_columns(path)
+    assert isinstance(mapped["posx"], np.memmap)
+    assert not mapped["posx"].flags.writeable
+    copied, _ = load_scene_columns(path, mmap=False)
+    assert not isinstance(copied["posx"], np.memmap)
+
+
+def test_particles_survive_both_formats(tmp_path):
+    particles = [Particle(0.1, -2.5, 1.5, 3.0, 0.7, 33.0, 1e-3, True, False, "red", 250),
+                 Particle(1 / 3, 2.0, -1.0, 1.0, 0.0, 0.0, 1e-3, False, True)]
+    for name in ("scene.json", "scene.npz"):
+        path = str(tmp_path / name)
+        save_scene(path, particles)
+        assert [p.to_dict() for p in load_scene(path)] == [p.to_dict() for p in particles]
+
+
+def test_state_from_columns_matches_particles(columns):
+    constants = {"k": 2.0, "G": 0.5}
+    from_columns = SimulationState.from_columns(columns, **constants)
+    records = [dict(zip(columns, values)) for values in zip(*(np.asarray(c).tolist() for c in columns.values()))]
+    from_particles = SimulationState.from_particles([Particle.from_dict(d) for d in records], constants)
+    np.testing.assert_allclose(from_columns.positions, from_particles.positions, rtol=0, atol=1e-15)
+    np.testing.assert_allclose(from_columns.velocities, from_particles.velocities, rtol=0, atol=1e-15)
+    np.testing.assert_array_equal(from_columns.moving_ch, from_particles.moving_ch)
+    assert_same_columns(scene_columns(records), columns)
+
+
+def test_unsupported_scene_is_refused(tmp_path, columns):
+    path = str(tmp_path / "scene.npz")
+    save_scene_columns(path, columns)
+    with np.load(path) as data:
+        arrays = dict(data)
+    arrays["header"] = np.array('{"format": "particle-scene", "version": 99, "metadata": {}}')
+    np.savez(path, **arrays)
+    with pytest.raises(ValueError, match="Unsupported scene file"):
+        load_scene_columns(path)
@@ -0,0 +1,54 @@
+import pytest
+
+from particle_core.scheduler import FrameScheduler
+
+
+def test_first_frame_uses_the_initial_steps():
+    assert FrameScheduler(0.01, initial_steps=7).steps_for_next_frame() == 7
+
+
+def test_steps_fill_the_frame_budget_left_by_rendering():
+    scheduler = FrameScheduler(1e-3, target_fps=10, initial_steps=1000)
+    scheduler.record_integration(100, 0.01)
+    scheduler.record_render(0.05)
+    # The render cost moves 30% of the way from 0, (0.1 s - 0.015 s) / 0.1 ms per step
+    assert scheduler.render_cost == pytest.approx(0.015)
+    assert scheduler.steps_for_next_frame() == 850
+
+
+def test_steps_grow_at_most_twofold_per_frame():
+    scheduler = FrameScheduler(1e-3, target_fps=10, initial_steps=10)
+    scheduler.steps_for_next_frame()
+    scheduler.record_integration(10, 1e-6)
+    assert scheduler.steps_for_next_frame() == 20
+    assert scheduler.steps_for_next_frame() == 40
+
+
+def test_slow_rendering_keeps_a_tenth_of_the_frame():
+    scheduler = FrameScheduler(1e-3, target_fps=10, initial_steps=1000)
+    scheduler.record_integration(100, 0.01)
+    scheduler.record_render(1.0)
+    assert scheduler.steps_for_next_frame() == 100
+
+
+def test_time_ratio_caps_the_simulated_time_per_frame():
+    scheduler = FrameScheduler(0.01, target_fps=20, max_time_ratio=2.0, initial_steps=1000)
+    # A frame advances at most 2 frame periods = 0.1 s of simulated time
+    assert scheduler.steps_for_next_frame() == 10
+
+
+def test_rates_describe_the_frame_just_finished():
+    scheduler = FrameScheduler(0.01)
+    scheduler.start(now=10.0)
+    scheduler.frame_done(50, now=10.5)
+    # Known after the first frame, not one frame late
+    assert scheduler.fps == pytest.approx(2.0)
+    assert scheduler.steps_per_second == pytest.approx(100.0)
+    scheduler.frame_done(10, now=10.6)
+    assert scheduler.fps == pytest.approx(2.0 + 0.3 * (10.0 - 2.0))
+
+
+def test_time_until_next_frame():
+    scheduler = FrameScheduler(0.01, target_fps=4)
+    assert scheduler.time_until_next_frame(1.0, now=1.1) == pytest.approx(0.15)
+    assert scheduler.time_until_next_frame(1.0, now=2.0) == 0.0
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from particle_core import Simulation, TrajectoryStore, get_integrator, open_trajectory
+
+
+def test_open_empty_store(tmp_path):
+    # A run stopped before its first chunk was flushed leaves an index without steps
+    path = str(tmp_path / "run")
+    TrajectoryStore(path, 3, 0.01)
+    run = open_trajectory(path)
+    assert len(run) == 0
+    with pytest.raises(ValueError, match="no steps"):
+        run.state(-1)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_stored_run_reads_back_every_step(pair, tmp_path, compress):
+    simulation = Simulation(pair, get_integrator("leapfrog"))
+    start = pair.copy()
+    path = str(tmp_path / "run")
+    # Small chunks, so the run spans several chunks and ends in a partial one
+    with simulation.add_recorder(TrajectoryStore.from_state(path, pair, {"colors": ["red", "blue"]},
+                                                            chunk_steps=16, compress=compress,
+                                                            potentials=True)):
+        blocks = [simulation.advance(k) for k in (10, 30, 7)]
+    positions = np.concatenate([start.positions[None]] + [b[0] for b in blocks])
+    velocities = np.concatenate([start.velocities[None]] + [b[1] for b in blocks])
+
+    with open_trajectory(path) as run:
+        assert len(run) == 48
+        assert run.metadata["colors"] == ["red", "blue"]
+        np.testing.assert_array_equal(run.positions[:], positions)
+        np.testing.assert_array_equal(run.velocities[5:40:3], velocities[5:40:3])
+        np.testing.assert_array_equal(run.times(1, 4), [0.01, 0.02, 0.03])
+        assert np.isnan(run.potentials[0]).all() and np.isfinite(run.potentials[1:]).all()
+        strided = np.concatenate([b[0] for b in run.blocks(1, stride=5)])
+        np.testing.assert_array_equal(strided, positions[1::5])
+        assert run.stride_for(10) == 5
+
+        last = run.state(-1)
+        assert last.step == pair.step == 47
+        np.testing.assert_array_equal(last.positions, pair.positions)
+        np.testing.assert_array_equal(last.charge, pair.charge)
+
+
+def test_uncompressed_chunks_are_memory_mapped(pair, tmp_path):
+    path = str(tmp_path / "run")
+    with TrajectoryStore.from_state(path, pair, chunk_steps=4) as store:
+        store.record(np.zeros((6, 2, 2)), np.zeros((6, 2, 2)))
+    run = open_trajectory(path)
+    assert isinstance(run.positions.chunk(0), np.memmap)
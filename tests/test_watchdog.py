@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from particle_core import EnergyDriftError, EnergyWatchdog, Simulation, get_integrator
+
+
+def test_abort_in_first_segment(pair):
+    simulation = Simulation(pair, get_integrator("leapfrog"))
+    simulation.set_watchdog(EnergyWatchdog(tolerance=1e-15, interval=10, action="abort"))
+    before = pair.copy()
+    with pytest.raises(EnergyDriftError, match="exceeds tolerance") as raised:
+        simulation.advance(50)
+    # Nothing passed the check, the block is empty and the state untouched
+    assert raised.value.accepted == 0
+    assert raised.value.block[0].shape == (0, 2, 2)
+    assert raised.value.block[1].shape == (0, 2, 2)
+    assert pair.step == before.step
+    np.testing.assert_array_equal(pair.positions, before.positions)
+
+
+def test_abort_keeps_the_segments_that_passed(pair):
+    simulation = Simulation(pair, get_integrator("leapfrog"))
+    simulation.set_watchdog(EnergyWatchdog(tolerance=1e-4, interval=10, action="abort"))
+    reference = Simulation(pair.copy(), get_integrator("leapfrog")).advance(100)
+    with pytest.raises(EnergyDriftError) as raised:
+        simulation.advance(100)
+    accepted = raised.value.accepted
+    # The drift passes 1e-4 as the pair closes in, after a few clean segments
+    assert accepted > 0 and accepted % 10 == 0
+    assert pair.step == accepted
+    for got, want in zip(raised.value.block, reference):
+        np.testing.assert_array_equal(got, want[:accepted])
+    np.testing.assert_array_equal(pair.positions, reference[0][accepted - 1])
+
+
+def test_refine_halves_dt_and_records_at_the_original_spacing(pair):
+    simulation = Simulation(pair, get_integrator("leapfrog"))
+    watchdog = simulation.set_watchdog(EnergyWatchdog(tolerance=1e-3, interval=10))
+    coarse = Simulation(pair.copy(), get_integrator("leapfrog")).advance(100)
+    positions, _ = simulation.advance(100)
+    assert watchdog.refined_segments > 0
+    assert 0 < watchdog.max_drift <= 1e-3
+    assert positions.shape == (100, 2, 2)
+    assert pair.step == 100 and pair.dt == 0.01
+    # Segments before the encounter are untouched, the refined ones differ
+    np.testing.assert_array_equal(positions[:50], coarse[0][:50])
+    assert not np.array_equal(positions[-1], coarse[0][-1])
+
+
+def test_refine_gives_up_after_max_refinements(pair):
+    simulation = Simulation(pair, get_integrator("leapfrog"))
+    simulation.set_watchdog(EnergyWatchdog(tolerance=1e-9, interval=10, max_refinements=2))
+    with pytest.raises(EnergyDriftError, match="2 dt refinements"):
+        simulation.advance(100)
+    assert pair.dt == 0.01
+
+
+def test_unknown_action_is_refused():
+    with pytest.raises(ValueError, match="Unknown watchdog action"):
+        EnergyWatchdog(action="ignore")
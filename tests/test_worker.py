@@ -0,0 +1,20 @@
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from particle_core import EnergyWatchdog, Simulation, get_integrator  # noqa: E402
+from particle_core.worker import SimulationWorker  # noqa: E402
+
+
+def test_abort_in_first_segment_publishes_nothing(pair):
+    simulation = Simulation(pair, get_integrator("leapfrog"))
+    simulation.set_watchdog(EnergyWatchdog(tolerance=1e-15, interval=10, action="abort"))
+    worker = SimulationWorker(simulation, 50, chunk=50)
+    snapshots, failures, finished = [], [], []
+    worker.snapshot.connect(snapshots.append)
+    worker.failed.connect(failures.append)
+    worker.finished.connect(finished.append)
+    worker.run()
+    assert snapshots == []
+    assert len(failures) == 1 and "exceeds tolerance" in failures[0]
+    assert finished == [False]